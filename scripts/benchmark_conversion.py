@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-diagram conversion latency of SvgToPngConverter.
+
+Compares a cold browser launch per diagram (the previous behaviour, emulated by
+closing the converter after every conversion) with the shared Chromium
+instance that is now kept alive for the whole build, and the networkidle wait
+with the render-complete (painted frame) wait. With --batch-size it also
+compares the throughput of concurrent single-diagram pages with batched pages
+that render several diagrams at once.
+
+Usage:
+    uv run python scripts/benchmark_conversion.py [--count N] [--batch-size N]
+"""
+
+import argparse
+import functools
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mkdocs_svg_to_png.svg_converter import SvgToPngConverter
+
+SAMPLE_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="200" height="120">'
+    '<rect x="10" y="10" width="180" height="100" fill="#4a90d9"/>'
+    '<text x="100" y="65" text-anchor="middle" fill="white">{index}</text>'
+    "</svg>"
+)
+
+CONFIG = {
+    "scale": 1.0,
+    "device_scale_factor": 1.0,
+    "default_width": 800,
+    "default_height": 600,
+    "error_on_fail": True,
+}
+
+
+def run_cold(count: int, output_dir: Path) -> list[float]:
+    """Launch a fresh browser for every diagram."""
+    converter = SvgToPngConverter(CONFIG)
+    timings = []
+    for i in range(count):
+        start = time.perf_counter()
+        converter.convert_svg_content(
+            SAMPLE_SVG.format(index=i), str(output_dir / f"cold_{i}.png")
+        )
+        converter.close()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_shared(
+    count: int, output_dir: Path, wait_for_network_idle: bool = False
+) -> list[float]:
+    """Reuse one browser for every diagram (includes the first launch)."""
+    converter = SvgToPngConverter(
+        {**CONFIG, "wait_for_network_idle": wait_for_network_idle}
+    )
+    timings = []
+    try:
+        for i in range(count):
+            start = time.perf_counter()
+            converter.convert_svg_content(
+                SAMPLE_SVG.format(index=i), str(output_dir / f"shared_{i}.png")
+            )
+            timings.append(time.perf_counter() - start)
+    finally:
+        converter.close()
+    return timings
+
+
+def run_throughput(
+    count: int, output_dir: Path, label: str, batch_size: int
+) -> tuple[str, float]:
+    """Convert all diagrams through run_concurrently and time the whole run."""
+    converter = SvgToPngConverter(
+        {**CONFIG, "max_concurrency": 2, "batch_size": batch_size}
+    )
+    try:
+        # Launch the browser before timing, as it is shared for the build
+        converter.convert_svg_content(
+            SAMPLE_SVG.format(index="warmup"), str(output_dir / "warmup.png")
+        )
+        calls = [
+            functools.partial(
+                converter.convert_svg_content,
+                SAMPLE_SVG.format(index=i),
+                str(output_dir / f"{label}_{i}.png"),
+            )
+            for i in range(count)
+        ]
+        start = time.perf_counter()
+        converter.run_concurrently(calls)
+        return label, time.perf_counter() - start
+    finally:
+        converter.close()
+
+
+def report(label: str, timings: list[float]) -> None:
+    total = sum(timings)
+    print(
+        f"{label:<8} total={total:8.3f}s  "
+        f"mean={statistics.mean(timings) * 1000:8.1f}ms  "
+        f"median={statistics.median(timings) * 1000:8.1f}ms  "
+        f"max={max(timings) * 1000:8.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20, help="diagrams per run")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=0,
+        help="also compare batched rendering with this batch size",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_dir = Path(temp_dir)
+        print(f"Converting {args.count} diagrams per mode")
+        print("=" * 60)
+        report("cold", run_cold(args.count, output_dir))
+        report("shared", run_shared(args.count, output_dir))
+
+        # Latency saved per diagram by waiting for a painted frame instead of
+        # a quiet network window (the SAMPLE_SVG has no external resources)
+        idle = run_shared(args.count, output_dir, wait_for_network_idle=True)
+        report("idle", idle)
+        painted = run_shared(args.count, output_dir)
+        saved = statistics.median(idle) - statistics.median(painted)
+        print(f"paint wait saves {saved * 1000:.1f}ms per diagram (median)")
+
+        if args.batch_size > 1:
+            print("=" * 60)
+            for label, elapsed in (
+                run_throughput(args.count, output_dir, "single", 1),
+                run_throughput(args.count, output_dir, "batched", args.batch_size),
+            ):
+                print(
+                    f"{label:<8} total={elapsed:8.3f}s  "
+                    f"throughput={args.count / elapsed:8.1f} diagrams/s"
+                )
+
+
+if __name__ == "__main__":
+    main()
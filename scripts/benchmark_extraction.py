@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark SVG block extraction from Markdown.
+
+Builds a synthetic page (about 5MB by default) with thousands of SVG file
+references and fenced ```svg blocks, then compares the single-pass scanner of
+MarkdownProcessor.extract_svg_blocks with the previous implementation, which
+ran three regex passes and checked every basic block for overlap against all
+blocks found so far.
+
+Usage:
+    uv run python scripts/benchmark_extraction.py [--size-mb N] [--blocks N]
+"""
+
+import argparse
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mkdocs_svg_to_png.markdown_processor import MarkdownProcessor
+from mkdocs_svg_to_png.svg_block import SvgBlock
+
+SECTIONS = (
+    "![Figure {index}](images/figure_{index}.svg)",
+    "```svg {{width: 200, height: 120}}\n"
+    '<svg xmlns="http://www.w3.org/2000/svg" width="200" height="120">'
+    '<rect width="200" height="120" fill="#4a90d9"/></svg>\n```',
+    "```svg\n"
+    '<svg xmlns="http://www.w3.org/2000/svg" width="80" height="80">'
+    '<circle cx="40" cy="40" r="30"/></svg>\n```',
+)
+
+
+def build_page(size_bytes: int, block_count: int) -> str:
+    """Interleave SVG blocks with filler prose up to roughly size_bytes."""
+    blocks = [SECTIONS[i % len(SECTIONS)].format(index=i) for i in range(block_count)]
+    block_bytes = sum(len(block) for block in blocks)
+    filler_line = "Lorem ipsum dolor sit amet, `code` and [a link](page.md).\n"
+    lines_per_gap = max(
+        0, (size_bytes - block_bytes) // (block_count * len(filler_line))
+    )
+    gap = "\n" + filler_line * lines_per_gap + "\n"
+    return "# Synthetic page\n\n" + gap.join(blocks) + "\n"
+
+
+def extract_three_pass(markdown_content: str) -> list[SvgBlock]:
+    """The extraction used before the single-pass scanner."""
+    blocks = []
+    file_pattern = r"!\[[^\]]*\]\(((?!https?://)[^)]+\.svg)\)(?:\{([^}]*)\})?"
+    attr_pattern = r"```svg\s*\{([^}]*)\}\s*\n(.*?)\n```"
+    basic_pattern = r"```svg\s*\n(.*?)\n```"
+
+    for match in re.finditer(file_pattern, markdown_content):
+        blocks.append(
+            SvgBlock(
+                file_path=match.group(1),
+                start_pos=match.start(),
+                end_pos=match.end(),
+            )
+        )
+    for match in re.finditer(attr_pattern, markdown_content, re.DOTALL):
+        blocks.append(
+            SvgBlock(code=match.group(2), start_pos=match.start(), end_pos=match.end())
+        )
+    for match in re.finditer(basic_pattern, markdown_content, re.DOTALL):
+        overlaps = any(
+            match.start() >= block.start_pos and match.end() <= block.end_pos
+            for block in blocks
+        )
+        if not overlaps:
+            blocks.append(
+                SvgBlock(
+                    code=match.group(1), start_pos=match.start(), end_pos=match.end()
+                )
+            )
+    blocks.sort(key=lambda x: x.start_pos)
+    return blocks
+
+
+def measure(extract, page: str, repeat: int) -> tuple[list[float], int]:
+    timings = []
+    found = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        found = len(extract(page))
+        timings.append(time.perf_counter() - start)
+    return timings, found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=float, default=5.0, help="page size")
+    parser.add_argument("--blocks", type=int, default=5000, help="SVG blocks")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per mode")
+    args = parser.parse_args()
+
+    page = build_page(int(args.size_mb * 1024 * 1024), args.blocks)
+    processor = MarkdownProcessor({})
+    # Keep the per-page INFO log out of the measurement output
+    processor.logger.disabled = True
+
+    print(f"Page: {len(page) / 1024 / 1024:.1f}MB with {args.blocks} SVG blocks")
+    print("=" * 60)
+    results = {}
+    for label, extract in (
+        ("single", processor.extract_svg_blocks),
+        ("3-pass", extract_three_pass),
+    ):
+        timings, found = measure(extract, page, args.repeat)
+        results[label] = statistics.median(timings)
+        print(
+            f"{label:<8} found={found:6d}  "
+            f"median={results[label] * 1000:9.1f}ms  "
+            f"min={min(timings) * 1000:9.1f}ms"
+        )
+    print(f"single pass is {results['3-pass'] / results['single']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark replacing SVG blocks with image Markdown.
+
+Compares MarkdownProcessor.replace_blocks_with_images, which collects the
+unchanged text and image links in one forward pass and joins them once, with
+the previous implementation, which rebuilt the whole page by slicing for every
+block (O(page size x blocks)).
+
+Usage:
+    uv run python scripts/benchmark_replacement.py [--counts 1 100 10000]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src to path so we can import our modules
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from mkdocs_svg_to_png.markdown_processor import MarkdownProcessor
+from mkdocs_svg_to_png.svg_block import SvgBlock
+
+SECTION = (
+    "## Diagram {index}\n\n"
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit.\n\n"
+    "```svg\n"
+    '<svg xmlns="http://www.w3.org/2000/svg" width="200" height="120">'
+    '<rect width="200" height="120" fill="#4a90d9"/></svg>\n'
+    "```\n\n"
+)
+
+
+def build_page(block_count: int) -> str:
+    return "".join(SECTION.format(index=i) for i in range(block_count))
+
+
+def replace_by_slicing(
+    processor: MarkdownProcessor,
+    markdown_content: str,
+    blocks: list[SvgBlock],
+    image_paths: list[str],
+    page_file: str,
+) -> str:
+    """The replacement used before the single forward pass."""
+    sorted_blocks = sorted(
+        zip(blocks, image_paths), key=lambda x: x[0].start_pos, reverse=True
+    )
+    result = markdown_content
+    for block, image_path in sorted_blocks:
+        image_markdown = block.get_image_markdown(
+            image_path,
+            page_file,
+            processor.config.get("preserve_original", False),
+        )
+        result = result[: block.start_pos] + image_markdown + result[block.end_pos :]
+    return result
+
+
+def measure(replace, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        replace()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--counts",
+        type=int,
+        nargs="+",
+        default=[1, 100, 10000],
+        help="blocks per page",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="runs per mode")
+    args = parser.parse_args()
+
+    processor = MarkdownProcessor({"preserve_original": False})
+    # Keep the per-page INFO log out of the measurement output
+    processor.logger.disabled = True
+
+    print(f"{'blocks':>8} {'page':>9} {'single pass':>13} {'slicing':>13}")
+    print("=" * 60)
+    for count in args.counts:
+        page = build_page(count)
+        blocks = processor.extract_svg_blocks(page)
+        image_paths = [f"page_svg_{i}.png" for i in range(len(blocks))]
+
+        joined = measure(
+            lambda page=page, blocks=blocks, image_paths=image_paths: (
+                processor.replace_blocks_with_images(
+                    page, blocks, image_paths, "page.md"
+                )
+            ),
+            args.repeat,
+        )
+        sliced = measure(
+            lambda page=page, blocks=blocks, image_paths=image_paths: (
+                replace_by_slicing(processor, page, blocks, image_paths, "page.md")
+            ),
+            args.repeat,
+        )
+        print(
+            f"{count:>8} {len(page) / 1024:>7.0f}KB "
+            f"{joined * 1000:>11.2f}ms {sliced * 1000:>11.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
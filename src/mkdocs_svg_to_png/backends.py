@@ -0,0 +1,358 @@
+"""Non-browser rendering backends used by SvgToPngConverter."""
+
+from __future__ import annotations
+
+import abc
+import multiprocessing
+import os
+import shutil
+import subprocess  # nosec B404
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from .exceptions import SvgConfigError
+from .logging_config import get_logger
+from .svg_document import CSS, FILTER, UNPARSED, ParsedSvg
+from .utils import write_file_if_changed
+
+PLAYWRIGHT_BACKEND = "playwright"
+AUTO_BACKEND = "auto"
+
+
+class RenderBackend(abc.ABC):
+    """Base class of the rasterizers the converter can route a diagram to.
+
+    The Playwright (Chromium) engine is built into SvgToPngConverter itself;
+    subclasses implement cheaper engines that render without a browser.
+    """
+
+    name = ""
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        """Initialize the backend.
+
+        Args:
+            config: Plugin configuration dictionary
+        """
+        self.config = config
+        self.logger = get_logger(__name__)
+
+    @classmethod
+    def parallelism(cls, config: dict[str, Any]) -> int:
+        """Return how many diagrams the backend can usefully render at once.
+
+        Args:
+            config: Plugin configuration dictionary
+
+        Returns:
+            Number of concurrent render() calls worth issuing
+        """
+        return 1
+
+    def get_version(self) -> str:
+        """Return the version of the underlying engine, for cache keys."""
+        return "unknown"
+
+    @abc.abstractmethod
+    def render(
+        self, svg_content: str, output_path: str, width: int, height: int
+    ) -> bool:
+        """Rasterize SVG markup into a PNG file.
+
+        The file is replaced atomically, and left untouched when it already
+        holds the identical image.
+
+        Args:
+            svg_content: String containing SVG markup
+            output_path: Path where PNG file should be saved
+            width: Output width in pixels (scale and device scale applied)
+            height: Output height in pixels (scale and device scale applied)
+
+        Returns:
+            True if the file was written, False if it was already up to date
+
+        Raises:
+            Exception: Any engine error; the converter reports it
+        """
+
+    def render_file(
+        self, svg_path: str, output_path: str, width: int, height: int
+    ) -> bool:
+        """Rasterize an SVG file into a PNG file.
+
+        Engines that can read the file themselves override this, so that the
+        markup is never loaded into this process.
+
+        Args:
+            svg_path: Path of the SVG file
+            output_path: Path where PNG file should be saved
+            width: Output width in pixels (scale and device scale applied)
+            height: Output height in pixels (scale and device scale applied)
+
+        Returns:
+            True if the file was written, False if it was already up to date
+        """
+        svg_content = Path(svg_path).read_text(encoding="utf-8")
+        return self.render(svg_content, output_path, width, height)
+
+    def close(self) -> None:  # noqa: B027
+        """Release resources held by the backend (nothing by default)."""
+
+
+def _render_with_cairosvg(svg: bytes | Path, width: int, height: int) -> bytes:
+    """Rasterize with CairoSVG and return the PNG data.
+
+    Module-level so that process pool workers can run it. Files are passed
+    by path and read by CairoSVG itself.
+    """
+    import cairosvg
+
+    source = {"url": str(svg)} if isinstance(svg, Path) else {"bytestring": svg}
+    return bytes(cairosvg.svg2png(**source, output_width=width, output_height=height))
+
+
+class CairoBackend(RenderBackend):
+    """Render SVG with CairoSVG.
+
+    Much cheaper than a browser, but without HTML (``foreignObject``) or CSS
+    web font support, so it suits plain shape diagrams.
+
+    CairoSVG holds the GIL while rendering, so with render_processes other
+    than 1 diagrams are rendered in a pool of worker processes. The pool is
+    started on first use and reused until close().
+    """
+
+    name = "cairo"
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        super().__init__(config)
+        try:
+            import cairosvg
+        except ImportError:
+            raise SvgConfigError(
+                "The cairo backend requires CairoSVG",
+                config_key="backend",
+                config_value=self.name,
+                suggestion="Install it with: pip install mkdocs-svg-to-png[cairo]",
+            ) from None
+        self._cairosvg = cairosvg
+        self.processes = self.parallelism(config)
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+
+    @classmethod
+    def parallelism(cls, config: dict[str, Any]) -> int:
+        processes = int(config.get("render_processes", 0))
+        return processes if processes > 0 else os.cpu_count() or 1
+
+    def get_version(self) -> str:
+        return str(getattr(self._cairosvg, "__version__", "unknown"))
+
+    def render(
+        self, svg_content: str, output_path: str, width: int, height: int
+    ) -> bool:
+        return self._run(svg_content.encode("utf-8"), output_path, width, height)
+
+    def render_file(
+        self, svg_path: str, output_path: str, width: int, height: int
+    ) -> bool:
+        return self._run(Path(svg_path), output_path, width, height)
+
+    def _run(
+        self, svg: bytes | Path, output_path: str, width: int, height: int
+    ) -> bool:
+        if self.processes == 1:
+            png = _render_with_cairosvg(svg, width, height)
+        else:
+            png = (
+                self._get_pool()
+                .submit(_render_with_cairosvg, svg, width, height)
+                .result()
+            )
+        return write_file_if_changed(output_path, png)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self.logger.debug(
+                    f"Starting {self.processes} CairoSVG worker processes"
+                )
+                # spawn: forking a process that runs the asyncio loop and
+                # browser threads is unsafe
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def close(self) -> None:
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+
+class RsvgBackend(RenderBackend):
+    """Render SVG with librsvg's ``rsvg-convert`` command.
+
+    SVG markup is streamed over stdin and the PNG read back from stdout, so no
+    temporary files are involved. Each diagram runs in its own process, with
+    at most one process per CPU alive at a time.
+    """
+
+    name = "rsvg"
+    executable = "rsvg-convert"
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        super().__init__(config)
+        path = shutil.which(self.executable)
+        if path is None:
+            raise SvgConfigError(
+                f"The rsvg backend requires {self.executable} on PATH",
+                config_key="backend",
+                config_value=self.name,
+                suggestion=(
+                    "Install librsvg (e.g. apt install librsvg2-bin, "
+                    "brew install librsvg)"
+                ),
+            )
+        self._path = path
+        self._slots = threading.BoundedSemaphore(self.max_processes())
+        self._version: str | None = None
+
+    @staticmethod
+    def max_processes() -> int:
+        """Return how many rsvg-convert processes may run at once."""
+        return os.cpu_count() or 1
+
+    @classmethod
+    def parallelism(cls, config: dict[str, Any]) -> int:
+        return cls.max_processes()
+
+    def get_version(self) -> str:
+        if self._version is None:
+            try:
+                result = subprocess.run(  # nosec B603
+                    [self._path, "--version"],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+                self._version = result.stdout.strip() or "unknown"
+            except (OSError, subprocess.CalledProcessError):
+                self._version = "unknown"
+        return self._version
+
+    def render(
+        self, svg_content: str, output_path: str, width: int, height: int
+    ) -> bool:
+        return self._run([], svg_content.encode("utf-8"), output_path, width, height)
+
+    def render_file(
+        self, svg_path: str, output_path: str, width: int, height: int
+    ) -> bool:
+        # rsvg-convert reads the file itself; relative references resolve
+        # against its directory
+        return self._run([svg_path], None, output_path, width, height)
+
+    def _run(
+        self,
+        inputs: list[str],
+        svg_bytes: bytes | None,
+        output_path: str,
+        width: int,
+        height: int,
+    ) -> bool:
+        with self._slots:
+            result = subprocess.run(  # nosec B603
+                [
+                    self._path,
+                    "--format=png",
+                    f"--width={width}",
+                    f"--height={height}",
+                    *inputs,
+                ],
+                input=svg_bytes,
+                capture_output=True,
+                check=False,
+            )
+
+        if result.returncode != 0 or not result.stdout:
+            stderr = result.stderr.decode("utf-8", errors="replace").strip()
+            raise RuntimeError(
+                f"{self.executable} exited with status {result.returncode}: "
+                f"{stderr or 'no output'}"
+            )
+        return write_file_if_changed(output_path, result.stdout)
+
+
+BACKENDS: dict[str, type[RenderBackend]] = {
+    CairoBackend.name: CairoBackend,
+    RsvgBackend.name: RsvgBackend,
+}
+
+
+def create_backend(name: str, config: dict[str, Any]) -> RenderBackend:
+    """Instantiate a non-browser backend by name.
+
+    Args:
+        name: Backend name as used in the ``backend`` option or attribute
+        config: Plugin configuration dictionary
+
+    Returns:
+        The backend instance
+
+    Raises:
+        SvgConfigError: If the name is unknown or the engine is not installed
+    """
+    backend_class = BACKENDS.get(name)
+    if backend_class is None:
+        raise SvgConfigError(
+            f"Unknown rendering backend: {name}",
+            config_key="backend",
+            config_value=name,
+            suggestion=(
+                f"Use one of: {', '.join([PLAYWRIGHT_BACKEND, *sorted(BACKENDS)])}"
+            ),
+        )
+    return backend_class(config)
+
+
+# Engines tried by the auto mode, cheapest first, with the features each one
+# renders faithfully. Chromium renders everything and is always the last resort.
+AUTO_ENGINES: dict[str, frozenset[str]] = {
+    CairoBackend.name: frozenset({CSS}),
+    RsvgBackend.name: frozenset({CSS, FILTER}),
+}
+
+
+def detect_features(svg_content: str) -> frozenset[str]:
+    """Find the features of an SVG that limit which engines can render it.
+
+    Args:
+        svg_content: String containing SVG markup
+
+    Returns:
+        Feature names (UNPARSED if the markup could not be parsed)
+    """
+    try:
+        return ParsedSvg.parse(svg_content).features
+    except Exception:
+        return frozenset({UNPARSED})
+
+
+def select_engines(features: frozenset[str]) -> list[str]:
+    """Return the engines able to render these features, cheapest first.
+
+    Args:
+        features: Result of detect_features()
+
+    Returns:
+        Engine names, always ending with the Playwright engine
+    """
+    engines = [
+        name for name, supported in AUTO_ENGINES.items() if features <= supported
+    ]
+    return [*engines, PLAYWRIGHT_BACKEND]
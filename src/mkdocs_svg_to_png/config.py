@@ -36,6 +36,60 @@ class SvgConfigManager:
                 "cleanup_generated_images",
                 config_options.Type(bool, default=False),
             ),
+            (
+                "backend",
+                config_options.Choice(
+                    ["playwright", "cairo", "rsvg", "auto"], default="playwright"
+                ),
+            ),
+            (
+                "render_processes",
+                config_options.Type(int, default=0),
+            ),
+            (
+                "max_concurrency",
+                config_options.Type(int, default=4),
+            ),
+            (
+                "deduplicate",
+                config_options.Type(bool, default=True),
+            ),
+            (
+                "render_in_serve",
+                config_options.Type(bool, default=True),
+            ),
+            (
+                "load_files_by_url",
+                config_options.Type(bool, default=False),
+            ),
+            (
+                "wait_for_network_idle",
+                config_options.Type(bool, default=False),
+            ),
+            (
+                "batch_size",
+                config_options.Type(int, default=1),
+            ),
+            (
+                "prefetch",
+                config_options.Type(bool, default=True),
+            ),
+            (
+                "cache_dir",
+                config_options.Type(str, default=".cache/mkdocs-svg-to-png"),
+            ),
+            (
+                "cache_max_bytes",
+                config_options.Type(int, default=512 * 1024 * 1024),
+            ),
+            (
+                "cache_max_entries",
+                config_options.Type(int, default=0),
+            ),
+            (
+                "cache_max_age_builds",
+                config_options.Type(int, default=30),
+            ),
         )
 
     def validate(self, config: dict[str, Any]) -> dict[str, Any]:
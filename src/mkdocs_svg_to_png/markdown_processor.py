@@ -1,11 +1,51 @@
+import functools
 import re
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 from .exceptions import SvgParsingError
 from .logging_config import get_logger
+from .page_filter import may_contain_svg
 from .svg_block import SvgBlock
 
+# SVGファイル参照、HTMLコメント、フェンスの開始行、インラインコードを
+# 1回の走査で文書順に見つけるパターン。先読みでどの分岐も始まり得ない
+# 文字を読み飛ばすため、走査はページの長さにほぼ比例する
+_SCAN_PATTERN = re.compile(
+    r"(?=[<!`~ \t>])(?:"
+    # HTMLコメントの開始（終わりは_skip_commentで探す）
+    r"(?P<comment><!--)"
+    # フェンスの開始行: ```info または ~~~info（インデント・引用の中も含む）
+    r"|^[ \t>]*(?P<fence>`{3,}|~{3,})(?P<info>[^\n]*)$"
+    # インラインコード（フェンスの開始行でないバッククォートの並び）。
+    # 1行に収まるものはここで読み飛ばし、それ以外は_skip_code_spanで扱う
+    r"|(?P<code>`+)(?P<code_rest>[^`\n]*(?P=code)(?!`))?"
+    # SVGファイル参照: ![alt](path.svg) または ![alt](path.svg){key: value}
+    r"|!\[[^\]]*\]\((?P<file>(?!https?://)[^)]+\.svg)\)(?:\{(?P<file_attrs>[^}]*)\})?"
+    r")",
+    re.MULTILINE,
+)
+
+# インラインコードは段落をまたがない: 空行かフェンスの開始行で段落が終わる
+_PARAGRAPH_END_PATTERN = re.compile(r"\n[ \t>]*(?:\n|`{3,}|~{3,})")
+
+# インラインSVGとして扱うフェンスのinfo文字列: svg または svg {key: value}
+_SVG_INFO_PATTERN = re.compile(r"svg\s*(?:\{(?P<attrs>[^}]*)\})?")
+
+
+@functools.cache
+def _closing_code_span_pattern(length: int) -> re.Pattern[str]:
+    """開始と同じ数だけ並んだバッククォート（インラインコードの終わり）のパターン"""
+    return re.compile(rf"(?<!`)`{{{length}}}(?!`)")
+
+
+@functools.cache
+def _closing_fence_pattern(fence_char: str, min_length: int) -> re.Pattern[str]:
+    """開始フェンスと同じ文字で同じ長さ以上の閉じフェンス行のパターン"""
+    return re.compile(
+        rf"^[ \t>]*{re.escape(fence_char)}{{{min_length},}}[ \t]*$", re.MULTILINE
+    )
+
 
 class MarkdownProcessor:
     def __init__(self, config: dict[str, Any]) -> None:
@@ -38,11 +78,12 @@ class MarkdownProcessor:
                 svg_content=f"Expected {len(blocks)} images, got {len(image_paths)}",
             )
 
-        sorted_blocks = sorted(
-            zip(blocks, image_paths), key=lambda x: x[0].start_pos, reverse=True
-        )
+        sorted_blocks = sorted(zip(blocks, image_paths), key=lambda x: x[0].start_pos)
 
-        result = markdown_content
+        # 先頭から1回だけ走査し、変更のない部分と画像のMarkdownを順に集めて
+        # 最後に1度だけ連結する（ブロックごとに文字列全体を作り直さない）
+        parts = []
+        pos = 0
 
         for block, image_path in sorted_blocks:
             image_markdown = block.get_image_markdown(
@@ -52,65 +93,124 @@ class MarkdownProcessor:
                 page_url,
             )
 
-            result = (
-                result[: block.start_pos] + image_markdown + result[block.end_pos :]
-            )
+            parts.append(markdown_content[pos : block.start_pos])
+            parts.append(image_markdown)
+            pos = block.end_pos
 
-        return result
+        parts.append(markdown_content[pos:])
+        return "".join(parts)
 
     def extract_svg_blocks(self, markdown_content: str) -> list[SvgBlock]:
-        """SVGファイル参照とインラインSVGコードブロックを抽出する"""
-        blocks = []
+        """SVGファイル参照とインラインSVGコードブロックを抽出する
 
-        # SVGファイル参照パターン: ![alt](path.svg)
-        file_pattern = r"!\[[^\]]*\]\(((?!https?://)[^)]+\.svg)\)"
+        先頭から1回だけ走査し、ブロックを文書順に返す。フェンスで囲まれた
+        コード、インラインコード、HTMLコメントの中にある記法（チュートリアルの
+        記述例など）は読み飛ばし、変換対象にしない。
+        """
+        blocks: list[SvgBlock] = []
+        if not may_contain_svg(markdown_content):
+            return blocks
 
-        # インラインSVGコードブロックパターン（属性付き）
-        attr_pattern = r"```svg\s*\{([^}]*)\}\s*\n(.*?)\n```"
+        pos = 0
 
-        # インラインSVGコードブロックパターン（基本）
-        basic_pattern = r"```svg\s*\n(.*?)\n```"
+        while True:
+            match = _SCAN_PATTERN.search(markdown_content, pos)
+            if match is None:
+                break
+            pos = match.end()
 
-        # ファイル参照を処理
-        for match in re.finditer(file_pattern, markdown_content):
-            file_path = match.group(1)
-            block = SvgBlock(
-                file_path=file_path, start_pos=match.start(), end_pos=match.end()
-            )
-            blocks.append(block)
-
-        # 属性付きインラインSVGを処理
-        for match in re.finditer(attr_pattern, markdown_content, re.DOTALL):
-            attr_str = match.group(1).strip()
-            code = match.group(2).strip()
-            attributes = self._parse_attributes(attr_str)
-
-            block = SvgBlock(
-                code=code,
-                start_pos=match.start(),
-                end_pos=match.end(),
-                attributes=attributes,
-            )
-            blocks.append(block)
-
-        # 基本インラインSVGを処理（既に処理されたものと重複しないように）
-        for match in re.finditer(basic_pattern, markdown_content, re.DOTALL):
-            overlaps = any(
-                match.start() >= block.start_pos and match.end() <= block.end_pos
-                for block in blocks
-            )
-            if not overlaps:
-                code = match.group(1).strip()
-                block = SvgBlock(
-                    code=code, start_pos=match.start(), end_pos=match.end()
+            file_path = match.group("file")
+            if file_path is not None:
+                attr_str = match.group("file_attrs") or ""
+                blocks.append(
+                    SvgBlock(
+                        file_path=file_path,
+                        start_pos=match.start(),
+                        end_pos=match.end(),
+                        attributes=self._parse_attributes(attr_str.strip()),
+                    )
                 )
-                blocks.append(block)
-
-        blocks.sort(key=lambda x: x.start_pos)
+            elif match.group("fence") is not None:
+                block, pos = self._read_fence(markdown_content, match)
+                if block is not None:
+                    blocks.append(block)
+            elif match.group("code") is not None:
+                if match.group("code_rest") is None:
+                    pos = self._skip_code_span(markdown_content, match)
+            else:
+                pos = self._skip_comment(markdown_content, match)
 
-        self.logger.info(f"Found {len(blocks)} SVG blocks")
+        if blocks:
+            self.logger.info(f"Found {len(blocks)} SVG blocks")
+        else:
+            self.logger.debug("Found no SVG blocks")
         return blocks
 
+    @staticmethod
+    def _skip_code_span(markdown_content: str, match: re.Match[str]) -> int:
+        """インラインコードの終わりの位置を返す
+
+        同じ段落に同じ数のバッククォートがなければ、開始のバッククォートは
+        ただの文字として扱う（CommonMarkと同じ）。
+        """
+        closing = _closing_code_span_pattern(len(match.group("code"))).search(
+            markdown_content, match.end()
+        )
+        if closing is None or _PARAGRAPH_END_PATTERN.search(
+            markdown_content, match.end(), closing.start()
+        ):
+            return match.end()
+        return closing.end()
+
+    @staticmethod
+    def _skip_comment(markdown_content: str, match: re.Match[str]) -> int:
+        """HTMLコメントの終わりの位置を返す
+
+        閉じていないコメントは、行頭から始まる場合だけHTMLブロックとして
+        ページ末尾まで続く。文中の閉じていない"<!--"はただの文字として扱う。
+        """
+        end = markdown_content.find("-->", match.end())
+        if end != -1:
+            return end + len("-->")
+
+        line_start = markdown_content.rfind("\n", 0, match.start()) + 1
+        if not markdown_content[line_start : match.start()].strip(" \t>"):
+            return len(markdown_content)
+        return match.end()
+
+    def _read_fence(
+        self, markdown_content: str, match: re.Match[str]
+    ) -> tuple[Optional[SvgBlock], int]:
+        """フェンスを閉じフェンスまで読み、SVGブロックと走査の再開位置を返す
+
+        閉じフェンスのないフェンスはページ末尾まで続く（CommonMarkと同じ）。
+        """
+        fence = match.group("fence")
+        info = match.group("info").strip()
+        if fence[0] == "`" and "`" in info:
+            # バッククォートを含むinfo文字列はフェンスではなくインラインコード
+            return None, match.end()
+
+        closing = _closing_fence_pattern(fence[0], len(fence)).search(
+            markdown_content, match.end()
+        )
+        if closing is None:
+            return None, len(markdown_content)
+
+        svg_info = _SVG_INFO_PATTERN.fullmatch(info) if fence[0] == "`" else None
+        if svg_info is None:
+            return None, closing.end()
+
+        code = markdown_content[match.end() : closing.start()]
+        attrs = svg_info.group("attrs")
+        block = SvgBlock(
+            code=code,
+            start_pos=match.start("fence"),
+            end_pos=closing.end(),
+            attributes=self._parse_attributes(attrs.strip()) if attrs else None,
+        )
+        return block, closing.end()
+
     def _create_svg_block(self, code: str, file_path: str) -> SvgBlock:
         """SVGブロックを作成するヘルパーメソッド（テスト用）"""
         return SvgBlock(code=code, file_path=file_path)
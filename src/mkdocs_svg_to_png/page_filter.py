@@ -0,0 +1,120 @@
+"""Cheap checks that let pages without SVG content skip extraction."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from .logging_config import get_logger
+
+VERDICTS_FILENAME = "svg-free-pages.json"
+# Bump when extraction rules change, so pages are scanned again
+VERDICTS_VERSION = 2
+
+# Every SVG file reference and inline block contains one of these
+_SVG_MARKERS = (".svg", "```svg")
+
+
+def may_contain_svg(markdown_content: str) -> bool:
+    """Return False if the page certainly has no SVG block to extract.
+
+    Args:
+        markdown_content: Markdown source of the page
+
+    Returns:
+        True if extraction has to run to find out
+    """
+    return any(marker in markdown_content for marker in _SVG_MARKERS)
+
+
+def page_digest(markdown_content: str) -> str:
+    """Return the key under which a verdict about a page is stored."""
+    return hashlib.blake2b(markdown_content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SvgFreePages:
+    """Digests of pages that passed may_contain_svg() but had no SVG blocks.
+
+    Such pages mention ``.svg`` without referencing a local SVG (remote
+    images, links, code examples), so they would otherwise be scanned again
+    on every build. The set is kept in memory for ``mkdocs serve`` and, when
+    a directory is given, persisted next to the render cache. Each save
+    keeps only the digests seen during that build, so verdicts about edited
+    pages do not pile up.
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None) -> None:
+        """Initialize the set, loading verdicts of earlier builds.
+
+        Args:
+            cache_dir: Directory to persist verdicts in (None to keep them
+                in memory only)
+        """
+        self.path = Path(cache_dir) / VERDICTS_FILENAME if cache_dir else None
+        self.logger = get_logger(__name__)
+
+        self._lock = threading.Lock()
+        self._known = self._load()
+        self._seen: set[str] = set()
+        self._saved = set(self._known)
+
+    def __contains__(self, digest: object) -> bool:
+        with self._lock:
+            if digest not in self._known:
+                return False
+            self._seen.add(str(digest))
+            return True
+
+    def add(self, digest: str) -> None:
+        """Record that the page with this digest has no SVG blocks."""
+        with self._lock:
+            self._known.add(digest)
+            self._seen.add(digest)
+
+    def save(self) -> None:
+        """Persist the verdicts seen in this build and start the next one."""
+        with self._lock:
+            seen, self._seen = self._seen, set()
+            self._known = set(seen)
+
+        if self.path is None or seen == self._saved:
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(
+                dir=self.path.parent, prefix=".tmp-", suffix=".json"
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(
+                        {"version": VERDICTS_VERSION, "pages": sorted(seen)},
+                        f,
+                        separators=(",", ":"),
+                    )
+                Path(temp_path).replace(self.path)
+            except BaseException:
+                Path(temp_path).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            self.logger.warning(f"Failed to save SVG-free page list {self.path}: {e}")
+            return
+
+        self._saved = seen
+
+    def _load(self) -> set[str]:
+        """Read persisted verdicts, ignoring missing or outdated files."""
+        if self.path is None:
+            return set()
+        try:
+            data = json.loads(self.path.read_text("utf-8"))
+        except (OSError, ValueError):
+            return set()
+        if not isinstance(data, dict) or data.get("version") != VERDICTS_VERSION:
+            return set()
+        pages = data.get("pages")
+        return {str(page) for page in pages} if isinstance(pages, list) else set()
@@ -28,6 +28,8 @@ class SvgToPngPlugin(BasePlugin):  # type: ignore[type-arg,no-untyped-call]
         self.processor: Optional[SvgProcessor] = None
         self.generated_images: list[str] = []
         self.files: Optional[Files] = None
+        # src_path -> File（画像を登録するたびにFilesを線形探索しないための索引）
+        self._files_by_src_path: Optional[dict[str, Any]] = None
         self.logger = get_logger(__name__)
 
         self.is_serve_mode: bool = "serve" in sys.argv
@@ -45,6 +47,20 @@ class SvgToPngPlugin(BasePlugin):  # type: ignore[type-arg,no-untyped-call]
         # enabled_if_envが設定されていない場合はデフォルトで有効
         return True
 
+    def _should_render(self) -> bool:
+        """このビルドでSVGを変換するかどうかを判定"""
+        return not self.is_serve_mode or self.config.get("render_in_serve", True)
+
+    def on_startup(self, *, command: str, dirty: bool) -> None:
+        # on_startupを定義すると、mkdocs serveの再ビルド間でプラグインの
+        # インスタンスが維持され、ブラウザと変換結果を使い回せる
+        self.is_serve_mode = command == "serve"
+
+    def on_shutdown(self) -> None:
+        if self.processor:
+            self.processor.close()
+            self.processor = None
+
     def on_config(self, config: Any) -> Any:
         try:
             config_dict = dict(self.config)
@@ -59,7 +75,24 @@ class SvgToPngPlugin(BasePlugin):  # type: ignore[type-arg,no-untyped-call]
                 self.logger.info("SVG to PNG plugin is disabled")
                 return config
 
+            # 相対パスのキャッシュディレクトリはmkdocs.ymlの場所を基準にする
+            cache_dir = config_dict.get("cache_dir")
+            if cache_dir and not Path(cache_dir).is_absolute():
+                config_file_path = config.get("config_file_path")
+                if config_file_path:
+                    config_dict["cache_dir"] = str(
+                        Path(config_file_path).parent / cache_dir
+                    )
+
+            # serveの再ビルドで設定が変わっていなければ、起動済みのブラウザと
+            # 前回の変換結果を持つプロセッサをそのまま使う
+            if self.processor is not None and self.processor.config == config_dict:
+                return config
+            if self.processor is not None:
+                self.processor.close()
+
             self.processor = SvgProcessor(config_dict)
+            self.processor.incremental = self.is_serve_mode
 
             self.logger.info("SVG to PNG plugin initialized successfully")
 
@@ -90,49 +123,105 @@ class SvgToPngPlugin(BasePlugin):  # type: ignore[type-arg,no-untyped-call]
         if not self._should_be_enabled(self.config) or not self.processor:
             return files
 
-        # Filesオブジェクトを保存
+        # Filesオブジェクトを保存（src_pathの索引は最初の画像登録時に作る）
         self.files = files
+        self._files_by_src_path = None
         self.generated_images = []
+        self.processor.begin_build()
+
+        # serveの再ビルドでは、変更されたSVGファイルの変換記録だけを破棄する
+        if self.is_serve_mode and self._should_render():
+            self._invalidate_changed_svgs()
+
+        # 全ページのSVGを先に洗い出し、ページ処理と並行して変換を進める
+        if self.config.get("prefetch", True) and self._should_render():
+            self._prefetch_svg_diagrams(files, config)
 
         return files
 
+    def _invalidate_changed_svgs(self) -> None:
+        """変更されたSVGファイルを検出し、影響を受けるページをログに出す"""
+        if not self.processor:
+            return
+
+        for svg_path, pages in self.processor.detect_changed_svgs().items():
+            self.logger.info(
+                f"{svg_path} changed, re-rendering for "
+                f"{', '.join(sorted(pages)) or 'no known pages'}"
+            )
+
+    def _prefetch_svg_diagrams(self, files: Any, config: Any) -> None:
+        """全Markdownソースを走査して変換をスケジューラに登録し、開始する"""
+        if not self.processor:
+            return
+
+        docs_dir = Path(config["docs_dir"])
+        output_dir = docs_dir / self.config["output_dir"]
+
+        try:
+            for file in files.documentation_pages():
+                # 他のプラグインが生成したページ（gen-filesやブログなど）は
+                # ソースファイルを持たないため、ページ処理時に変換する
+                if file.abs_src_path is None:
+                    continue
+                markdown = Path(file.abs_src_path).read_text(encoding="utf-8-sig")
+                self.processor.prefetch_page(
+                    file.src_path, markdown, output_dir, docs_dir=docs_dir
+                )
+        except (OSError, UnicodeDecodeError) as e:
+            # 事前変換は最適化のため、失敗してもページ処理時の変換に任せる
+            self.logger.warning(f"Stopped SVG prefetch early: {e!s}")
+        finally:
+            # 登録済みの変換は必ず開始する（ページ処理側が結果を待つため）
+            self.processor.start_prefetch()
+
     def _register_generated_images_to_files(
         self, image_paths: list[str], docs_dir: Path, config: Any
     ) -> None:
-        """生成された画像をFilesオブジェクトに追加"""
+        """生成された画像をFilesオブジェクトに追加
+
+        image_pathsは変換に成功した画像だけなので、存在確認はしない。
+        src_pathの索引で登録済みかを調べるため、画像1枚あたりO(1)で済む。
+        """
         if not (image_paths and self.files):
             return
 
         from mkdocs.structure.files import File
 
         for image_path in image_paths:
-            image_file_path = Path(image_path)
-            if not image_file_path.exists():
-                self.logger.warning(
-                    f"Generated image file does not exist: {image_path}"
-                )
-                continue
-
             try:
                 # docs_dirからの相対パスを計算
-                rel_path = image_file_path.relative_to(docs_dir)
-                rel_path_str = str(rel_path)
+                rel_path_str = str(Path(image_path).relative_to(docs_dir))
+            except ValueError as e:
+                self.logger.error(f"Error processing image path {image_path}: {e}")
+                continue
 
-                # 既存のファイルを効率的に検索して削除（重複回避）
+            existing = self._get_files_index().get(rel_path_str)
+            if existing is not None:
+                # 前回のビルドで生成した画像はMkDocsがdocs_dirから既に登録している
+                # （重複排除で複数ページが同じ画像を使う場合も同様）
+                if Path(existing.abs_src_path or "") == Path(image_path):
+                    continue
+                # 別の場所を指す同名のファイルだけを置き換える（まれなので線形探索）
                 self._remove_existing_file_by_path(rel_path_str)
 
-                # 新しいファイルオブジェクトを作成してFilesに追加
-                file_obj = File(
-                    rel_path_str,
-                    str(docs_dir),
-                    str(config["site_dir"]),
-                    use_directory_urls=config.get("use_directory_urls", True),
-                )
-                self.files.append(file_obj)
+            # 新しいファイルオブジェクトを作成してFilesに追加
+            file_obj = File(
+                rel_path_str,
+                str(docs_dir),
+                str(config["site_dir"]),
+                use_directory_urls=config.get("use_directory_urls", True),
+            )
+            self.files.append(file_obj)
+            self._get_files_index()[rel_path_str] = file_obj
 
-            except ValueError as e:
-                self.logger.error(f"Error processing image path {image_path}: {e}")
-                continue
+    def _get_files_index(self) -> dict[str, Any]:
+        """src_pathからFileを引く索引を返す（ビルドごとに1度だけ作り、以降は更新する）"""
+        if self._files_by_src_path is None:
+            self._files_by_src_path = {
+                file.src_path: file for file in (self.files or [])
+            }
+        return self._files_by_src_path
 
     def _remove_existing_file_by_path(self, src_path: str) -> bool:
         """指定されたsrc_pathを持つファイルを削除する
@@ -146,11 +235,11 @@ class SvgToPngPlugin(BasePlugin):  # type: ignore[type-arg,no-untyped-call]
         if self.files is None:
             return False
 
-        for file_obj in self.files:
-            if file_obj.src_path == src_path:
-                self.files.remove(file_obj)
-                return True
-        return False
+        file_obj = self._get_files_index().pop(src_path, None)
+        if file_obj is None:
+            return False
+        self.files.remove(file_obj)
+        return True
 
     def _process_svg_diagrams(
         self, markdown: str, page: Any, config: Any
@@ -230,7 +319,7 @@ class SvgToPngPlugin(BasePlugin):  # type: ignore[type-arg,no-untyped-call]
         if not self._should_be_enabled(self.config):
             return markdown
 
-        if self.is_serve_mode:
+        if not self._should_render():
             return markdown
 
         return self._process_svg_diagrams(markdown, page, config)
@@ -240,17 +329,104 @@ class SvgToPngPlugin(BasePlugin):  # type: ignore[type-arg,no-untyped-call]
             return
 
         # 生成した画像の総数をINFOレベルで出力
-        if self.generated_images:
+        # 重複排除で使い回した画像は複数ページから同じパスで記録される
+        unique_images = list(dict.fromkeys(self.generated_images))
+        if unique_images:
             self.logger.info(
-                f"Generated {len(self.generated_images)} PNGs from SVGs total"
+                f"Generated {len(unique_images)} PNGs from SVGs total"
+                f"{self._format_cache_stats()}{self._format_dedup_stats()}"
+                f"{self._format_unchanged_stats()}{self._format_identical_stats()}"
+                f"{self._format_backend_stats()}"
             )
 
         # 生成画像のクリーンアップ
-        if self.config.get("cleanup_generated_images", False) and self.generated_images:
-            clean_generated_images(self.generated_images, self.logger)
+        # serve中はdocs_dir内の削除が監視対象の変更となり、再ビルドと再変換を
+        # 繰り返してしまうため削除しない
+        if (
+            self.config.get("cleanup_generated_images", False)
+            and unique_images
+            and not self.is_serve_mode
+        ):
+            clean_generated_images(unique_images, self.logger)
+
+        self._finish_build()
+
+    def on_build_error(self, *, error: Exception) -> None:
+        if not self._should_be_enabled(self.config):
+            return
+
+        # 残りの事前変換は取り消し、記録を次のビルドに持ち越さない
+        # （サイト全体の変換を待たずにエラーを報告する）
+        self._finish_build(cancel=True)
+
+    def _finish_build(self, cancel: bool = False) -> None:
+        """ビルドを終え、serveでなければブラウザも終了する"""
+        if not self.processor:
+            return
+
+        if self.is_serve_mode:
+            # 次の再ビルドに備えてブラウザは起動したままにする（on_shutdownで終了）
+            self.processor.end_build(cancel=cancel)
+        else:
+            # ビルド全体で共有していたブラウザを終了
+            self.processor.close(cancel=cancel)
+
+    def _format_cache_stats(self) -> str:
+        """ビルドサマリー用のキャッシュ統計を整形する"""
+        if self.processor is None or self.processor.render_cache is None:
+            return ""
+        render_cache = self.processor.render_cache
+        return f" (cache: {render_cache.hits} hits, {render_cache.misses} misses)"
+
+    def _format_dedup_stats(self) -> str:
+        """重複排除で省いた変換の数を整形する"""
+        if not (self.processor and self.processor.renders_saved):
+            return ""
+        return f" ({self.processor.renders_saved} renders saved by deduplication)"
+
+    def _format_unchanged_stats(self) -> str:
+        """serveの再ビルドで再変換を省いた数を整形する"""
+        if not (self.is_serve_mode and self.processor):
+            return ""
+        return f" ({self.processor.unchanged_count} unchanged since last build)"
+
+    def _format_identical_stats(self) -> str:
+        """既存ファイルと同一の内容だったため書き込まなかったPNGの数を整形する"""
+        if self.processor is None:
+            return ""
+        identical = self.processor.svg_converter.unchanged_outputs
+        if self.processor.render_cache is not None:
+            identical += self.processor.render_cache.unchanged
+        if not identical:
+            return ""
+        return f" ({identical} PNGs unchanged on disk)"
+
+    def _format_backend_stats(self) -> str:
+        """変換エンジンごとの変換数と合計時間を整形する"""
+        if self.processor is None:
+            return ""
+        backend_stats = self.processor.svg_converter.backend_stats
+        if not backend_stats:
+            return ""
+        engines = ", ".join(
+            f"{name}: {count} in {seconds:.1f}s"
+            for name, (count, seconds) in sorted(backend_stats.items())
+        )
+        return f" (engines: {engines})"
 
     def on_serve(self, server: Any, *, config: Any, builder: Any) -> Any:
         if not self._should_be_enabled(self.config):
             return server
 
+        if not (self.processor and self._should_render()):
+            return server
+
+        # docs_dir配下はMkDocsが監視済みのため、外部のSVGファイルだけを追加する
+        docs_dir = Path(config["docs_dir"]).resolve()
+        for svg_path in sorted(self.processor.svg_dependents):
+            resolved = Path(svg_path).resolve()
+            if docs_dir not in resolved.parents:
+                self.logger.debug(f"Watching referenced SVG: {svg_path}")
+                server.watch(svg_path)
+
         return server
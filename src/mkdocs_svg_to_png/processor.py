@@ -1,11 +1,32 @@
+import functools
+import threading
+from collections.abc import Collection
 from pathlib import Path
-from typing import Any, Union
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
 from .exceptions import SvgConversionError, SvgFileError, SvgImageError
 from .logging_config import get_logger
 from .markdown_processor import MarkdownProcessor
+from .page_filter import SvgFreePages, may_contain_svg, page_digest
+from .render_cache import RenderCache, compute_render_key
+from .scheduler import RenderScheduler
 from .svg_converter import SvgToPngConverter
 
+# インラインSVGはレンダーキー、SVGファイル参照は(パス, 更新時刻, サイズ)
+_Fingerprint = Union[str, tuple[str, int, int]]
+
+
+def _file_signature(path: str) -> Optional[tuple[str, int, int]]:
+    """ファイルの変更検出に使うシグネチャを返す（存在しない場合はNone）"""
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return (path, stat.st_mtime_ns, stat.st_size)
+
 
 class SvgProcessor:
     def __init__(self, config: dict[str, Any]) -> None:
@@ -14,6 +35,42 @@ class SvgProcessor:
 
         self.markdown_processor = MarkdownProcessor(config)
         self.svg_converter = SvgToPngConverter(config)
+        self.scheduler = RenderScheduler(self.svg_converter)
+
+        cache_dir = config.get("cache_dir")
+        self.render_cache = (
+            RenderCache(
+                cache_dir,
+                max_bytes=config.get("cache_max_bytes", 0),
+                max_entries=config.get("cache_max_entries", 0),
+                max_age_builds=config.get("cache_max_age_builds", 0),
+            )
+            if cache_dir
+            else None
+        )
+        # SVGを含まないと分かっているページ（内容のハッシュ）
+        self.svg_free_pages = SvgFreePages(cache_dir or None)
+
+        # incrementalが有効な場合、出力画像パスごとに直近で変換したSVGの
+        # フィンガープリントを保持し、mkdocs serveの再ビルドで変更のない
+        # ブロックの再変換を省く
+        self.incremental = False
+        self._rendered: dict[str, _Fingerprint] = {}
+        self.unchanged_count = 0
+
+        # 参照されているSVGファイル -> それを参照するページ（逆引きインデックス）
+        self.svg_dependents: dict[str, set[str]] = {}
+
+        # ビルド内の重複排除テーブル: 重複排除キー -> 最初に変換したブロックの
+        # (画像パス, ページ, ブロック番号)
+        self._dedup_owners: dict[str, tuple[Path, str, int]] = {}
+        self._completed: set[str] = set()
+        self.renders_saved = 0
+        self._lock = threading.Lock()
+        # (SVGファイルのシグネチャ, 変換エンジン) -> レンダーキー（ビルド内で共有）
+        self._file_render_keys: dict[
+            tuple[tuple[str, int, int], Optional[str]], str
+        ] = {}
 
     def process_page(
         self,
@@ -23,7 +80,7 @@ class SvgProcessor:
         page_url: str = "",
         docs_dir: Union[str, Path, None] = None,
     ) -> tuple[str, list[str]]:
-        blocks = self.markdown_processor.extract_svg_blocks(markdown_content)
+        blocks = self._extract_svg_blocks(markdown_content)
 
         if not blocks:
             return markdown_content, []
@@ -41,6 +98,105 @@ class SvgProcessor:
 
         return markdown_content, []
 
+    def prefetch_page(
+        self,
+        page_file: str,
+        markdown_content: str,
+        output_dir: Union[str, Path],
+        docs_dir: Union[str, Path, None] = None,
+    ) -> int:
+        """ページ内のSVGブロックの変換をビルド全体のスケジューラに登録する
+
+        Returns:
+            新たに登録した変換の数
+        """
+        blocks = self._extract_svg_blocks(markdown_content)
+        if not blocks:
+            return 0
+
+        self._resolve_svg_file_paths(blocks, docs_dir, page_file)
+
+        submitted = 0
+        for i, block in enumerate(blocks):
+            # 他のプラグインが後から生成するSVGファイルはページ処理時に変換する
+            if block.file_path and not Path(block.file_path).exists():
+                continue
+
+            image_path = self._generate_image_path(block, page_file, i, output_dir)
+            if self._find_duplicate_owner(block, image_path, page_file, i):
+                continue
+
+            call = functools.partial(self._generate_png, block, image_path)
+            if self.scheduler.submit(str(image_path), call):
+                submitted += 1
+
+        return submitted
+
+    def _extract_svg_blocks(self, markdown_content: str) -> list[Any]:
+        """SVGを含まないページは抽出せずに空のリストを返す
+
+        ".svg"などの文字列を含まないページは部分文字列の検索だけで除外し、
+        含んでいてもブロックがなかったページは内容のハッシュで記録して、
+        次回以降のビルドでは抽出を省く。
+        """
+        if not may_contain_svg(markdown_content):
+            return []
+
+        digest = page_digest(markdown_content)
+        if digest in self.svg_free_pages:
+            return []
+
+        blocks = self.markdown_processor.extract_svg_blocks(markdown_content)
+        if not blocks:
+            self.svg_free_pages.add(digest)
+        return blocks
+
+    def start_prefetch(self) -> None:
+        """登録済みの変換をバックグラウンドで開始する"""
+        self.scheduler.start()
+
+    def begin_build(self) -> None:
+        """ビルドごとの状態を初期化する
+
+        前回のビルドが失敗してend_build()が呼ばれなかった場合にも、
+        前回の変換記録や統計を持ち越さないようにする。
+        """
+        self._reset_build_state()
+
+    def end_build(self, cancel: bool = False) -> None:
+        """1回のビルドを終える（ブラウザは次のビルドのために起動したまま残す）
+
+        Args:
+            cancel: まだ始まっていない事前変換を実行せずに取り消す（ビルド失敗時）
+        """
+        self._reset_build_state(cancel)
+        self.svg_free_pages.save()
+
+        # 全ての変換が終わってからキャッシュの利用記録を反映し、上限を超えた分を削除
+        if self.render_cache is not None:
+            self.render_cache.sweep()
+
+    def _reset_build_state(self, cancel: bool = False) -> None:
+        """実行中の事前変換を待ち、ビルド内の記録と統計を破棄する"""
+        self.scheduler.close(cancel=cancel)
+        self.unchanged_count = 0
+        self._dedup_owners = {}
+        self._completed = set()
+        self.renders_saved = 0
+        self._file_render_keys = {}
+        self.svg_converter.reset_backend_stats()
+        if self.render_cache is not None:
+            self.render_cache.reset_stats()
+
+    def close(self, cancel: bool = False) -> None:
+        """変換で使用したブラウザなどのリソースを解放する
+
+        Args:
+            cancel: まだ始まっていない事前変換を実行せずに取り消す（ビルド失敗時）
+        """
+        self.end_build(cancel)
+        self.svg_converter.close()
+
     def _resolve_svg_file_paths(
         self, blocks: list[Any], docs_dir: Union[str, Path, None], page_file: str = ""
     ) -> None:
@@ -63,6 +219,23 @@ class SvgProcessor:
         for block, resolved_path in zip(blocks, resolved_paths):
             if resolved_path and block.file_path:  # ファイル参照の場合のみ
                 block.file_path = resolved_path
+                if page_file:
+                    self.svg_dependents.setdefault(resolved_path, set()).add(page_file)
+
+    def detect_changed_svgs(self) -> dict[str, set[str]]:
+        """前回の変換以降に変更されたSVGファイルと、それを参照するページを返す
+
+        変更されたファイルの変換記録は破棄し、次のページ処理で再変換させる。
+        """
+        changed: dict[str, set[str]] = {}
+        for image_path, fingerprint in list(self._rendered.items()):
+            if isinstance(fingerprint, str):
+                continue
+            svg_path = fingerprint[0]
+            if _file_signature(svg_path) != fingerprint:
+                del self._rendered[image_path]
+                changed[svg_path] = self.svg_dependents.get(svg_path, set())
+        return changed
 
     def _process_svg_blocks(
         self, blocks: list[Any], page_file: str, output_dir: Union[str, Path]
@@ -71,14 +244,29 @@ class SvgProcessor:
         image_paths: list[str] = []
         successful_blocks: list[Any] = []
 
+        # 事前変換済みの結果を回収し、複数ブロックが残っていれば先にまとめて
+        # 並列変換する。結果は元の順序で処理する
+        planned_paths = [
+            self._generate_image_path(block, page_file, i, output_dir)
+            for i, block in enumerate(blocks)
+        ]
+
+        # 同じSVGが既に変換済み（または変換予定）なら、その画像を使い回す
+        reused: dict[int, Path] = {}
+        for i, (block, image_path) in enumerate(zip(blocks, planned_paths)):
+            owner_path = self._find_duplicate_owner(block, image_path, page_file, i)
+            if owner_path is not None:
+                reused[i] = owner_path
+
+        outcomes = self._render_blocks(blocks, planned_paths, skip=reused)
+
         for i, block in enumerate(blocks):
+            image_path = reused.get(i, planned_paths[i])
             try:
-                image_path = self._generate_image_path(block, page_file, i, output_dir)
-                success = block.generate_png(
-                    str(image_path), self.svg_converter, self.config
-                )
+                success = self._get_outcome(i, block, image_path, outcomes, reused)
 
                 if success:
+                    self._completed.add(str(image_path))
                     image_paths.append(str(image_path))
                     successful_blocks.append(block)
                 elif not self.config["error_on_fail"]:
@@ -97,6 +285,183 @@ class SvgProcessor:
 
         return image_paths, successful_blocks
 
+    def _get_outcome(
+        self,
+        index: int,
+        block: Any,
+        image_path: Path,
+        outcomes: dict[int, Union[bool, Exception]],
+        reused: dict[int, Path],
+    ) -> bool:
+        """重複・変換済みの結果があれば使い、なければ逐次変換する"""
+        if index in reused:
+            return self._reuse_rendered(image_path)
+        if index in outcomes:
+            return self._unwrap_outcome(outcomes[index])
+        return self._generate_png(block, image_path)
+
+    def _render_blocks(
+        self,
+        blocks: list[Any],
+        image_paths: list[Path],
+        skip: Collection[int] = (),
+    ) -> dict[int, Union[bool, Exception]]:
+        """事前変換・並列変換の結果をブロック番号ごとに返す
+
+        含まれないブロックは呼び出し側で逐次変換する。skipのブロックは対象外。
+        """
+        outcomes: dict[int, Union[bool, Exception]] = {}
+        remaining: list[tuple[int, Any, Path]] = []
+
+        for i, (block, image_path) in enumerate(zip(blocks, image_paths)):
+            if i in skip:
+                continue
+            if self.scheduler.has(str(image_path)):
+                outcomes[i] = self.scheduler.result(str(image_path))
+            else:
+                remaining.append((i, block, image_path))
+
+        if not remaining:
+            return outcomes
+
+        # バックグラウンドの事前変換と変換器を取り合わないよう完了を待つ
+        self.scheduler.wait()
+
+        if self.svg_converter.max_workers <= 1 or len(remaining) <= 1:
+            return outcomes
+
+        calls: list[Callable[[], bool]] = [
+            functools.partial(self._generate_png, block, image_path)
+            for _, block, image_path in remaining
+        ]
+        results = self.svg_converter.run_concurrently(calls)
+        for (i, _, _), result in zip(remaining, results):
+            outcomes[i] = result
+
+        return outcomes
+
+    def _find_duplicate_owner(
+        self, block: Any, image_path: Path, page_file: str, index: int
+    ) -> Optional[Path]:
+        """同じSVGを先に担当したブロックがあればその画像パスを返す
+
+        最初に現れたブロックを担当として登録し、Noneを返す。重複排除キーは
+        解決済みのファイルパス・SVGの内容・描画設定から求める。
+        """
+        if not self.config.get("deduplicate", True):
+            return None
+
+        render_key = self._get_render_key(block)
+        if not render_key:
+            return None
+
+        dedup_key = f"{block.file_path}\0{render_key}"
+        owner_path, owner_page, owner_index = self._dedup_owners.setdefault(
+            dedup_key, (image_path, page_file, index)
+        )
+        if (owner_page, owner_index) == (page_file, index):
+            return None
+        return owner_path
+
+    def _reuse_rendered(self, owner_path: Path) -> bool:
+        """担当ブロックの変換結果を待って使い回す"""
+        if self.scheduler.has(str(owner_path)):
+            success = self._unwrap_outcome(self.scheduler.result(str(owner_path)))
+        else:
+            success = str(owner_path) in self._completed
+
+        if success:
+            self.logger.debug(f"Reusing rendered image for duplicate SVG: {owner_path}")
+            self.renders_saved += 1
+        return success
+
+    def _generate_png(self, block: Any, image_path: Path) -> bool:
+        """キャッシュを確認し、なければ変換してPNG画像を生成する"""
+        fingerprint = self._get_fingerprint(block)
+
+        # 前回のビルドから内容も描画設定も変わっていなければ出力済みの画像を使う
+        if (
+            fingerprint is not None
+            and self._rendered.get(str(image_path)) == fingerprint
+            and image_path.exists()
+        ):
+            self.logger.debug(f"SVG unchanged since last build: {image_path}")
+            with self._lock:
+                self.unchanged_count += 1
+            return True
+
+        cache = self.render_cache
+        if isinstance(fingerprint, str):
+            render_key = fingerprint
+        elif cache:
+            render_key = self._get_render_key(block)
+        else:
+            render_key = ""
+
+        if cache and render_key and cache.fetch(render_key, image_path):
+            success = True
+        else:
+            success = bool(
+                block.generate_png(str(image_path), self.svg_converter, self.config)
+            )
+            if cache and render_key and success:
+                cache.store(render_key, image_path)
+
+        if fingerprint is not None and success:
+            self._rendered[str(image_path)] = fingerprint
+        return success
+
+    def _get_fingerprint(self, block: Any) -> Optional[_Fingerprint]:
+        """incremental用のフィンガープリントを求める（無効時・取得失敗時はNone）
+
+        SVGファイル参照は内容を読まずに更新時刻とサイズで変更を判定する。
+        """
+        if not self.incremental:
+            return None
+        if block.file_path:
+            return _file_signature(block.file_path)
+        return self._get_render_key(block) or None
+
+    def _get_render_key(self, block: Any) -> str:
+        """SVGの内容と描画設定からレンダーキーを求める（読めない場合は空文字）
+
+        キーはブロックごとに1度だけ求めて保持する。SVGファイル参照は、
+        事前変換とページ処理で別々に抽出したブロックの間でも、更新時刻と
+        サイズが同じなら求めたキーを使い回す。
+        """
+        if block.render_key is None:
+            block.render_key = self._compute_render_key(block)
+        return str(block.render_key)
+
+    def _compute_render_key(self, block: Any) -> str:
+        backend = block.get_backend()
+        signature = _file_signature(block.file_path) if block.file_path else None
+        if signature is not None:
+            render_key = self._file_render_keys.get((signature, backend))
+            if render_key is not None:
+                return render_key
+
+        try:
+            # ファイルは全体を読み込まずに一定サイズずつハッシュする
+            render_key = compute_render_key(
+                block.iter_source_chunks(),
+                self.svg_converter.get_render_settings(backend),
+            )
+        except OSError:
+            # 読めないファイルは変換側でエラー処理する
+            return ""
+
+        if signature is not None:
+            self._file_render_keys[(signature, backend)] = render_key
+        return render_key
+
+    @staticmethod
+    def _unwrap_outcome(outcome: Union[bool, Exception]) -> bool:
+        """並列変換の結果を逐次処理と同じ形（戻り値または例外）に戻す"""
+        if isinstance(outcome, Exception):
+            raise outcome
+        return bool(outcome)
+
     def _generate_image_path(
         self, block: Any, page_file: str, index: int, output_dir: Union[str, Path]
     ) -> Path:
@@ -0,0 +1,299 @@
+"""Content-addressed on-disk cache of rendered PNG images."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .logging_config import get_logger
+from .utils import ensure_directory, write_file_if_changed
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+def compute_render_key(
+    svg_source: bytes | Iterable[bytes], render_settings: dict[str, Any]
+) -> str:
+    """Compute the cache key of one rendering.
+
+    Args:
+        svg_source: Raw SVG source, or its chunks in order (so that large
+            files can be hashed without loading them whole)
+        render_settings: Every parameter that affects the rendered PNG
+
+    Returns:
+        Hex digest identifying the rendered output
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps(render_settings, sort_keys=True).encode("utf-8"))
+    digest.update(b"\0")
+    if isinstance(svg_source, bytes):
+        digest.update(svg_source)
+    else:
+        for chunk in svg_source:
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+INDEX_FILENAME = "index.json"
+LOCK_FILENAME = "index.lock"
+
+# A lock file older than this is assumed to belong to a crashed build
+STALE_LOCK_SECONDS = 60.0
+LOCK_TIMEOUT_SECONDS = 30.0
+
+
+@contextlib.contextmanager
+def _exclusive_lock(lock_path: Path) -> Iterator[None]:
+    """Hold a lock file shared by every build using the same cache directory.
+
+    Uses O_CREAT | O_EXCL, which is atomic on every platform and filesystem
+    the cache is expected to live on.
+    """
+    deadline = time.monotonic() + LOCK_TIMEOUT_SECONDS
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            with contextlib.suppress(FileNotFoundError):
+                if time.time() - lock_path.stat().st_mtime > STALE_LOCK_SECONDS:
+                    lock_path.unlink()
+                    continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for {lock_path}") from None
+            time.sleep(0.05)
+
+    try:
+        os.write(fd, str(os.getpid()).encode("ascii"))
+        os.close(fd)
+        yield
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            lock_path.unlink()
+
+
+class RenderCache:
+    """Persistent cache mapping render keys to PNG files.
+
+    Entries are stored as ``<cache_dir>/<key[:2]>/<key>.png`` and written via a
+    temporary file and an atomic rename, so an interrupted build never leaves a
+    truncated entry behind.
+
+    The directory may be shared by several checkouts and concurrent builds.
+    Access times are collected in memory during a build and merged into a
+    compact index file by sweep(), which also enforces the size limits with
+    LRU eviction while holding a lock file.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        max_bytes: int = 0,
+        max_entries: int = 0,
+        max_age_builds: int = 0,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cached PNG files
+            max_bytes: Total size limit of all entries (0 for unlimited)
+            max_entries: Limit on the number of entries (0 for unlimited)
+            max_age_builds: Remove entries not used in this many builds
+                (0 to keep them regardless of age)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_age_builds = max_age_builds
+        self.logger = get_logger(__name__)
+
+        self.hits = 0
+        self.misses = 0
+        # Hits whose output already held the cached image
+        self.unchanged = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._touched: dict[str, float] = {}
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.png"
+
+    def fetch(self, key: str, output_path: str | Path) -> bool:
+        """Copy a cached rendering to output_path.
+
+        The output is replaced atomically, and not rewritten at all when it
+        already holds the cached image.
+
+        Args:
+            key: Render key from compute_render_key
+            output_path: Destination PNG path
+
+        Returns:
+            True on a cache hit, False otherwise
+        """
+        entry = self._entry_path(key)
+        try:
+            ensure_directory(str(Path(output_path).parent))
+            written = write_file_if_changed(output_path, entry.read_bytes())
+        except FileNotFoundError:
+            self._count(hit=False)
+            return False
+        except OSError as e:
+            self.logger.warning(f"Failed to read render cache entry {entry}: {e}")
+            self._count(hit=False)
+            return False
+
+        self.logger.debug(f"Render cache hit: {output_path}")
+        self._count(hit=True, unchanged=not written)
+        self._touch(key)
+        return True
+
+    def store(self, key: str, png_path: str | Path) -> None:
+        """Add a freshly rendered PNG to the cache.
+
+        Args:
+            key: Render key from compute_render_key
+            png_path: PNG file produced by the converter
+        """
+        entry = self._entry_path(key)
+        try:
+            ensure_directory(str(entry.parent))
+            fd, temp_path = tempfile.mkstemp(
+                dir=entry.parent, prefix=".tmp-", suffix=".png"
+            )
+            os.close(fd)
+            try:
+                shutil.copyfile(png_path, temp_path)
+                Path(temp_path).replace(entry)
+            except BaseException:
+                Path(temp_path).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            self.logger.warning(f"Failed to write render cache entry {entry}: {e}")
+            return
+
+        self._touch(key)
+
+    def reset_stats(self) -> None:
+        """Start counting hits, misses and evictions from zero (once per build)."""
+        with self._lock:
+            self.hits = self.misses = self.unchanged = self.evictions = 0
+
+    def sweep(self) -> None:
+        """Record this build's accesses and evict entries over the limits.
+
+        Entries unused for max_age_builds builds are removed first, then the
+        least recently used entries until max_bytes and max_entries hold.
+        """
+        if not self.cache_dir.is_dir():
+            return
+
+        with self._lock:
+            touched, self._touched = self._touched, {}
+
+        try:
+            with _exclusive_lock(self.cache_dir / LOCK_FILENAME):
+                index = self._load_index()
+                self._update_index(index, touched)
+                self._evict(index)
+                self._save_index(index)
+        except (OSError, TimeoutError) as e:
+            self.logger.warning(f"Render cache maintenance skipped: {e}")
+
+    def _touch(self, key: str) -> None:
+        with self._lock:
+            self._touched[key] = time.time()
+
+    def _load_index(self) -> dict[str, Any]:
+        """Read the index, starting over if it is missing or unreadable."""
+        try:
+            index = json.loads((self.cache_dir / INDEX_FILENAME).read_text("utf-8"))
+            if isinstance(index, dict) and isinstance(index.get("entries"), dict):
+                return index
+        except (OSError, ValueError):
+            pass
+        return {"build": 0, "entries": {}}
+
+    def _update_index(self, index: dict[str, Any], touched: dict[str, float]) -> None:
+        """Bump the build counter and reconcile the index with the directory.
+
+        Each entry is stored as ``[size, last_access_time, last_build]``.
+        """
+        build = index["build"] = int(index.get("build", 0)) + 1
+        entries: dict[str, list[Any]] = index["entries"]
+
+        on_disk: dict[str, os.stat_result] = {}
+        for path in self.cache_dir.glob("??/*.png"):
+            with contextlib.suppress(FileNotFoundError):
+                on_disk[path.stem] = path.stat()
+
+        # Forget entries deleted elsewhere, adopt ones written by other builds
+        for key in list(entries):
+            if key not in on_disk:
+                del entries[key]
+        for key, stat in on_disk.items():
+            if key not in entries:
+                entries[key] = [stat.st_size, stat.st_mtime, build]
+
+        for key, access_time in touched.items():
+            if key in on_disk:
+                entries[key] = [on_disk[key].st_size, access_time, build]
+
+    def _evict(self, index: dict[str, Any]) -> None:
+        """Remove stale entries, then least recently used ones over the limits."""
+        build = index["build"]
+        entries: dict[str, list[Any]] = index["entries"]
+
+        if self.max_age_builds > 0:
+            for key in [
+                key
+                for key, (_, _, last_build) in entries.items()
+                if build - last_build >= self.max_age_builds
+            ]:
+                self._remove_entry(entries, key)
+
+        total_bytes = sum(size for size, _, _ in entries.values())
+        for key in sorted(entries, key=lambda k: entries[k][1]):
+            over_bytes = self.max_bytes > 0 and total_bytes > self.max_bytes
+            over_entries = self.max_entries > 0 and len(entries) > self.max_entries
+            if not (over_bytes or over_entries):
+                break
+            total_bytes -= entries[key][0]
+            self._remove_entry(entries, key)
+
+    def _remove_entry(self, entries: dict[str, list[Any]], key: str) -> None:
+        del entries[key]
+        self._entry_path(key).unlink(missing_ok=True)
+        self.evictions += 1
+
+    def _save_index(self, index: dict[str, Any]) -> None:
+        """Write the index atomically so readers never see a partial file."""
+        fd, temp_path = tempfile.mkstemp(
+            dir=self.cache_dir, prefix=".tmp-", suffix=".json"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(index, f, separators=(",", ":"))
+            Path(temp_path).replace(self.cache_dir / INDEX_FILENAME)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    def _count(self, hit: bool, unchanged: bool = False) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            if unchanged:
+                self.unchanged += 1
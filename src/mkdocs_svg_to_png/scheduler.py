@@ -0,0 +1,142 @@
+"""Build-wide scheduling of SVG conversions ahead of page processing."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any
+
+from .logging_config import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class RenderScheduler:
+    """Render conversions for the whole site in the background.
+
+    Conversions are queued during a pre-pass over every Markdown source, then
+    started at once on a background thread so they keep the browser page pool
+    busy while MkDocs walks the pages. Page processing later collects the
+    already running (or finished) results by key.
+
+    Conversions queued after an earlier start() run once the earlier ones
+    have finished, so a build that was not closed (e.g. a failed
+    ``mkdocs serve`` rebuild) cannot leave later requests waiting forever.
+    """
+
+    def __init__(self, svg_converter: Any) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            svg_converter: Converter providing run_concurrently()
+        """
+        self.svg_converter = svg_converter
+        self.logger = get_logger(__name__)
+
+        self._futures: dict[str, Future[bool]] = {}
+        self._pending: list[tuple[Future[bool], Callable[[], None]]] = []
+        self._thread: threading.Thread | None = None
+
+    def submit(self, key: str, call: Callable[[], bool]) -> bool:
+        """Queue a conversion unless one with the same key is already queued.
+
+        Args:
+            key: Identifier of the conversion (the output image path)
+            call: Callable performing the conversion
+
+        Returns:
+            True if the conversion was queued, False if it was a duplicate
+        """
+        if key in self._futures:
+            return False
+
+        future: Future[bool] = Future()
+        self._futures[key] = future
+
+        def run() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(call())
+            except Exception as e:
+                future.set_exception(e)
+
+        self._pending.append((future, run))
+        return True
+
+    def start(self) -> None:
+        """Start rendering every queued conversion on a background thread.
+
+        If conversions started earlier are still running, the new ones follow
+        them on another thread.
+        """
+        if not self._pending:
+            return
+
+        jobs, self._pending = self._pending, []
+        self.logger.info(f"Prefetching {len(jobs)} SVG conversions")
+
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(jobs, self._thread),
+            name="svg-to-png-scheduler",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _run(
+        self,
+        jobs: list[tuple[Future[bool], Callable[[], None]]],
+        previous: threading.Thread | None,
+    ) -> None:
+        if previous is not None:
+            previous.join()
+        try:
+            self.svg_converter.run_concurrently([run for _, run in jobs])
+        except BaseException as e:
+            self.logger.error(f"Prefetch rendering aborted: {e}")
+            for future, _ in jobs:
+                if not future.done():
+                    future.set_exception(e)
+
+    def has(self, key: str) -> bool:
+        """Return True if a conversion with this key was scheduled."""
+        return key in self._futures
+
+    def result(self, key: str) -> bool | Exception:
+        """Wait for a scheduled conversion and return its outcome.
+
+        Args:
+            key: Identifier passed to submit()
+
+        Returns:
+            The conversion result, or the exception it raised
+        """
+        future = self._futures[key]
+        exception = future.exception()
+        if exception is not None:
+            if isinstance(exception, Exception):
+                return exception
+            raise exception
+        return future.result()
+
+    def wait(self) -> None:
+        """Block until all background rendering started so far has finished."""
+        if self._thread is not None:
+            self._thread.join()
+
+    def close(self, cancel: bool = False) -> None:
+        """Wait for outstanding work and forget all scheduled conversions.
+
+        Args:
+            cancel: Cancel conversions that have not started yet instead of
+                running them (when the build is aborted)
+        """
+        if cancel:
+            for future in self._futures.values():
+                future.cancel()
+        self.wait()
+        self._thread = None
+        self._pending = []
+        self._futures = {}
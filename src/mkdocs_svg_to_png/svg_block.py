@@ -1,9 +1,13 @@
 import contextlib
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
 from .utils import generate_image_filename
 
+# レンダーキーを求める際にSVGファイルを読み込む単位
+SOURCE_CHUNK_SIZE = 1024 * 1024
+
 
 def _calculate_relative_path_prefix(page_file: str) -> str:
     """ページファイルパスから適切な相対パスプレフィックスを計算する
@@ -43,6 +47,8 @@ class SvgBlock:
         self.start_pos = start_pos
         self.end_pos = end_pos
         self.attributes = attributes or {}
+        # 重複排除・キャッシュ・serveの差分判定で共有するレンダーキー（未計算はNone）
+        self.render_key: str | None = None
 
     def __repr__(self) -> str:
         if self.file_path:
@@ -60,14 +66,39 @@ class SvgBlock:
         self, output_path: str, svg_converter: Any, config: dict[str, Any]
     ) -> bool:
         """SVGからPNG画像を生成する"""
+        # {backend: cairo} のようにブロック単位で変換エンジンを指定できる
+        backend = self.get_backend()
+        options = {"backend": backend} if backend else {}
+
         if self.file_path:
             # SVGファイルから変換
-            result = svg_converter.convert_svg_file(self.file_path, output_path)
+            result = svg_converter.convert_svg_file(
+                self.file_path, output_path, **options
+            )
         else:
             # インラインSVGコードから変換
-            result = svg_converter.convert_svg_content(self.code, output_path)
+            result = svg_converter.convert_svg_content(
+                self.code, output_path, **options
+            )
         return bool(result)
 
+    def get_backend(self) -> str | None:
+        """ブロックの属性で指定された変換エンジン名を返す（未指定ならNone）"""
+        backend = self.attributes.get("backend")
+        return str(backend) if backend else None
+
+    def iter_source_chunks(self) -> Iterator[bytes]:
+        """変換元のSVGデータを順に返す
+
+        ファイル参照は全体をメモリに載せず、一定サイズずつ読み込む。
+        """
+        if not self.file_path:
+            yield self.code.encode("utf-8")
+            return
+        with Path(self.file_path).open("rb") as f:
+            while chunk := f.read(SOURCE_CHUNK_SIZE):
+                yield chunk
+
     def get_image_markdown(
         self,
         image_path: str,
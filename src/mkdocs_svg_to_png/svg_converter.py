@@ -3,9 +3,19 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
+import functools
+import html
+import importlib.metadata
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
 try:
     from playwright.async_api import async_playwright
@@ -21,9 +31,74 @@ except ImportError:
     # Fallback to standard library (less secure but available)
     import xml.etree.ElementTree as ET  # nosec B405
 
-from .exceptions import SvgConversionError, SvgFileError
+from .backends import (
+    AUTO_BACKEND,
+    AUTO_ENGINES,
+    BACKENDS,
+    PLAYWRIGHT_BACKEND,
+    RenderBackend,
+    create_backend,
+    detect_features,
+    select_engines,
+)
+from .exceptions import SvgConfigError, SvgConversionError, SvgFileError
 from .logging_config import get_logger
-from .utils import ensure_directory
+from .svg_document import ParsedSvg, parse_dimension
+from .utils import ensure_directory, write_file_if_changed
+
+T = TypeVar("T")
+
+# SVG markup, output path, unscaled size and the future of one batched request
+_BatchItem = tuple[str, str, "tuple[int, int] | None", "asyncio.Future[bool]"]
+
+# How long a partially filled batch waits for more diagrams before rendering
+BATCH_WINDOW_SECONDS = 0.005
+
+# href/src attributes, CSS url() and @import pointing anywhere other than a
+# fragment of the same document or an embedded data: URI
+_EXTERNAL_REFERENCE_RE = re.compile(
+    r"""(?:\b(?:href|src)\s*=\s*["']|url\(\s*["']?|@import\s+(?:url\()?["']?)"""
+    r"""\s*(?!#|data:)[^\s"')]""",
+    re.IGNORECASE,
+)
+
+# Resolves after the browser has produced two animation frames, i.e. once the
+# loaded document has been laid out and painted at least once
+_WAIT_FOR_PAINT_SCRIPT = (
+    "() => new Promise(resolve => "
+    "requestAnimationFrame(() => requestAnimationFrame(() => resolve())))"
+)
+
+
+# Sizes the root <svg> of a document loaded by URL, like the width/height 100%
+# rule of the inline wrapper page
+_SIZE_SVG_DOCUMENT_SCRIPT = (
+    "([width, height]) => {"
+    " const svg = document.documentElement;"
+    " svg.setAttribute('width', width);"
+    " svg.setAttribute('height', height); }"
+)
+
+
+def references_external_resources(svg_content: str) -> bool:
+    """Return True if the SVG loads images, fonts or stylesheets from elsewhere.
+
+    Args:
+        svg_content: String containing SVG markup
+
+    Returns:
+        True when rendering may depend on network requests
+    """
+    return _EXTERNAL_REFERENCE_RE.search(svg_content) is not None
+
+
+@functools.cache
+def _get_package_version(package: str) -> str:
+    """Return the installed version of a package, or "unknown"."""
+    try:
+        return importlib.metadata.version(package)
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
 
 
 class SvgToPngConverter:
@@ -38,12 +113,103 @@ class SvgToPngConverter:
         self.config = config
         self.logger = get_logger(__name__)
 
-    def convert_svg_content(self, svg_content: str, output_path: str) -> bool:
+        # Long-lived Playwright resources shared by every conversion.
+        # The browser is bound to the event loop that launched it, so the
+        # converter owns that loop as well and runs it on a dedicated thread
+        # for its whole lifetime; callers submit coroutines to it.
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: threading.Thread | None = None
+        self._playwright: Any = None
+        self._browser: Any = None
+        self._context: Any = None
+        self._lock = threading.Lock()
+
+        # Pool of reusable pages (tabs). A slot is held for as long as a page
+        # is in use, so at most max_concurrency pages are open; a page closed
+        # after a failure gives its slot back and the next caller opens a new
+        # one. Only pages of the current browser context are kept idle.
+        self.max_concurrency = max(1, int(config.get("max_concurrency", 4)))
+        self._page_slots: asyncio.Semaphore | None = None
+        # Serializes launching and relaunching, so that pages opened at once
+        # share a single browser
+        self._launch_lock: asyncio.Lock | None = None
+        self._idle_pages: list[Any] = []
+        self._context_pages: set[Any] = set()
+        self._atexit_registered = False
+
+        # Batched mode: up to batch_size diagrams requested concurrently are
+        # rendered together in one page and captured with clipped screenshots
+        self.batch_size = max(1, int(config.get("batch_size", 1)))
+        self.max_workers = self.max_concurrency * self.batch_size
+        self._batch: list[_BatchItem] = []
+        self._batch_timer: asyncio.TimerHandle | None = None
+        self._batch_tasks: set[asyncio.Task[None]] = set()
+        self._concurrent_runs = 0
+
+        # Engine used unless a diagram asks for another one; non-browser
+        # backends are created on first use
+        self.backend = str(config.get("backend", PLAYWRIGHT_BACKEND))
+        self._backends: dict[str, RenderBackend] = {}
+        self._backends_lock = threading.Lock()
+        self._unavailable: set[str] = set()
+        # Engines rendering out of process can keep every CPU busy
+        engines = AUTO_ENGINES if self.backend == AUTO_BACKEND else [self.backend]
+        for name in engines:
+            if name in BACKENDS:
+                self.max_workers = max(
+                    self.max_workers, BACKENDS[name].parallelism(config)
+                )
+
+        # Diagrams rendered and cumulative seconds spent per engine
+        self.backend_stats: dict[str, tuple[int, float]] = {}
+        # Renderings identical to the PNG already on disk, left unwritten
+        self.unchanged_outputs = 0
+        self._stats_lock = threading.Lock()
+
+    def get_render_settings(self, backend: str | None = None) -> dict[str, Any]:
+        """Return every setting that affects the rendered PNG.
+
+        Used to key cached renderings, so a change in any of these values
+        (including the rendering engine version) invalidates them.
+
+        Args:
+            backend: Engine override of the diagram (None for the default)
+
+        Returns:
+            Dictionary of render-affecting settings
+        """
+        name = backend or self.backend
+        if name == AUTO_BACKEND:
+            # The routing depends on which engines are installed
+            version = ",".join(
+                f"{engine}={self._get_engine_version(engine)}"
+                for engine in [*AUTO_ENGINES, PLAYWRIGHT_BACKEND]
+            )
+        else:
+            version = self._get_engine_version(name)
+
+        return {
+            "backend": name,
+            "backend_version": version,
+            "scale": self.config.get("scale", 1.0),
+            "device_scale_factor": self.config.get("device_scale_factor", 1.0),
+            "default_width": self.config.get("default_width", 800),
+            "default_height": self.config.get("default_height", 600),
+            # How Chromium loads the SVG decides whether relative references
+            # inside it resolve, and how long external resources may load
+            "load_files_by_url": self.config.get("load_files_by_url", False),
+            "wait_for_network_idle": self.config.get("wait_for_network_idle", False),
+        }
+
+    def convert_svg_content(
+        self, svg_content: str, output_path: str, backend: str | None = None
+    ) -> bool:
         """Convert SVG content string to PNG file.
 
         Args:
             svg_content: String containing SVG markup
             output_path: Path where PNG file should be saved
+            backend: Engine to use instead of the configured one
 
         Returns:
             True if conversion was successful, False otherwise
@@ -52,29 +218,24 @@ class SvgToPngConverter:
             SvgConversionError: If conversion fails and error_on_fail is True
         """
         try:
-            self._validate_svg_content(svg_content)
-
-            # Ensure output directory exists
-            ensure_directory(str(Path(output_path).parent))
-
-            # Convert SVG to PNG using Playwright
-            success = self._run_playwright_conversion(svg_content, output_path)
-
-            if success:
-                self.logger.info(f"Generated PNG image: {output_path}")
-                return True
-            else:
-                return False
+            # Parsed once; validation, sizing and engine selection share it
+            parsed = self._validate_svg_content(svg_content)
+            return self._convert(svg_content, parsed, output_path, backend)
 
         except Exception as e:
-            return self._handle_conversion_error(e, output_path, svg_content)
+            return self._handle_conversion_error(
+                e, output_path, svg_content, backend=backend or self.backend
+            )
 
-    def convert_svg_file(self, svg_path: str, output_path: str) -> bool:
+    def convert_svg_file(
+        self, svg_path: str, output_path: str, backend: str | None = None
+    ) -> bool:
         """Convert SVG file to PNG file.
 
         Args:
             svg_path: Path to input SVG file
             output_path: Path where PNG file should be saved
+            backend: Engine to use instead of the configured one
 
         Returns:
             True if conversion was successful, False otherwise
@@ -97,38 +258,235 @@ class SvgToPngConverter:
                 )
             return False
 
-        try:
-            # Read SVG content and convert
-            svg_content = svg_file.read_text(encoding="utf-8")
-            return self.convert_svg_content(svg_content, output_path)
+        name = backend or self.backend
+        if name == PLAYWRIGHT_BACKEND and not self.config.get(
+            "load_files_by_url", False
+        ):
+            # Chromium gets the markup inlined: read it exactly once
+            svg_content = None
+            try:
+                svg_content = svg_file.read_text(encoding="utf-8")
+                if backend is None:
+                    return self.convert_svg_content(svg_content, output_path)
+                return self.convert_svg_content(svg_content, output_path, backend)
+            except Exception as e:
+                return self._handle_conversion_error(
+                    e, output_path, svg_content, svg_path, backend=name
+                )
 
+        try:
+            # The engine reads the file itself; it is only streamed through
+            # the parser here and never held in memory as a whole
+            parsed = self._validate_svg_file(svg_file)
+            return self._convert(svg_file, parsed, output_path, backend)
         except Exception as e:
-            svg_content = svg_file.read_text(encoding="utf-8")
-            return self._handle_conversion_error(e, output_path, svg_content, svg_path)
+            return self._handle_conversion_error(
+                e, output_path, None, svg_path, backend=name
+            )
+
+    def _convert(
+        self,
+        source: str | Path,
+        parsed: ParsedSvg,
+        output_path: str,
+        backend: str | None,
+    ) -> bool:
+        """Render validated SVG markup or file with the selected engine.
+
+        Args:
+            source: SVG markup, or the path of an SVG file
+            parsed: The parsed SVG
+            output_path: Path where PNG file should be saved
+            backend: Engine to use instead of the configured one
+
+        Returns:
+            True if conversion was successful, False otherwise
+        """
+        # Ensure output directory exists
+        ensure_directory(str(Path(output_path).parent))
+
+        name = backend or self.backend
+        if name == AUTO_BACKEND:
+            success = self._convert_auto(source, output_path, parsed)
+        else:
+            success = self._render(name, source, output_path, parsed)
+
+        if success:
+            self.logger.info(f"Generated PNG image: {output_path}")
+            return True
+        else:
+            return False
+
+    def reset_backend_stats(self) -> None:
+        """Start counting renders per engine from zero (once per build)."""
+        with self._stats_lock:
+            self.backend_stats = {}
+            self.unchanged_outputs = 0
+
+    def _write_png(self, output_path: str, png: bytes) -> None:
+        """Write a rendered PNG unless the file already holds the same image.
+
+        Keeping identical files untouched preserves their modification time
+        for downstream caches and watchers.
+        """
+        if not write_file_if_changed(output_path, png):
+            self.logger.debug(f"PNG unchanged, not rewritten: {output_path}")
+            self._count_unchanged()
+
+    def _count_unchanged(self) -> None:
+        with self._stats_lock:
+            self.unchanged_outputs += 1
+
+    def _render(
+        self,
+        name: str,
+        source: str | Path,
+        output_path: str,
+        parsed: ParsedSvg | None = None,
+    ) -> bool:
+        """Render markup or a file with one engine and record how long it took."""
+        start = time.perf_counter()
+        size = self._get_dimensions(parsed) if parsed is not None else None
+        if (
+            name == PLAYWRIGHT_BACKEND
+            and isinstance(source, Path)
+            and self.config.get("load_files_by_url", False)
+        ):
+            # Chromium loads the file by URL and reads it from disk itself
+            success = self._run_playwright_file_conversion(source, output_path, size)
+        elif name == PLAYWRIGHT_BACKEND:
+            # Convert SVG to PNG using Playwright
+            svg_content = (
+                source.read_text(encoding="utf-8")
+                if isinstance(source, Path)
+                else source
+            )
+            success = self._run_playwright_conversion(svg_content, output_path, size)
+        else:
+            if not self._render_with_backend(name, source, output_path, size):
+                self._count_unchanged()
+            success = True
+
+        if success:
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                count, total = self.backend_stats.get(name, (0, 0.0))
+                self.backend_stats[name] = (count + 1, total + elapsed)
+        return success
+
+    def _convert_auto(
+        self, source: str | Path, output_path: str, parsed: ParsedSvg | None = None
+    ) -> bool:
+        """Render with the cheapest engine able to draw this SVG correctly.
+
+        Engines that are not installed or fail on the diagram are skipped,
+        ending with Chromium, which renders every SVG.
+
+        Args:
+            source: SVG markup, or the path of an SVG file
+            output_path: Path where PNG file should be saved
+            parsed: The already parsed SVG (required for files)
 
-    def _validate_svg_content(self, svg_content: str) -> None:
+        Returns:
+            True if conversion was successful, False otherwise
+        """
+        if parsed is not None:
+            features = parsed.features
+        else:
+            features = detect_features(str(source))
+        *engines, last = select_engines(features)
+        for name in engines:
+            if name in self._unavailable:
+                continue
+            try:
+                if self._render(name, source, output_path, parsed):
+                    return True
+            except SvgConfigError as e:
+                self.logger.info(f"Skipping {name} backend in auto mode: {e}")
+                self._unavailable.add(name)
+            except Exception as e:
+                self.logger.debug(f"{name} backend failed, falling back: {e}")
+        return self._render(last, source, output_path, parsed)
+
+    def _get_engine_version(self, name: str) -> str:
+        """Return the version of an engine for cache keys."""
+        if name == PLAYWRIGHT_BACKEND:
+            return _get_package_version("playwright")
+        try:
+            return self._get_backend(name).get_version()
+        except SvgConfigError:
+            # Reported by the conversion itself
+            return "unavailable"
+
+    def _get_backend(self, name: str) -> RenderBackend:
+        """Return the non-browser backend with this name, creating it once."""
+        with self._backends_lock:
+            if name not in self._backends:
+                self._backends[name] = create_backend(name, self.config)
+            return self._backends[name]
+
+    def _render_with_backend(
+        self,
+        name: str,
+        source: str | Path,
+        output_path: str,
+        size: tuple[int, int] | None = None,
+    ) -> bool:
+        """Rasterize with a non-browser backend at the same size as Chromium.
+
+        Args:
+            name: Backend name
+            source: SVG markup, or the path of an SVG file
+            output_path: Path where PNG file should be saved
+            size: Unscaled SVG size (required for files)
+
+        Returns:
+            True if the file was written, False if it was already up to date
+        """
+        if size is None:
+            size = self._extract_svg_dimensions(str(source))
+        width, height = size
+        scale = self.config.get("scale", 1.0) * self.config.get(
+            "device_scale_factor", 1.0
+        )
+        scaled_width = max(1, int(width * scale))
+        scaled_height = max(1, int(height * scale))
+
+        backend = self._get_backend(name)
+        if isinstance(source, Path):
+            return backend.render_file(
+                str(source), output_path, scaled_width, scaled_height
+            )
+        return backend.render(source, output_path, scaled_width, scaled_height)
+
+    def _validate_svg_content(self, svg_content: str) -> ParsedSvg:
         """Validate that content is valid SVG.
 
         Args:
             svg_content: String containing SVG markup
 
+        Returns:
+            The parsed SVG, for reuse by the rest of the conversion
+
         Raises:
             SvgConversionError: If SVG content is invalid
         """
         try:
             # Try to parse as XML using defusedxml (secure) or fallback
-            ET.fromstring(svg_content)  # nosec B314
+            parsed = ParsedSvg.parse(svg_content)
 
-            # Check if it's actually SVG (allow XML declaration)
-            content_stripped = svg_content.strip()
+            # Check if it's actually SVG (allow XML declaration), without
+            # copying what may be a very large string
+            start = re.match(r"\s*(<svg|<\?xml)", svg_content)
             if not (
-                content_stripped.startswith("<svg")
-                or (content_stripped.startswith("<?xml") and "<svg" in content_stripped)
+                start is not None
+                and (start.group(1) == "<svg" or "<svg" in svg_content)
             ):
                 raise SvgConversionError(
                     "Invalid SVG content: Must contain <svg> tag",
                     svg_content=svg_content,
                 )
+            return parsed
 
         except ET.ParseError as e:
             raise SvgConversionError(
@@ -137,8 +495,39 @@ class SvgToPngConverter:
                 cairo_error=str(e),
             ) from e
 
+    def _validate_svg_file(self, svg_file: Path) -> ParsedSvg:
+        """Validate an SVG file by streaming it through the parser.
+
+        Args:
+            svg_file: Path of the SVG file
+
+        Returns:
+            The parsed SVG
+
+        Raises:
+            SvgConversionError: If the file is not valid SVG
+        """
+        try:
+            parsed = ParsedSvg.parse_file(svg_file)
+        except ET.ParseError as e:
+            raise SvgConversionError(
+                "Invalid SVG content: XML parsing failed",
+                svg_path=str(svg_file),
+                cairo_error=str(e),
+            ) from e
+
+        if parsed.root_tag != "svg":
+            raise SvgConversionError(
+                "Invalid SVG content: Must contain <svg> tag",
+                svg_path=str(svg_file),
+            )
+        return parsed
+
     async def _convert_svg_with_playwright(
-        self, svg_content: str, output_path: str
+        self,
+        svg_content: str,
+        output_path: str,
+        size: tuple[int, int] | None = None,
     ) -> bool:
         """Convert SVG content to PNG using Playwright browser engine.
 
@@ -150,71 +539,447 @@ class SvgToPngConverter:
         Args:
             svg_content: String containing SVG markup
             output_path: Path where PNG file should be saved
+            size: Unscaled SVG size, if already known
 
         Returns:
             True if conversion was successful, False otherwise
         """
-        async with async_playwright() as p:
-            # Launch Chromium browser
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                device_scale_factor=self.config.get("device_scale_factor", 1.0)
+        page = await self._acquire_page()
+        reusable = False
+
+        try:
+            # Extract SVG dimensions
+            width, height = size or self._extract_svg_dimensions(svg_content)
+
+            # Calculate scaled dimensions
+            scale = self.config.get("scale", 1.0)
+            scaled_width = int(width * scale)
+            scaled_height = int(height * scale)
+
+            # Set viewport to match SVG dimensions
+            await page.set_viewport_size(
+                {"width": scaled_width, "height": scaled_height}
             )
-            page = await context.new_page()
 
-            try:
-                # Extract SVG dimensions
-                width, height = self._extract_svg_dimensions(svg_content)
+            # Load HTML content with embedded SVG
+            await page.set_content(
+                self._build_html(svg_content, scaled_width, scaled_height)
+            )
+
+            # Wait for SVG to render
+            await self._wait_for_render(page, [svg_content], output_path)
+
+            # Take screenshot with transparent background
+            png = await page.screenshot(full_page=True, omit_background=True)
+            self._write_png(output_path, png)
+
+            reusable = True
+            return True
+
+        finally:
+            await self._release_page(page, reusable)
+
+    async def _convert_svg_file_with_playwright(
+        self,
+        svg_path: Path,
+        output_path: str,
+        size: tuple[int, int] | None = None,
+    ) -> bool:
+        """Convert an SVG file by pointing Chromium at its file:// URL.
+
+        Chromium streams the file from disk, so the markup never passes
+        through Python or the DevTools connection, and relative references
+        inside the SVG resolve against the file's directory. Navigation waits
+        for the load event, which covers those resources.
+
+        Args:
+            svg_path: Path of the SVG file
+            output_path: Path where PNG file should be saved
+            size: Unscaled SVG size, if already known
+
+        Returns:
+            True if conversion was successful, False otherwise
+        """
+        page = await self._acquire_page()
+        reusable = False
+
+        try:
+            if size is None:
+                size = self._get_dimensions(ParsedSvg.parse_file(svg_path))
+            width, height = size
 
-                # Calculate scaled dimensions
-                scale = self.config.get("scale", 1.0)
+            scale = self.config.get("scale", 1.0)
+            scaled_width = int(width * scale)
+            scaled_height = int(height * scale)
+
+            await page.set_viewport_size(
+                {"width": scaled_width, "height": scaled_height}
+            )
+            await page.goto(svg_path.resolve().as_uri())
+            await page.evaluate(
+                _SIZE_SVG_DOCUMENT_SCRIPT, [scaled_width, scaled_height]
+            )
+
+            # goto() returned after the load event, so resources referenced
+            # by the SVG are already in; only a painted frame is needed
+            await self._wait_for_render(page, [], output_path)
+
+            png = await page.screenshot(full_page=True, omit_background=True)
+            self._write_png(output_path, png)
+
+            reusable = True
+            return True
+
+        finally:
+            await self._release_page(page, reusable)
+
+    @staticmethod
+    def _build_html(svg_content: str, width: int, height: int) -> str:
+        """Wrap SVG markup in an HTML document sized to the scaled diagram."""
+        return f"""
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <style>
+                    body {{
+                        margin: 0;
+                        padding: 0;
+                        width: {width}px;
+                        height: {height}px;
+                    }}
+                    svg {{
+                        width: 100%;
+                        height: 100%;
+                    }}
+                </style>
+            </head>
+            <body>
+                {svg_content}
+            </body>
+            </html>
+            """
+
+    async def _convert_svg_batched(
+        self,
+        svg_content: str,
+        output_path: str,
+        size: tuple[int, int] | None = None,
+    ) -> bool:
+        """Queue a conversion to be rendered together with concurrent ones.
+
+        Args:
+            svg_content: String containing SVG markup
+            output_path: Path where PNG file should be saved
+            size: Unscaled SVG size, if already known
+
+        Returns:
+            True if conversion was successful, False otherwise
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[bool] = loop.create_future()
+        self._batch.append((svg_content, output_path, size, future))
+
+        if len(self._batch) >= self.batch_size:
+            self._flush_batch()
+        elif self._batch_timer is None:
+            self._batch_timer = loop.call_later(BATCH_WINDOW_SECONDS, self._flush_batch)
+
+        return await future
+
+    def _flush_batch(self) -> None:
+        """Start rendering the diagrams queued so far."""
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+
+        items, self._batch = self._batch, []
+        if items:
+            task = asyncio.ensure_future(self._render_batch(items))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _render_batch(self, items: list[_BatchItem]) -> None:
+        """Render queued diagrams and resolve their futures.
+
+        If the combined page fails, every diagram is retried on its own so that
+        one broken SVG does not fail the whole batch.
+        """
+        try:
+            if len(items) == 1:
+                svg_content, output_path, size, _ = items[0]
+                results = [
+                    await self._convert_svg_with_playwright(
+                        svg_content, output_path, size
+                    )
+                ]
+            else:
+                results = await self._convert_svgs_in_one_page(
+                    [item[:3] for item in items]
+                )
+        except Exception as e:
+            if len(items) == 1:
+                self._set_future(items[0][3], e)
+                return
+            self.logger.debug(f"Batched render failed, retrying one by one: {e}")
+            await asyncio.gather(
+                *(self._render_batch([item]) for item in items),
+            )
+            return
+
+        for (_, _, _, future), result in zip(items, results):
+            self._set_future(future, result)
+
+    @staticmethod
+    def _set_future(future: asyncio.Future[bool], outcome: bool | Exception) -> None:
+        if future.done():
+            return
+        if isinstance(outcome, Exception):
+            future.set_exception(outcome)
+        else:
+            future.set_result(outcome)
+
+    async def _convert_svgs_in_one_page(
+        self, items: list[tuple[str, str, tuple[int, int] | None]]
+    ) -> list[bool]:
+        """Render several SVGs in one page and screenshot each one separately.
+
+        Each SVG is placed in its own iframe, so element ids (gradients, markers,
+        ``<use>`` targets) cannot collide between diagrams, and the iframes are
+        stacked vertically at their scaled sizes.
+
+        Args:
+            items: SVG markup, output PNG path and unscaled size (if known)
+
+        Returns:
+            True for every diagram written
+        """
+        page = await self._acquire_page()
+        reusable = False
+
+        try:
+            scale = self.config.get("scale", 1.0)
+            frames = []
+            clips = []
+            top = 0
+            for svg_content, _, size in items:
+                width, height = size or self._extract_svg_dimensions(svg_content)
                 scaled_width = int(width * scale)
                 scaled_height = int(height * scale)
-
-                # Set viewport to match SVG dimensions
-                await page.set_viewport_size(
-                    {"width": scaled_width, "height": scaled_height}
+                document = self._build_html(svg_content, scaled_width, scaled_height)
+                frames.append(
+                    f'<iframe srcdoc="{html.escape(document, quote=True)}" '
+                    f'style="top: {top}px; width: {scaled_width}px; '
+                    f'height: {scaled_height}px;"></iframe>'
+                )
+                clips.append(
+                    {"x": 0, "y": top, "width": scaled_width, "height": scaled_height}
                 )
+                top += scaled_height
+
+            await page.set_viewport_size(
+                {
+                    "width": max(int(clip["width"]) for clip in clips),
+                    "height": top,
+                }
+            )
+            await page.set_content(
+                "<!DOCTYPE html><html><head><style>"
+                "body { margin: 0; padding: 0; }"
+                "iframe { position: absolute; left: 0; border: 0; }"
+                "</style></head><body>" + "".join(frames) + "</body></html>"
+            )
+            await self._wait_for_render(
+                page,
+                [svg_content for svg_content, _, _ in items],
+                f"batch of {len(items)} diagrams",
+            )
+
+            for (_, output_path, _), clip in zip(items, clips):
+                png = await page.screenshot(clip=clip, omit_background=True)
+                self._write_png(output_path, png)
+
+            reusable = True
+            return [True] * len(items)
+
+        finally:
+            await self._release_page(page, reusable)
+
+    async def _wait_for_render(
+        self, page: Any, svg_contents: list[str], description: str
+    ) -> None:
+        """Wait until the loaded diagrams are ready to be captured.
+
+        Self-contained SVGs are ready once a frame has been painted, so only
+        SVGs referencing external resources (or every SVG, when
+        wait_for_network_idle is set) wait for the network to become idle,
+        which always costs at least 500ms.
+
+        Args:
+            page: Page the diagrams were loaded into
+            svg_contents: SVG markup loaded into the page
+            description: What is being rendered, for the timing log
+        """
+        start = time.perf_counter()
+        if self.config.get("wait_for_network_idle", False) or any(
+            references_external_resources(svg) for svg in svg_contents
+        ):
+            strategy = "networkidle"
+            await page.wait_for_load_state("networkidle")
+        else:
+            strategy = "animation frame"
+            await page.evaluate(_WAIT_FOR_PAINT_SCRIPT)
+
+        self.logger.debug(
+            f"Waited {(time.perf_counter() - start) * 1000:.1f}ms ({strategy}) "
+            f"before capturing {description}"
+        )
+
+    async def _acquire_page(self) -> Any:
+        """Take an idle page from the pool, opening a new one if none is idle.
+
+        Waits while max_concurrency pages are in use.
+
+        Returns:
+            Playwright page reserved for the caller until released
+        """
+        if self._page_slots is None:
+            self._page_slots = asyncio.Semaphore(self.max_concurrency)
+        await self._page_slots.acquire()
+
+        try:
+            context = await self._ensure_browser_context()
+            if self._idle_pages:
+                return self._idle_pages.pop()
+            page = await context.new_page()
+        except BaseException:
+            self._page_slots.release()
+            raise
+
+        self._context_pages.add(page)
+        return page
+
+    async def _release_page(self, page: Any, reusable: bool) -> None:
+        """Return a page to the pool, or close it if its state is unknown.
+
+        Args:
+            page: Page obtained from _acquire_page
+            reusable: False when the conversion failed midway
+        """
+        try:
+            if reusable and page in self._context_pages:
+                self._idle_pages.append(page)
+                return
+
+            self._context_pages.discard(page)
+            try:
+                await page.close()
+            except Exception as e:
+                self.logger.debug(f"Failed to close page: {e}")
+        finally:
+            if self._page_slots is not None:
+                self._page_slots.release()
+
+    async def _ensure_browser_context(self) -> Any:
+        """Return the shared browser context, launching Chromium on first use.
+
+        Returns:
+            Playwright browser context reused by every conversion
+        """
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+        async with self._launch_lock:
+            return await self._launch_browser_if_needed()
+
+    async def _launch_browser_if_needed(self) -> Any:
+        """Relaunch a disconnected browser and launch one if none is running."""
+        if self._browser is not None and not self._browser.is_connected():
+            # Chromium went away (crash or OOM); start over with a new instance
+            self.logger.warning("Shared Chromium instance disconnected, relaunching")
+            # Diagrams queued for the next batch render in the new browser
+            await self._shutdown_browser(keep_batch=True)
+
+        if self._context is None:
+            self.logger.debug("Launching shared Chromium instance")
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            self._context = await self._browser.new_context(
+                device_scale_factor=self.config.get("device_scale_factor", 1.0)
+            )
+            if not self._atexit_registered:
+                atexit.register(self.close)
+                self._atexit_registered = True
 
-                # Create HTML content with embedded SVG
-                html_content = f"""
-                <!DOCTYPE html>
-                <html>
-                <head>
-                    <style>
-                        body {{
-                            margin: 0;
-                            padding: 0;
-                            width: {scaled_width}px;
-                            height: {scaled_height}px;
-                        }}
-                        svg {{
-                            width: 100%;
-                            height: 100%;
-                        }}
-                    </style>
-                </head>
-                <body>
-                    {svg_content}
-                </body>
-                </html>
-                """
-
-                # Load HTML content
-                await page.set_content(html_content)
-
-                # Wait for SVG to render
-                await page.wait_for_load_state("networkidle")
-
-                # Take screenshot with transparent background
-                await page.screenshot(
-                    path=output_path, full_page=True, omit_background=True
+        return self._context
+
+    async def _shutdown_browser(self, keep_batch: bool = False) -> None:
+        """Close the shared browser and stop Playwright.
+
+        Args:
+            keep_batch: Leave diagrams queued for the next batch in place
+                (when a new browser is launched right away); otherwise their
+                callers are failed instead of waiting forever
+        """
+        context, browser, playwright = self._context, self._browser, self._playwright
+        self._context = self._browser = self._playwright = None
+        if not keep_batch:
+            if self._batch_timer is not None:
+                self._batch_timer.cancel()
+                self._batch_timer = None
+            items, self._batch = self._batch, []
+            for svg_content, output_path, _, future in items:
+                self._set_future(
+                    future,
+                    SvgConversionError(
+                        "Shared browser closed before the diagram was rendered",
+                        output_path=output_path,
+                        svg_content=svg_content,
+                    ),
                 )
+        # Pages still in use belong to the old context; they are closed on
+        # release and their slots reused
+        self._idle_pages = []
+        self._context_pages = set()
 
-                return True
+        try:
+            if context is not None:
+                await context.close()
+            if browser is not None:
+                await browser.close()
+        finally:
+            if playwright is not None:
+                await playwright.stop()
+
+    def close(self) -> None:
+        """Release the rendering backends, the shared browser and its event loop.
+
+        Safe to call multiple times. A later conversion launches a new browser.
+        """
+        with self._backends_lock:
+            backends, self._backends = list(self._backends.values()), {}
+        for backend in backends:
+            backend.close()
+
+        with self._lock:
+            loop, thread = self._loop, self._loop_thread
+            if loop is None or thread is None:
+                return
 
+            try:
+                if self._browser is not None or self._playwright is not None:
+                    asyncio.run_coroutine_threadsafe(
+                        self._shutdown_browser(), loop
+                    ).result()
+            except Exception as e:
+                self.logger.warning(f"Failed to close shared browser: {e}")
             finally:
-                await browser.close()
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+                loop.close()
+                self._loop = self._loop_thread = None
+                # The semaphore and lock are bound to the loop that just closed
+                self._page_slots = None
+                self._launch_lock = None
 
     def _extract_svg_dimensions(self, svg_content: str) -> tuple[int, int]:
         """Extract width and height from SVG content.
@@ -225,37 +990,27 @@ class SvgToPngConverter:
         Returns:
             Tuple of (width, height) in pixels
         """
-        # Default dimensions
-        default_width = self.config.get("default_width", 800)
-        default_height = self.config.get("default_height", 600)
-
         try:
-            # Parse SVG content
-            root = ET.fromstring(svg_content)
-
-            # Try to get width and height attributes
-            width_attr = root.get("width")
-            height_attr = root.get("height")
-
-            if width_attr and height_attr:
-                # Extract numeric values
-                width = self._parse_dimension(width_attr, default_width)
-                height = self._parse_dimension(height_attr, default_height)
-                return width, height
-
-            # Try to get dimensions from viewBox
-            viewbox = root.get("viewBox")
-            if viewbox:
-                parts = viewbox.split()
-                if len(parts) == 4:
-                    width = int(float(parts[2]))
-                    height = int(float(parts[3]))
-                    return width, height
-
+            # Only the root element's attributes are needed
+            return self._get_dimensions(ParsedSvg.inspect(svg_content))
         except Exception as e:
             self.logger.warning(f"Failed to extract SVG dimensions: {e}")
+            return self._get_dimensions(None)
 
-        return default_width, default_height
+    def _get_dimensions(self, parsed: ParsedSvg | None) -> tuple[int, int]:
+        """Return the size of a parsed SVG, or the configured default size.
+
+        Args:
+            parsed: The parsed SVG (None to use the defaults)
+
+        Returns:
+            Tuple of (width, height) in pixels
+        """
+        default_width = self.config.get("default_width", 800)
+        default_height = self.config.get("default_height", 600)
+        if parsed is None:
+            return default_width, default_height
+        return parsed.get_size(default_width, default_height)
 
     def _parse_dimension(self, dimension_str: str, default: int) -> int:
         """Parse dimension string to integer pixel value.
@@ -267,72 +1022,126 @@ class SvgToPngConverter:
         Returns:
             Integer pixel value
         """
+        return parse_dimension(dimension_str, default)
+
+    def run_concurrently(self, calls: list[Callable[[], T]]) -> list[T | Exception]:
+        """Run blocking conversion calls in parallel against the shared browser.
+
+        Each call runs in a worker thread and submits its conversion to the
+        converter's event loop, where it renders in up to max_concurrency pages
+        (each holding up to batch_size diagrams in batched mode).
+
+        Args:
+            calls: Callables that perform one conversion each
+
+        Returns:
+            Results in the same order as calls; exceptions raised by a call are
+            returned in its slot instead of being propagated
+        """
+
+        with self._lock:
+            self._concurrent_runs += 1
         try:
-            # Remove units and convert to int
-            numeric_match = re.match(r"([0-9.]+)", dimension_str)
-            if numeric_match:
-                return int(float(numeric_match.group(1)))
-        except (ValueError, AttributeError):
-            pass
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="svg-to-png",
+            ) as executor:
+                futures = [executor.submit(call) for call in calls]
+                results: list[T | Exception] = []
+                for future in futures:
+                    error = future.exception()
+                    if error is None:
+                        results.append(future.result())
+                    elif isinstance(error, Exception):
+                        results.append(error)
+                    else:
+                        raise error
+                return results
+        finally:
+            with self._lock:
+                self._concurrent_runs -= 1
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the converter's event loop, starting its thread on first use."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=self._run_loop,
+                    args=(loop,),
+                    name="svg-to-png-loop",
+                    daemon=True,
+                )
+                thread.start()
+                self._loop, self._loop_thread = loop, thread
+            return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
 
-        return default
+    def _run_playwright_conversion(
+        self,
+        svg_content: str,
+        output_path: str,
+        size: tuple[int, int] | None = None,
+    ) -> bool:
+        """Run Playwright conversion on the converter's own event loop.
 
-    def _run_playwright_conversion(self, svg_content: str, output_path: str) -> bool:
-        """Run Playwright conversion handling asyncio event loop properly.
+        The loop thread is started once and kept for the lifetime of the
+        converter, so no loop is set up per diagram and the shared browser
+        launched on it is reused by later calls.
 
         Args:
             svg_content: String containing SVG markup
             output_path: Path where PNG file should be saved
+            size: Unscaled SVG size, if already known
 
         Returns:
             True if conversion was successful, False otherwise
         """
         try:
-            # Check if we're in an existing event loop
-            try:
-                loop = asyncio.get_running_loop()
-                if loop and loop.is_running():
-                    # We're in an event loop, run in a new thread
-                    import threading
-
-                    result_container = {}
-                    exception_container = {}
-
-                    def run_in_new_loop() -> None:
-                        try:
-                            # Create a new event loop for this thread
-                            new_loop = asyncio.new_event_loop()
-                            asyncio.set_event_loop(new_loop)
-                            try:
-                                result = new_loop.run_until_complete(
-                                    self._convert_svg_with_playwright(
-                                        svg_content, output_path
-                                    )
-                                )
-                                result_container["success"] = result
-                            finally:
-                                new_loop.close()
-                        except Exception as e:
-                            exception_container["error"] = e
-
-                    thread = threading.Thread(target=run_in_new_loop)
-                    thread.start()
-                    thread.join()
-
-                    if "error" in exception_container:
-                        raise exception_container["error"]
-
-                    return result_container.get("success", False)
-                else:
-                    # Event loop exists but not running
-                    return asyncio.run(
-                        self._convert_svg_with_playwright(svg_content, output_path)
-                    )
-            except RuntimeError:
-                # No event loop running, safe to use asyncio.run
-                return asyncio.run(
-                    self._convert_svg_with_playwright(svg_content, output_path)
-                )
+            loop = self._get_loop()
+            if threading.current_thread() is self._loop_thread:
+                raise RuntimeError("Conversions cannot be started on the loop thread")
+
+            # Requests from run_concurrently workers can be rendered together
+            convert = (
+                self._convert_svg_batched
+                if self.batch_size > 1 and self._concurrent_runs > 0
+                else self._convert_svg_with_playwright
+            )
+            future = asyncio.run_coroutine_threadsafe(
+                convert(svg_content, output_path, size), loop
+            )
+            return bool(future.result())
+        except Exception as e:
+            self.logger.error(f"Playwright conversion failed: {e}")
+            return False
+
+    def _run_playwright_file_conversion(
+        self,
+        svg_path: Path,
+        output_path: str,
+        size: tuple[int, int] | None = None,
+    ) -> bool:
+        """Run a by-URL file conversion on the converter's own event loop.
+
+        Args:
+            svg_path: Path of the SVG file
+            output_path: Path where PNG file should be saved
+            size: Unscaled SVG size, if already known
+
+        Returns:
+            True if conversion was successful, False otherwise
+        """
+        try:
+            future = asyncio.run_coroutine_threadsafe(
+                self._convert_svg_file_with_playwright(svg_path, output_path, size),
+                self._get_loop(),
+            )
+            return bool(future.result())
         except Exception as e:
             self.logger.error(f"Playwright conversion failed: {e}")
             return False
@@ -341,16 +1150,19 @@ class SvgToPngConverter:
         self,
         error: Exception,
         output_path: str,
-        svg_content: str,
+        svg_content: str | None,
         svg_path: str | None = None,
+        backend: str = PLAYWRIGHT_BACKEND,
     ) -> bool:
         """Handle conversion errors based on configuration.
 
         Args:
             error: The exception that occurred
             output_path: Target output path
-            svg_content: SVG content that failed to convert
+            svg_content: SVG content that failed to convert (None if it was
+                never read into memory)
             svg_path: Source SVG file path (if applicable)
+            backend: Name of the engine that failed
 
         Returns:
             False if error_on_fail is False
@@ -358,12 +1170,13 @@ class SvgToPngConverter:
         Raises:
             SvgConversionError: If error_on_fail is True
         """
-        error_msg = f"Playwright conversion failed: {error}"
+        engine = backend.capitalize()
+        error_msg = f"{engine} conversion failed: {error}"
         self.logger.error(error_msg)
 
         if self.config.get("error_on_fail", True):
             raise SvgConversionError(
-                "Playwright conversion failed",
+                f"{engine} conversion failed",
                 svg_path=svg_path,
                 output_path=output_path,
                 svg_content=svg_content,
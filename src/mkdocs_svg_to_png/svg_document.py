@@ -0,0 +1,244 @@
+"""SVG markup parsed once per conversion."""
+
+from __future__ import annotations
+
+import functools
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+try:
+    import defusedxml.ElementTree as ET
+except ImportError:
+    # Fallback to standard library (less secure but available)
+    import xml.etree.ElementTree as ET  # nosec B405
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+# Features of an SVG that only some engines render correctly
+FOREIGN_OBJECT = "foreignObject"
+CSS = "css"
+WEB_FONT = "web-font"
+FILTER = "filter"
+UNPARSED = "unparsed"
+# The document was not scanned to the end, so other features may be present
+UNSCANNED = "unscanned"
+
+# Markup is fed to the parser in slices of this many characters
+_CHUNK_SIZE = 64 * 1024
+
+
+def parse_dimension(dimension_str: str, default: int) -> int:
+    """Parse dimension string to integer pixel value.
+
+    Args:
+        dimension_str: Dimension string (e.g., "100px", "100", "10em")
+        default: Default value if parsing fails
+
+    Returns:
+        Integer pixel value
+    """
+    try:
+        # Remove units and convert to int
+        numeric_match = re.match(r"([0-9.]+)", dimension_str)
+        if numeric_match:
+            return int(float(numeric_match.group(1)))
+    except (ValueError, AttributeError):
+        pass
+
+    return default
+
+
+class ParsedSvg:
+    """What the converter needs to know about an SVG, from a single parse.
+
+    Validation, size calculation and engine selection all read this object
+    instead of parsing the markup again. Parsing is incremental and never
+    builds the element tree: parse() streams through the whole document,
+    inspect() stops shortly after the root start tag.
+    """
+
+    def __init__(
+        self, root_tag: str, attributes: dict[str, str], features: frozenset[str]
+    ) -> None:
+        """Initialize the parsed SVG.
+
+        Args:
+            root_tag: Local name of the root element
+            attributes: Attributes of the root element
+            features: Engine-limiting features found in the document
+        """
+        self.root_tag = root_tag
+        self.attributes = attributes
+        self.features = features
+
+    @classmethod
+    def parse(cls, svg_content: str) -> ParsedSvg:
+        """Parse the whole document, checking that it is well-formed.
+
+        Args:
+            svg_content: String containing SVG markup
+
+        Returns:
+            The parsed SVG
+
+        Raises:
+            ET.ParseError: If the markup is not well-formed XML
+        """
+        return cls._scan(_slices(svg_content), element_limit=None)
+
+    @classmethod
+    def parse_file(cls, svg_path: str | Path) -> ParsedSvg:
+        """Parse an SVG file, reading it from disk in chunks.
+
+        Args:
+            svg_path: Path of the SVG file
+
+        Returns:
+            The parsed SVG
+
+        Raises:
+            ET.ParseError: If the file is not well-formed XML
+            OSError: If the file cannot be read
+        """
+        with Path(svg_path).open("rb") as f:
+            return cls._scan(iter(functools.partial(f.read, _CHUNK_SIZE), b""), None)
+
+    @classmethod
+    def inspect(cls, svg_content: str, element_limit: int = 0) -> ParsedSvg:
+        """Read the root element, then at most element_limit more elements.
+
+        Much cheaper than parse() for large documents, but the rest of the
+        markup is not checked. If the scan stops before the end, features
+        contains UNSCANNED.
+
+        Args:
+            svg_content: String containing SVG markup
+            element_limit: Number of descendants to scan for features
+
+        Returns:
+            The parsed SVG
+
+        Raises:
+            ET.ParseError: If the markup up to the scanned point is malformed
+        """
+        return cls._scan(_slices(svg_content), element_limit=element_limit)
+
+    @classmethod
+    def _scan(
+        cls, chunks: Iterable[str | bytes], element_limit: int | None
+    ) -> ParsedSvg:
+        collector = _FeatureCollector(element_limit)
+        parser = ET.XMLParser(target=collector)
+        try:
+            for chunk in chunks:
+                parser.feed(chunk)
+            parser.close()
+        except _ScanComplete:
+            pass
+        return cls(
+            collector.root_tag, collector.attributes, frozenset(collector.features)
+        )
+
+    @property
+    def view_box(self) -> tuple[float, float, float, float] | None:
+        """The root viewBox as (min-x, min-y, width, height), if valid."""
+        parts = self.attributes.get("viewBox", "").replace(",", " ").split()
+        if len(parts) != 4:
+            return None
+        try:
+            x, y, width, height = (float(part) for part in parts)
+        except ValueError:
+            return None
+        return x, y, width, height
+
+    def get_size(self, default_width: int, default_height: int) -> tuple[int, int]:
+        """Return the intrinsic size of the diagram in pixels.
+
+        Args:
+            default_width: Width used when the SVG does not declare one
+            default_height: Height used when the SVG does not declare one
+
+        Returns:
+            Tuple of (width, height) in pixels
+        """
+        width_attr = self.attributes.get("width")
+        height_attr = self.attributes.get("height")
+        if width_attr and height_attr:
+            return (
+                parse_dimension(width_attr, default_width),
+                parse_dimension(height_attr, default_height),
+            )
+
+        view_box = self.view_box
+        if view_box is not None:
+            return int(view_box[2]), int(view_box[3])
+
+        return default_width, default_height
+
+
+def _slices(svg_content: str) -> Iterator[str]:
+    """Cut markup into parser-sized slices (never copying it as a whole)."""
+    for start in range(0, len(svg_content), _CHUNK_SIZE):
+        yield svg_content[start : start + _CHUNK_SIZE]
+
+
+class _ScanComplete(Exception):
+    """Raised by the parser target to stop reading the document."""
+
+
+class _FeatureCollector:
+    """Parser target recording the root element and engine-limiting features.
+
+    Elements are inspected as they stream past and never stored, so memory
+    does not grow with the document.
+    """
+
+    def __init__(self, element_limit: int | None) -> None:
+        self.root_tag = ""
+        self.attributes: dict[str, str] = {}
+        self.features: set[str] = set()
+        self._element_limit = element_limit
+        self._scanned = 0
+        self._style_text: list[str] | None = None
+
+    def start(self, tag: str, attrib: dict[str, str]) -> None:
+        if not self.root_tag:
+            self.root_tag = _local_name(tag)
+            self.attributes = dict(attrib)
+            return
+
+        if self._element_limit is not None and self._scanned >= self._element_limit:
+            self.features.add(UNSCANNED)
+            raise _ScanComplete
+        self._scanned += 1
+
+        name = _local_name(tag)
+        if name == "foreignObject":
+            self.features.add(FOREIGN_OBJECT)
+        elif name == "style":
+            self.features.add(CSS)
+            self._style_text = []
+        elif name == "filter" or attrib.get("filter"):
+            self.features.add(FILTER)
+        elif name == "font-face":
+            self.features.add(WEB_FONT)
+
+    def data(self, data: str) -> None:
+        if self._style_text is not None:
+            self._style_text.append(data)
+
+    def end(self, tag: str) -> None:
+        if self._style_text is not None and _local_name(tag) == "style":
+            if "@font-face" in "".join(self._style_text):
+                self.features.add(WEB_FONT)
+            self._style_text = None
+
+    def close(self) -> Any:
+        return None
+
+
+def _local_name(tag: object) -> str:
+    """Strip the namespace from an element tag (comments have no str tag)."""
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
@@ -20,6 +20,19 @@ class PluginConfigDict(TypedDict, total=False):
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR"]
     cleanup_generated_images: bool
     enabled_if_env: str
+    backend: str
+    render_processes: int
+    max_concurrency: int
+    batch_size: int
+    load_files_by_url: bool
+    wait_for_network_idle: bool
+    deduplicate: bool
+    render_in_serve: bool
+    prefetch: bool
+    cache_dir: str
+    cache_max_bytes: int
+    cache_max_entries: int
+    cache_max_age_builds: int
 
 
 class SvgBlockDict(TypedDict):
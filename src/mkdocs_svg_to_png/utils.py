@@ -29,6 +29,55 @@ def ensure_directory(directory: str) -> None:
     Path(directory).mkdir(parents=True, exist_ok=True)
 
 
+def write_file_if_changed(file_path: str | Path, data: bytes) -> bool:
+    """内容が変わる場合だけファイルをアトミックに書き込む
+
+    既存ファイルと同じ内容なら書き込まず、更新時刻も変えない。書き込みは
+    同じディレクトリの一時ファイルとrenameで行うため、中断されても途中まで
+    書かれたファイルは残らない。
+
+    Args:
+        file_path: 書き込み先のパス
+        data: 書き込む内容
+
+    Returns:
+        書き込んだ場合True、既に同じ内容だった場合False
+    """
+    path = Path(file_path)
+    mode = 0o644
+    try:
+        stat = path.stat()
+        if stat.st_size == len(data) and _file_digest(path) == (
+            hashlib.sha256(data).digest()
+        ):
+            return False
+        mode = stat.st_mode & 0o777
+    except FileNotFoundError:
+        pass
+
+    fd, temp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=".tmp-", suffix=path.suffix
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstempは0600で作成するため、既存ファイル（新規なら0644）の権限に揃える
+        Path(temp_path).chmod(mode)
+        Path(temp_path).replace(path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+    return True
+
+
+def _file_digest(path: Path) -> bytes:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
 def get_temp_file_path(suffix: str = ".svg") -> str:
     fd, path = tempfile.mkstemp(suffix=suffix)
 
@@ -80,6 +80,7 @@ def test_serve_mode_integration():
         # 設定を模擬
         plugin.config = {
             "enabled": True,
+            "render_in_serve": False,
             "output_dir": "assets/images",
             "image_format": "png",
             "preserve_original": False,
@@ -226,7 +227,7 @@ def test_serve_mode_performance_optimization():
 
     with patch.object(sys, "argv", ["mkdocs", "serve"]):
         plugin = SvgToPngPlugin()
-        plugin.config = {"enabled": True}
+        plugin.config = {"enabled": True, "render_in_serve": False}
         plugin.processor = Mock()
         plugin.logger = Mock()
 
@@ -0,0 +1,404 @@
+"""Tests for the non-browser rendering backends."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from mkdocs_svg_to_png import backends
+from mkdocs_svg_to_png.backends import (
+    CairoBackend,
+    RenderBackend,
+    RsvgBackend,
+    create_backend,
+    detect_features,
+    select_engines,
+)
+from mkdocs_svg_to_png.exceptions import SvgConfigError, SvgConversionError
+from mkdocs_svg_to_png.svg_converter import SvgToPngConverter
+from mkdocs_svg_to_png.svg_document import (
+    CSS,
+    FILTER,
+    FOREIGN_OBJECT,
+    UNPARSED,
+    WEB_FONT,
+    ParsedSvg,
+)
+
+
+@pytest.fixture
+def fake_cairosvg(monkeypatch):
+    """Install a stand-in cairosvg module."""
+    module = SimpleNamespace(
+        __version__="2.7.1", svg2png=Mock(return_value=b"\x89PNG fake")
+    )
+    monkeypatch.setitem(sys.modules, "cairosvg", module)
+    return module
+
+
+@pytest.fixture
+def fake_rsvg(monkeypatch):
+    """Pretend rsvg-convert is installed and record its invocations."""
+    calls = []
+
+    def run(args, **kwargs):
+        calls.append((args, kwargs))
+        if "--version" in args:
+            return subprocess.CompletedProcess(args, 0, "rsvg-convert 2.58.0\n", "")
+        return subprocess.CompletedProcess(args, 0, b"\x89PNG fake", b"")
+
+    monkeypatch.setattr(backends.shutil, "which", lambda name: f"/usr/bin/{name}")
+    monkeypatch.setattr(backends.subprocess, "run", run)
+    return calls
+
+
+class TestCreateBackend:
+    """Test backend lookup."""
+
+    def test_cairo_backend(self, fake_cairosvg):
+        backend = create_backend("cairo", {})
+        assert isinstance(backend, CairoBackend)
+        assert backend.get_version() == "2.7.1"
+
+    def test_rsvg_backend(self, fake_rsvg):
+        backend = create_backend("rsvg", {})
+        assert isinstance(backend, RsvgBackend)
+        assert backend.get_version() == "rsvg-convert 2.58.0"
+
+    def test_missing_rsvg_convert(self, monkeypatch):
+        monkeypatch.setattr(backends.shutil, "which", lambda name: None)
+        with pytest.raises(SvgConfigError, match="requires rsvg-convert"):
+            create_backend("rsvg", {})
+
+    def test_unknown_backend(self):
+        with pytest.raises(SvgConfigError, match="Unknown rendering backend"):
+            create_backend("inkscape", {})
+
+    def test_missing_cairosvg(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "cairosvg", None)
+        with pytest.raises(SvgConfigError, match="requires CairoSVG"):
+            create_backend("cairo", {})
+
+    def test_incomplete_backend_cannot_be_instantiated(self):
+        class Incomplete(RenderBackend):
+            name = "incomplete"
+
+        with pytest.raises(TypeError, match="render"):
+            Incomplete({})
+
+
+class TestConverterRouting:
+    """Test that the converter routes diagrams to the selected backend."""
+
+    SVG = "<svg width='100' height='50'><rect/></svg>"
+
+    def test_site_wide_cairo_backend(self, fake_cairosvg, tmp_path):
+        converter = SvgToPngConverter(
+            {"backend": "cairo", "scale": 2.0, "error_on_fail": True}
+        )
+        output = str(tmp_path / "a.png")
+
+        assert converter.convert_svg_content(self.SVG, output)
+
+        fake_cairosvg.svg2png.assert_called_once_with(
+            bytestring=self.SVG.encode("utf-8"),
+            output_width=200,
+            output_height=100,
+        )
+        assert (tmp_path / "a.png").read_bytes() == b"\x89PNG fake"
+        assert converter._loop is None  # no browser was launched
+
+    def test_per_diagram_backend_override(self, fake_cairosvg, tmp_path):
+        converter = SvgToPngConverter({"error_on_fail": True})
+
+        assert converter.convert_svg_content(
+            self.SVG, str(tmp_path / "a.png"), backend="cairo"
+        )
+        fake_cairosvg.svg2png.assert_called_once()
+
+    def test_render_settings_include_backend(self, fake_cairosvg):
+        converter = SvgToPngConverter({})
+
+        default = converter.get_render_settings()
+        cairo = converter.get_render_settings("cairo")
+
+        assert default["backend"] == "playwright"
+        assert cairo["backend"] == "cairo"
+        assert cairo["backend_version"] == "2.7.1"
+
+    def test_backend_error_is_reported(self, fake_cairosvg, tmp_path):
+        fake_cairosvg.svg2png.side_effect = ValueError("bad svg")
+        converter = SvgToPngConverter({"backend": "cairo", "error_on_fail": False})
+
+        assert not converter.convert_svg_content(self.SVG, str(tmp_path / "a.png"))
+
+
+class TestRsvgBackend:
+    """Test the rsvg-convert subprocess backend."""
+
+    SVG = "<svg width='100' height='50'><rect/></svg>"
+
+    def test_streams_svg_through_stdin_and_stdout(self, fake_rsvg, tmp_path):
+        converter = SvgToPngConverter({"backend": "rsvg", "error_on_fail": True})
+        output = tmp_path / "a.png"
+
+        assert converter.convert_svg_content(self.SVG, str(output))
+
+        args, kwargs = fake_rsvg[-1]
+        assert args == [
+            "/usr/bin/rsvg-convert",
+            "--format=png",
+            "--width=100",
+            "--height=50",
+        ]
+        assert kwargs["input"] == self.SVG.encode("utf-8")
+        assert output.read_bytes() == b"\x89PNG fake"
+        assert list(tmp_path.iterdir()) == [output]
+
+    @pytest.mark.parametrize(
+        ("error_on_fail", "expectation"),
+        [(True, pytest.raises(SvgConversionError, match="Rsvg")), (False, None)],
+    )
+    def test_failure_honours_error_on_fail(
+        self, monkeypatch, tmp_path, error_on_fail, expectation
+    ):
+        monkeypatch.setattr(backends.shutil, "which", lambda name: "/bin/rsvg")
+        monkeypatch.setattr(
+            backends.subprocess,
+            "run",
+            lambda args, **kwargs: subprocess.CompletedProcess(
+                args, 1, b"", b"Error reading SVG"
+            ),
+        )
+        converter = SvgToPngConverter(
+            {"backend": "rsvg", "error_on_fail": error_on_fail}
+        )
+        output = str(tmp_path / "a.png")
+
+        if expectation is None:
+            assert not converter.convert_svg_content(self.SVG, output)
+        else:
+            with expectation as excinfo:
+                converter.convert_svg_content(self.SVG, output)
+            assert "Error reading SVG" in excinfo.value.details["cairo_error"]
+
+    def test_processes_bounded_by_cpu_count(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(backends.shutil, "which", lambda name: "/bin/rsvg")
+        monkeypatch.setattr(RsvgBackend, "max_processes", staticmethod(lambda: 2))
+        lock = threading.Lock()
+        running = peak = 0
+
+        def run(args, **kwargs):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            return subprocess.CompletedProcess(args, 0, b"png", b"")
+
+        monkeypatch.setattr(backends.subprocess, "run", run)
+        converter = SvgToPngConverter(
+            {"backend": "rsvg", "max_concurrency": 8, "error_on_fail": True}
+        )
+        calls = [
+            lambda i=i: converter.convert_svg_content(
+                self.SVG, str(tmp_path / f"{i}.png")
+            )
+            for i in range(8)
+        ]
+
+        assert converter.run_concurrently(calls) == [True] * 8
+        assert peak == 2
+
+
+class TestAutoSelection:
+    """Test routing of diagrams to the cheapest capable engine."""
+
+    @pytest.mark.parametrize(
+        ("svg", "features"),
+        [
+            ("<svg><rect/></svg>", set()),
+            ("<svg><style>rect { fill: red }</style><rect/></svg>", {CSS}),
+            (
+                "<svg><style>@font-face { src: url(a.woff2) }</style></svg>",
+                {CSS, WEB_FONT},
+            ),
+            ("<svg><filter id='f'/><rect filter='url(#f)'/></svg>", {FILTER}),
+            (
+                '<svg xmlns="http://www.w3.org/2000/svg"><foreignObject>'
+                '<div xmlns="http://www.w3.org/1999/xhtml">text</div>'
+                "</foreignObject></svg>",
+                {FOREIGN_OBJECT},
+            ),
+            ("<svg><rect></svg>", {UNPARSED}),
+        ],
+    )
+    def test_detect_features(self, svg, features):
+        assert detect_features(svg) == features
+
+    @pytest.mark.parametrize(
+        ("features", "engines"),
+        [
+            (set(), ["cairo", "rsvg", "playwright"]),
+            ({CSS}, ["cairo", "rsvg", "playwright"]),
+            ({FILTER}, ["rsvg", "playwright"]),
+            ({CSS, WEB_FONT}, ["playwright"]),
+            ({FOREIGN_OBJECT}, ["playwright"]),
+            ({UNPARSED}, ["playwright"]),
+        ],
+    )
+    def test_select_engines(self, features, engines):
+        assert select_engines(frozenset(features)) == engines
+
+    def test_plain_svg_uses_cheapest_engine(self, fake_cairosvg, tmp_path):
+        converter = SvgToPngConverter({"backend": "auto", "error_on_fail": True})
+
+        assert converter.convert_svg_content(
+            "<svg width='10' height='10'><rect/></svg>", str(tmp_path / "a.png")
+        )
+
+        fake_cairosvg.svg2png.assert_called_once()
+        assert list(converter.backend_stats) == ["cairo"]
+        assert converter.backend_stats["cairo"][0] == 1
+
+    def test_falls_back_on_failure_and_missing_engines(
+        self, fake_cairosvg, monkeypatch, tmp_path
+    ):
+        fake_cairosvg.svg2png.side_effect = ValueError("unsupported")
+        monkeypatch.setattr(backends.shutil, "which", lambda name: None)
+        converter = SvgToPngConverter({"backend": "auto", "error_on_fail": True})
+        monkeypatch.setattr(
+            converter, "_run_playwright_conversion", Mock(return_value=True)
+        )
+
+        for i in range(2):
+            assert converter.convert_svg_content(
+                "<svg width='10' height='10'><rect/></svg>",
+                str(tmp_path / f"{i}.png"),
+            )
+
+        assert converter._run_playwright_conversion.call_count == 2
+        assert converter._unavailable == {"rsvg"}
+        assert converter.backend_stats["playwright"][0] == 2
+        assert "cairo" not in converter.backend_stats
+
+    def test_foreign_object_goes_to_browser(self, fake_cairosvg, monkeypatch, tmp_path):
+        converter = SvgToPngConverter({"backend": "auto", "error_on_fail": True})
+        monkeypatch.setattr(
+            converter, "_run_playwright_conversion", Mock(return_value=True)
+        )
+
+        assert converter.convert_svg_content(
+            "<svg width='10' height='10'><foreignObject/></svg>",
+            str(tmp_path / "a.png"),
+        )
+
+        fake_cairosvg.svg2png.assert_not_called()
+        converter._run_playwright_conversion.assert_called_once()
+
+    def test_render_settings_cover_every_engine(self, fake_cairosvg, fake_rsvg):
+        converter = SvgToPngConverter({"backend": "auto"})
+
+        version = converter.get_render_settings()["backend_version"]
+
+        assert "cairo=2.7.1" in version
+        assert "rsvg=rsvg-convert 2.58.0" in version
+        assert "playwright=" in version
+
+
+class TestCairoProcessPool:
+    """Test rendering CairoSVG diagrams in worker processes."""
+
+    SVG = "<svg width='100' height='50'><rect/></svg>"
+
+    @pytest.fixture
+    def pools(self, monkeypatch):
+        """Replace the process pool with a thread pool and record instances."""
+        created = []
+
+        class FakePool(ThreadPoolExecutor):
+            def __init__(self, max_workers, mp_context):
+                super().__init__(max_workers=max_workers)
+                self.max_workers = max_workers
+                created.append(self)
+
+        monkeypatch.setattr(backends, "ProcessPoolExecutor", FakePool)
+        return created
+
+    def test_worker_returns_png_data(self, fake_cairosvg):
+        png = backends._render_with_cairosvg(b"<svg/>", 20, 10)
+
+        assert png == b"\x89PNG fake"
+        fake_cairosvg.svg2png.assert_called_once_with(
+            bytestring=b"<svg/>",
+            output_width=20,
+            output_height=10,
+        )
+
+    def test_pool_started_once_and_reused(self, fake_cairosvg, pools, tmp_path):
+        converter = SvgToPngConverter(
+            {"backend": "cairo", "render_processes": 3, "error_on_fail": True}
+        )
+        calls = [
+            lambda i=i: converter.convert_svg_content(
+                self.SVG, str(tmp_path / f"{i}.png")
+            )
+            for i in range(6)
+        ]
+
+        assert converter.run_concurrently(calls) == [True] * 6
+        assert converter.run_concurrently(calls[:2]) == [True] * 2
+
+        assert len(pools) == 1
+        assert pools[0].max_workers == 3
+        assert converter.max_workers >= 3
+        assert fake_cairosvg.svg2png.call_count == 8
+
+        converter.close()
+        assert pools[0]._shutdown
+
+    def test_default_uses_every_cpu(self, fake_cairosvg, monkeypatch):
+        monkeypatch.setattr(backends.os, "cpu_count", lambda: 6)
+
+        assert CairoBackend({"render_processes": 0}).processes == 6
+        assert CairoBackend({}).processes == 6
+        assert CairoBackend({"render_processes": 2}).processes == 2
+
+    def test_single_process_renders_in_thread(self, fake_cairosvg, pools, tmp_path):
+        converter = SvgToPngConverter(
+            {"backend": "cairo", "render_processes": 1, "error_on_fail": True}
+        )
+
+        assert converter.convert_svg_content(self.SVG, str(tmp_path / "a.png"))
+        assert pools == []
+
+
+class TestSingleParse:
+    """Test that each conversion parses its SVG only once."""
+
+    def test_auto_conversion_parses_once(self, fake_cairosvg, monkeypatch, tmp_path):
+        calls = []
+        original = ParsedSvg.parse.__func__
+
+        def counting_parse(cls, svg_content):
+            calls.append(svg_content)
+            return original(cls, svg_content)
+
+        monkeypatch.setattr(ParsedSvg, "parse", classmethod(counting_parse))
+        converter = SvgToPngConverter({"backend": "auto", "error_on_fail": True})
+
+        assert converter.convert_svg_content(
+            "<svg width='40' height='20'><rect/></svg>", str(tmp_path / "a.png")
+        )
+
+        assert len(calls) == 1
+        assert fake_cairosvg.svg2png.call_args.kwargs["output_width"] == 40
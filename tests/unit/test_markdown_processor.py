@@ -57,6 +57,17 @@ Some text.
         assert blocks[0].attributes.get("width") == "200"
         assert blocks[0].attributes.get("height") == "150"
 
+    def test_extract_svg_file_with_attributes(self, basic_config):
+        """属性付きSVGファイル参照の抽出テスト"""
+        processor = MarkdownProcessor(basic_config)
+
+        markdown = "![Diagram](diagram.svg){backend: cairo}"
+        blocks = processor.extract_svg_blocks(markdown)
+        assert len(blocks) == 1
+        assert blocks[0].file_path == "diagram.svg"
+        assert blocks[0].attributes == {"backend": "cairo"}
+        assert blocks[0].end_pos == len(markdown)
+
     def test_extract_no_svg_blocks(self, basic_config):
         """SVGブロックが存在しない場合の抽出テスト"""
         processor = MarkdownProcessor(basic_config)
@@ -238,6 +249,24 @@ More content."""
         block1.get_image_markdown.assert_called_once()
         block2.get_image_markdown.assert_called_once()
 
+    def test_replace_many_blocks_in_any_order(self, basic_config):
+        """多数のブロックを渡された順序によらず正しく置き換えるかテスト"""
+        processor = MarkdownProcessor(basic_config)
+        markdown = "".join(
+            f"Text {i}\n\n```svg\n<svg>{i}</svg>\n```\n\n" for i in range(500)
+        )
+        blocks = processor.extract_svg_blocks(markdown)
+        image_paths = [f"img_{i}.png" for i in range(500)]
+
+        result = processor.replace_blocks_with_images(
+            markdown, blocks[::-1], image_paths[::-1], "test.md"
+        )
+
+        assert result == "".join(
+            f"Text {i}\n\n![SVG Diagram](assets/images/img_{i}.png)\n\n"
+            for i in range(500)
+        )
+
     def test_extract_svg_file_references(self, basic_config):
         """SVGファイル参照の抽出テスト"""
         processor = MarkdownProcessor(basic_config)
@@ -302,6 +331,125 @@ Some text.
         assert any("<circle" in block.code for block in svg_blocks)
         assert any(block.file_path == "assets/chart.svg" for block in svg_blocks)
 
+    def test_extract_many_blocks_in_document_order(self, basic_config):
+        """多数のブロックが1回の走査で文書順・正しい位置で抽出されるかテスト"""
+        processor = MarkdownProcessor(basic_config)
+
+        sections = []
+        for i in range(300):
+            if i % 3 == 0:
+                sections.append(f"![Figure {i}](fig{i}.svg)")
+            elif i % 3 == 1:
+                sections.append(f"```svg {{width: {i}}}\n<svg>{i}</svg>\n```")
+            else:
+                sections.append(f"```svg\n<svg>{i}</svg>\n```")
+        markdown = "\n\nText.\n\n".join(sections)
+
+        blocks = processor.extract_svg_blocks(markdown)
+
+        assert len(blocks) == 300
+        assert [markdown[b.start_pos : b.end_pos] for b in blocks] == sections
+        assert blocks[1].attributes == {"width": "1"}
+        assert blocks[2].code == "<svg>2</svg>"
+
+    def test_file_reference_inside_svg_block_is_not_extracted(self, basic_config):
+        """インラインSVGブロック内の文字列はファイル参照として扱わないかテスト"""
+        processor = MarkdownProcessor(basic_config)
+
+        markdown = "```svg\n<svg><desc>![x](y.svg)</desc></svg>\n```"
+        blocks = processor.extract_svg_blocks(markdown)
+
+        assert len(blocks) == 1
+        assert blocks[0].file_path == ""
+
+    @pytest.mark.parametrize(
+        "example",
+        [
+            # 長いバッククォートのフェンス内の記述例
+            "````markdown\n```svg\n<svg>X</svg>\n```\n\n![x](y.svg)\n````",
+            # チルダのフェンス内の記述例
+            "~~~markdown\n```svg {width: 10}\n<svg>X</svg>\n```\n~~~",
+            # 閉じフェンスより長いフェンスの入れ子
+            "`````md\n````md\n```svg\n<svg>X</svg>\n```\n````\n`````",
+            # HTMLコメント内
+            "<!--\n```svg\n<svg>X</svg>\n```\n![x](y.svg)\n-->",
+            # インラインコード内
+            "Write `![x](y.svg)` or ``a `![x](y.svg)` b`` to embed a file.",
+            # インラインコード内の閉じていないコメント
+            "Write `<!--` to open a comment.",
+            # 文中の閉じていないコメント（ただの文字）
+            "An arrow <!-- is not a comment here.",
+        ],
+    )
+    def test_examples_inside_code_or_comments_are_ignored(self, basic_config, example):
+        """他のフェンスやHTMLコメント内のSVG記法は抽出しないかテスト"""
+        processor = MarkdownProcessor(basic_config)
+
+        markdown = f"![real](real.svg)\n\n{example}\n\n```svg\n<svg>Z</svg>\n```\n"
+        blocks = processor.extract_svg_blocks(markdown)
+
+        assert len(blocks) == 2
+        assert blocks[0].file_path == "real.svg"
+        assert blocks[1].code == "<svg>Z</svg>"
+
+    def test_unclosed_comment_at_line_start_runs_to_end_of_page(self, basic_config):
+        """行頭から始まる閉じていないコメント以降は抽出しないかテスト"""
+        processor = MarkdownProcessor(basic_config)
+
+        markdown = "![real](real.svg)\n\n<!-- draft\n```svg\n<svg>X</svg>\n```\n"
+        blocks = processor.extract_svg_blocks(markdown)
+
+        assert [b.file_path for b in blocks] == ["real.svg"]
+
+    def test_unclosed_code_span_is_literal(self, basic_config):
+        """閉じていないバッククォートは段落の終わりで打ち切られるかテスト"""
+        processor = MarkdownProcessor(basic_config)
+
+        markdown = (
+            "A stray ` here.\n\n![x](y.svg)\n\nAnd `` here\n```svg\n<svg/>\n```\n"
+        )
+        blocks = processor.extract_svg_blocks(markdown)
+
+        assert [b.file_path for b in blocks] == ["y.svg", ""]
+        assert blocks[1].code == "<svg/>"
+
+    def test_unclosed_fence_runs_to_end_of_page(self, basic_config):
+        """閉じていないフェンス以降は全てコードとして扱うかテスト"""
+        processor = MarkdownProcessor(basic_config)
+
+        markdown = "![real](real.svg)\n```text\n![x](y.svg)\n```svg\n<svg>X</svg>\n"
+        blocks = processor.extract_svg_blocks(markdown)
+
+        assert [b.file_path for b in blocks] == ["real.svg"]
+
+    def test_extract_indented_svg_fence(self, basic_config):
+        """リスト内などインデントされたSVGフェンスも抽出されるかテスト"""
+        processor = MarkdownProcessor(basic_config)
+
+        markdown = "1. Step\n\n    ```svg\n    <svg>A</svg>\n    ```\n\n2. Next\n"
+        blocks = processor.extract_svg_blocks(markdown)
+
+        assert len(blocks) == 1
+        assert blocks[0].code == "<svg>A</svg>"
+        assert markdown[blocks[0].start_pos : blocks[0].end_pos].startswith("```svg")
+        assert markdown[blocks[0].end_pos - 3 : blocks[0].end_pos] == "```"
+
+    def test_tilde_fence_is_not_an_svg_block(self, basic_config):
+        """チルダのsvgフェンスは従来どおり変換対象にしないかテスト"""
+        processor = MarkdownProcessor(basic_config)
+
+        assert processor.extract_svg_blocks("~~~svg\n<svg>A</svg>\n~~~\n") == []
+
+    def test_no_info_log_without_blocks(self, basic_config):
+        """SVGブロックのないページではINFOログを出力しないかテスト"""
+        processor = MarkdownProcessor(basic_config)
+        processor.logger = Mock()
+
+        assert processor.extract_svg_blocks("![remote](https://x.org/a.svg)") == []
+        assert processor.extract_svg_blocks("# Title\n") == []
+
+        processor.logger.info.assert_not_called()
+
     def test_resolve_svg_file_paths_from_root(self, basic_config):
         """ルートレベルのファイルからの相対パス解決テスト"""
         processor = MarkdownProcessor(basic_config)
@@ -0,0 +1,83 @@
+"""
+page_filterモジュールのテスト
+このファイルでは、SVGを含まないページを抽出前に除外する仕組みを検証します。
+"""
+
+import json
+
+import pytest
+
+from mkdocs_svg_to_png import page_filter
+from mkdocs_svg_to_png.page_filter import SvgFreePages, may_contain_svg, page_digest
+
+
+class TestMayContainSvg:
+    """may_contain_svg関数のテストクラス"""
+
+    @pytest.mark.parametrize(
+        ("markdown", "expected"),
+        [
+            ("# Title\n\nJust text.\n", False),
+            ("```python\nprint('svg')\n```\n", False),
+            ("![diagram](images/diagram.svg)\n", True),
+            ("```svg\n<svg></svg>\n```\n", True),
+            ("See [the logo](https://example.com/logo.svg).\n", True),
+        ],
+    )
+    def test_markers(self, markdown, expected):
+        """SVGの記法に必ず含まれる文字列の有無で判定されるかテスト"""
+        assert may_contain_svg(markdown) is expected
+
+
+class TestSvgFreePages:
+    """SvgFreePagesクラスのテストクラス"""
+
+    def test_verdicts_persist_across_builds(self, tmp_path):
+        """保存した判定が次のビルドで読み込まれるかテスト"""
+        digest = page_digest("![logo](https://example.com/logo.svg)")
+        pages = SvgFreePages(tmp_path)
+        pages.add(digest)
+        pages.save()
+
+        assert digest in SvgFreePages(tmp_path)
+
+    def test_save_keeps_only_pages_seen_in_the_build(self, tmp_path):
+        """そのビルドで参照されなかった判定は保存時に削除されるかテスト"""
+        pages = SvgFreePages(tmp_path)
+        pages.add("old")
+        pages.add("kept")
+        pages.save()
+
+        pages = SvgFreePages(tmp_path)
+        assert "kept" in pages
+        pages.save()
+
+        saved = json.loads((tmp_path / page_filter.VERDICTS_FILENAME).read_text())
+        assert saved["pages"] == ["kept"]
+        assert "old" not in SvgFreePages(tmp_path)
+
+    def test_outdated_file_is_ignored(self, tmp_path):
+        """抽出ルールのバージョンが異なる判定は使わないかテスト"""
+        (tmp_path / page_filter.VERDICTS_FILENAME).write_text(
+            json.dumps({"version": page_filter.VERDICTS_VERSION - 1, "pages": ["a"]})
+        )
+
+        assert "a" not in SvgFreePages(tmp_path)
+
+    def test_memory_only_without_directory(self, tmp_path):
+        """ディレクトリ未指定でもビルド間（serve）で判定が保持されるかテスト"""
+        pages = SvgFreePages()
+        pages.add("a")
+        pages.save()
+
+        assert "a" in pages
+        assert list(tmp_path.iterdir()) == []
+
+    def test_save_failure_is_not_fatal(self, tmp_path):
+        """保存先に書き込めなくても例外にならないかテスト"""
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        pages = SvgFreePages(blocker / "cache")
+        pages.add("a")
+
+        pages.save()
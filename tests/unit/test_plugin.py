@@ -91,7 +91,7 @@ class TestSvgToPngPlugin:
 
     def test_on_files_enabled(self, plugin):
         """プラグイン有効時のon_filesの挙動をテスト"""
-        plugin.config = {"enabled": True}
+        plugin.config = {"enabled": True, "prefetch": False}
         plugin.processor = Mock()
         files = ["file1.md", "file2.md"]
 
@@ -137,3 +137,359 @@ class TestSvgToPngPlugin:
         assert result == "modified content"
         assert plugin.generated_images == ["/path/to/image.png"]
         mock_processor.process_page.assert_called_once()
+
+    def test_on_post_build_closes_processor(self, plugin):
+        """ビルド終了時に共有ブラウザが解放されるかテスト"""
+        plugin.config = {"enabled": True, "cleanup_generated_images": False}
+        plugin.processor = Mock()
+
+        plugin.on_post_build(config={})
+
+        plugin.processor.close.assert_called_once()
+
+    @pytest.mark.parametrize(("serve", "cleaned"), [(False, True), (True, False)])
+    @patch("mkdocs_svg_to_png.plugin.clean_generated_images")
+    def test_cleanup_is_skipped_in_serve_mode(self, mock_clean, plugin, serve, cleaned):
+        """serve中は生成画像を削除せず、再ビルドの連鎖を起こさないかテスト"""
+        plugin.config = {"enabled": True, "cleanup_generated_images": True}
+        plugin.is_serve_mode = serve
+        plugin.processor = None
+        plugin.generated_images = ["/docs/assets/images/a.png"]
+
+        plugin.on_post_build(config={})
+
+        assert mock_clean.called is cleaned
+
+    def test_missing_options_fall_back_to_schema_defaults(self, plugin):
+        """設定値がない場合の既定値がconfig_schemeの既定値と一致するかテスト"""
+        defaults = {
+            name: option.default for name, option in SvgToPngPlugin.config_scheme
+        }
+        assert defaults["render_in_serve"] is True
+        assert defaults["prefetch"] is True
+
+        plugin.config = {}
+        plugin.is_serve_mode = True
+
+        assert plugin._should_render() is True
+
+    def test_on_post_build_reports_renders_saved_by_dedup(self, plugin):
+        """重複排除で省いた変換数がサマリーに含まれ、画像は重複して数えないかテスト"""
+        plugin.config = {"enabled": True}
+        plugin.processor = Mock()
+        plugin.processor.render_cache = None
+        plugin.processor.renders_saved = 2
+        plugin.processor.svg_converter.backend_stats = {}
+        plugin.processor.svg_converter.unchanged_outputs = 0
+        plugin.generated_images = ["a.png", "logo.png", "logo.png", "logo.png"]
+        plugin.logger = Mock()
+
+        plugin.on_post_build(config={})
+
+        plugin.logger.info.assert_any_call(
+            "Generated 2 PNGs from SVGs total (2 renders saved by deduplication)"
+        )
+
+    def test_on_post_build_reports_backend_stats(self, plugin):
+        """変換エンジンごとの変換数と合計時間がサマリーに含まれるかテスト"""
+        plugin.config = {"enabled": True}
+        plugin.processor = Mock()
+        plugin.processor.render_cache = None
+        plugin.processor.renders_saved = 0
+        plugin.processor.svg_converter.unchanged_outputs = 0
+        plugin.processor.svg_converter.backend_stats = {
+            "playwright": (1, 0.84),
+            "cairo": (3, 0.12),
+        }
+        plugin.generated_images = ["a.png", "b.png", "c.png", "d.png"]
+        plugin.logger = Mock()
+
+        plugin.on_post_build(config={})
+
+        plugin.logger.info.assert_any_call(
+            "Generated 4 PNGs from SVGs total"
+            " (engines: cairo: 3 in 0.1s, playwright: 1 in 0.8s)"
+        )
+
+    def test_on_post_build_reports_identical_outputs(self, plugin):
+        """既存ファイルと同一で書き込まなかったPNGの数がサマリーに含まれるかテスト"""
+        plugin.config = {"enabled": True}
+        plugin.processor = Mock()
+        plugin.processor.render_cache.hits = 1
+        plugin.processor.render_cache.misses = 2
+        plugin.processor.render_cache.unchanged = 1
+        plugin.processor.renders_saved = 0
+        plugin.processor.svg_converter.unchanged_outputs = 2
+        plugin.processor.svg_converter.backend_stats = {}
+        plugin.generated_images = ["a.png", "b.png", "c.png"]
+        plugin.logger = Mock()
+
+        plugin.on_post_build(config={})
+
+        plugin.logger.info.assert_any_call(
+            "Generated 3 PNGs from SVGs total (cache: 1 hits, 2 misses)"
+            " (3 PNGs unchanged on disk)"
+        )
+
+    def test_on_startup_detects_serve_command(self, plugin):
+        """on_startupのコマンドからserveモードが判定されるかテスト"""
+        plugin.on_startup(command="serve", dirty=False)
+        assert plugin.is_serve_mode is True
+
+        plugin.on_startup(command="build", dirty=False)
+        assert plugin.is_serve_mode is False
+
+    def test_serve_mode_renders_when_enabled(self, plugin, mock_page, mock_config):
+        """render_in_serveが有効ならserveモードでも変換されるかテスト"""
+        plugin.config = {"output_dir": "assets/images", "render_in_serve": True}
+        plugin.is_serve_mode = True
+        plugin.processor = Mock()
+        plugin.processor.process_page.return_value = ("modified", [])
+
+        result = plugin.on_page_markdown(
+            "```svg\n<svg></svg>\n```", page=mock_page, config=mock_config, files=[]
+        )
+
+        assert result == "modified"
+
+    def test_serve_mode_keeps_browser_between_rebuilds(self, plugin):
+        """serveモードではビルド終了時にブラウザを閉じず、終了時に閉じるかテスト"""
+        plugin.config = {"enabled": True}
+        plugin.is_serve_mode = True
+        processor = Mock()
+        plugin.processor = processor
+
+        plugin.on_post_build(config={})
+
+        processor.end_build.assert_called_once()
+        processor.close.assert_not_called()
+
+        plugin.on_shutdown()
+
+        processor.close.assert_called_once()
+        assert plugin.processor is None
+
+    @patch("mkdocs_svg_to_png.plugin.SvgProcessor")
+    def test_on_config_reuses_processor_on_rebuild(self, mock_processor_class, plugin):
+        """設定が変わらない再ビルドではプロセッサが使い回されるかテスト"""
+        plugin.config = {"output_dir": "assets/images", "log_level": "INFO"}
+        mock_processor_class.side_effect = lambda config: Mock(config=config)
+
+        plugin.on_config({})
+        first = plugin.processor
+        plugin.on_config({})
+
+        assert plugin.processor is first
+        assert mock_processor_class.call_count == 1
+
+    def test_on_serve_watches_svgs_outside_docs_dir(self, plugin, tmp_path):
+        """docs_dir外から参照されているSVGファイルだけが監視対象になるかテスト"""
+        docs_dir = tmp_path / "docs"
+        plugin.config = {"render_in_serve": True}
+        plugin.is_serve_mode = True
+        plugin.processor = Mock()
+        plugin.processor.svg_dependents = {
+            str(docs_dir / "inside.svg"): {"index.md"},
+            str(tmp_path / "diagrams" / "outside.svg"): {"index.md"},
+        }
+        server = Mock()
+
+        result = plugin.on_serve(
+            server, config={"docs_dir": str(docs_dir)}, builder=Mock()
+        )
+
+        assert result is server
+        server.watch.assert_called_once_with(str(tmp_path / "diagrams" / "outside.svg"))
+
+    def test_on_files_invalidates_changed_svgs_in_serve_mode(self, plugin):
+        """serveの再ビルド開始時に変更されたSVGの変換記録が破棄されるかテスト"""
+        plugin.config = {"render_in_serve": True, "prefetch": False}
+        plugin.is_serve_mode = True
+        plugin.processor = Mock()
+        plugin.processor.detect_changed_svgs.return_value = {
+            "/docs/a.svg": {"b.md", "a.md"}
+        }
+        plugin.logger = Mock()
+
+        plugin.on_files(Mock(), config={"docs_dir": "/docs"})
+
+        plugin.logger.info.assert_any_call(
+            "/docs/a.svg changed, re-rendering for a.md, b.md"
+        )
+
+    def test_on_files_prefetches_documentation_pages(self, plugin, tmp_path):
+        """on_filesで全ページのSVGが事前変換に登録されるかテスト"""
+        page_path = tmp_path / "index.md"
+        page_path.write_text("```svg\n<svg></svg>\n```\n", encoding="utf-8")
+
+        page_file = Mock()
+        page_file.src_path = "index.md"
+        page_file.abs_src_path = str(page_path)
+        files = Mock()
+        files.documentation_pages.return_value = [page_file]
+
+        plugin.config = {"output_dir": "assets/images", "prefetch": True}
+        plugin.processor = Mock()
+        plugin.is_serve_mode = False
+
+        plugin.on_files(files, config={"docs_dir": str(tmp_path)})
+
+        plugin.processor.prefetch_page.assert_called_once_with(
+            "index.md",
+            "```svg\n<svg></svg>\n```\n",
+            tmp_path / "assets/images",
+            docs_dir=tmp_path,
+        )
+        plugin.processor.start_prefetch.assert_called_once()
+
+    def test_prefetch_skips_generated_pages(self, plugin, tmp_path):
+        """ソースファイルを持たない生成ページは事前変換の対象外になるかテスト"""
+        generated = Mock()
+        generated.src_path = "blog/index.md"
+        generated.abs_src_path = None
+        files = Mock()
+        files.documentation_pages.return_value = [generated]
+
+        plugin.config = {"output_dir": "assets/images", "prefetch": True}
+        plugin.processor = Mock()
+        plugin.is_serve_mode = False
+
+        assert plugin.on_files(files, config={"docs_dir": str(tmp_path)}) is files
+
+        plugin.processor.prefetch_page.assert_not_called()
+        plugin.processor.start_prefetch.assert_called_once()
+
+    def test_each_build_starts_with_fresh_state(self, plugin):
+        """ビルド開始時に前回のビルドの記録が初期化されるかテスト"""
+        plugin.config = {"prefetch": False}
+        plugin.processor = Mock()
+
+        plugin.on_files(Mock(), config={"docs_dir": "/docs"})
+
+        plugin.processor.begin_build.assert_called_once()
+
+    def test_failed_serve_build_ends_build(self, plugin):
+        """serveでビルドが失敗した場合もビルドが終了され、ブラウザは残るかテスト"""
+        plugin.config = {"enabled": True}
+        plugin.is_serve_mode = True
+        processor = Mock()
+        plugin.processor = processor
+
+        plugin.on_build_error(error=RuntimeError("theme error"))
+
+        processor.end_build.assert_called_once_with(cancel=True)
+        processor.close.assert_not_called()
+
+    def test_failed_build_cancels_remaining_conversions(self, plugin):
+        """ビルドが失敗した場合は残りの事前変換を取り消して終了するかテスト"""
+        plugin.config = {"enabled": True}
+        plugin.is_serve_mode = False
+        processor = Mock()
+        plugin.processor = processor
+
+        plugin.on_build_error(error=RuntimeError("theme error"))
+
+        processor.close.assert_called_once_with(cancel=True)
+
+    def test_on_post_build_reports_cache_stats(self, plugin):
+        """ビルドサマリーにキャッシュのヒット数とミス数が含まれるかテスト"""
+        plugin.config = {"enabled": True}
+        plugin.processor = Mock()
+        plugin.processor.render_cache.hits = 3
+        plugin.processor.render_cache.misses = 1
+        plugin.processor.render_cache.unchanged = 0
+        plugin.processor.renders_saved = 0
+        plugin.processor.svg_converter.backend_stats = {}
+        plugin.processor.svg_converter.unchanged_outputs = 0
+        plugin.generated_images = ["a.png", "b.png", "c.png", "d.png"]
+        plugin.logger = Mock()
+
+        plugin.on_post_build(config={})
+
+        plugin.logger.info.assert_any_call(
+            "Generated 4 PNGs from SVGs total (cache: 3 hits, 1 misses)"
+        )
+
+
+class TestGeneratedImageRegistration:
+    """生成画像をMkDocsのFilesへ登録する処理のテストクラス"""
+
+    @pytest.fixture
+    def plugin(self):
+        """テスト用のプラグインインスタンスを返すfixture"""
+        return SvgToPngPlugin()
+
+    @pytest.fixture
+    def docs(self, tmp_path):
+        """docs_dirと既存ページ、前回のビルドで生成した画像を用意するfixture"""
+        docs_dir = tmp_path / "docs"
+        (docs_dir / "assets/images").mkdir(parents=True)
+        (docs_dir / "index.md").write_text("# Index\n")
+        (docs_dir / "assets/images/old.png").write_bytes(b"png")
+        return docs_dir
+
+    @pytest.fixture
+    def files(self, docs):
+        from mkdocs.structure.files import File, Files
+
+        return Files(
+            [
+                File("index.md", str(docs), "/site", use_directory_urls=True),
+                File(
+                    "assets/images/old.png", str(docs), "/site", use_directory_urls=True
+                ),
+            ]
+        )
+
+    def register(self, plugin, files, docs, image_paths):
+        plugin.config = {"enabled": True, "prefetch": False}
+        plugin.processor = Mock()
+        plugin.on_files(files, config={"docs_dir": str(docs)})
+        plugin._register_generated_images_to_files(
+            [str(docs / path) for path in image_paths],
+            docs,
+            {"site_dir": "/site"},
+        )
+
+    def test_new_images_are_appended_once(self, plugin, files, docs):
+        """新しい画像は1度だけ追加され、存在確認のstatを行わないかテスト"""
+        with patch("pathlib.Path.exists", side_effect=AssertionError("stat")):
+            self.register(
+                plugin,
+                files,
+                docs,
+                ["assets/images/new.png", "assets/images/new.png"],
+            )
+
+        src_paths = [file.src_path for file in files]
+        assert src_paths.count("assets/images/new.png") == 1
+        assert len(src_paths) == 3
+
+    def test_already_registered_image_is_kept(self, plugin, files, docs):
+        """docs_dirから登録済みの画像は削除・再作成しないかテスト"""
+        existing = files.get_file_from_path("assets/images/old.png")
+        files.remove = Mock(side_effect=files.remove)
+
+        self.register(plugin, files, docs, ["assets/images/old.png"])
+
+        files.remove.assert_not_called()
+        assert files.get_file_from_path("assets/images/old.png") is existing
+
+    def test_file_from_elsewhere_is_replaced(self, plugin, files, docs, tmp_path):
+        """同じsrc_pathで別の場所を指すファイルは置き換えられるかテスト"""
+        from mkdocs.structure.files import File
+
+        other = File(
+            "assets/images/dup.png",
+            str(tmp_path / "other"),
+            "/site",
+            use_directory_urls=True,
+        )
+        files.append(other)
+
+        self.register(plugin, files, docs, ["assets/images/dup.png"])
+
+        replaced = files.get_file_from_path("assets/images/dup.png")
+        assert replaced is not other
+        assert replaced.abs_src_path == str(docs / "assets/images/dup.png")
+        assert [f.src_path for f in files].count("assets/images/dup.png") == 1
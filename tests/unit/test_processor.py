@@ -4,10 +4,11 @@ SvgProcessorクラスのテスト
 """
 
 from pathlib import Path
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 
+from mkdocs_svg_to_png.exceptions import SvgFileError
 from mkdocs_svg_to_png.processor import SvgProcessor
 from mkdocs_svg_to_png.svg_block import SvgBlock
 
@@ -26,6 +27,8 @@ class TestSvgProcessor:
             "output_path": "assets/images",
             "dpi": 150,
             "quality": 90,
+            # モックのブロックはSVGの内容を持たないため、重複排除は個別に検証する
+            "deduplicate": False,
         }
 
     def test_processor_initialization(self, basic_config):
@@ -230,3 +233,342 @@ print("Hello")
         generated_png_path = Path(result_paths[0])
         assert generated_png_path.exists()
         assert generated_png_path.suffix == ".png"
+
+    def test_process_page_concurrent_preserves_order(self, basic_config):
+        """並列変換時もブロックの順序とerror_on_fail=Falseの挙動が保たれるかテスト"""
+        basic_config["max_concurrency"] = 4
+        processor = SvgProcessor(basic_config)
+
+        blocks = []
+        for i, success in enumerate([True, False, True]):
+            block = Mock(spec=SvgBlock)
+            block.get_filename.return_value = f"test_{i}.png"
+            block.generate_png.return_value = success
+            blocks.append(block)
+
+        processor.markdown_processor.extract_svg_blocks = Mock(return_value=blocks)
+        processor.markdown_processor.replace_blocks_with_images = Mock(
+            return_value="replaced"
+        )
+
+        result_content, result_paths = processor.process_page(
+            "test.md", "```svg\n<svg></svg>\n```", "/output"
+        )
+
+        assert result_content == "replaced"
+        assert result_paths == [
+            str(Path("/output") / "test_0.png"),
+            str(Path("/output") / "test_2.png"),
+        ]
+        for block in blocks:
+            block.generate_png.assert_called_once()
+        replace_call = processor.markdown_processor.replace_blocks_with_images
+        assert replace_call.call_args.args[1] == [blocks[0], blocks[2]]
+
+    def test_process_page_concurrent_error_on_fail(self, basic_config):
+        """並列変換でもerror_on_fail=Trueなら例外が送出されるかテスト"""
+        basic_config["max_concurrency"] = 4
+        basic_config["error_on_fail"] = True
+        processor = SvgProcessor(basic_config)
+
+        blocks = []
+        for i in range(2):
+            block = Mock(spec=SvgBlock)
+            block.get_filename.return_value = f"test_{i}.png"
+            block.generate_png.side_effect = OSError("disk full")
+            blocks.append(block)
+
+        processor.markdown_processor.extract_svg_blocks = Mock(return_value=blocks)
+
+        with pytest.raises(SvgFileError):
+            processor.process_page("test.md", "```svg\n<svg></svg>\n```", "/output")
+
+    def test_prefetched_blocks_are_not_rendered_again(self, basic_config, tmp_path):
+        """事前変換済みのブロックはページ処理時に再変換されないかテスト"""
+        processor = SvgProcessor(basic_config)
+        processor.svg_converter.run_concurrently = Mock(
+            side_effect=lambda calls: [call() for call in calls]
+        )
+        processor.svg_converter.convert_svg_content = Mock(return_value=True)
+
+        markdown = """# Test
+
+```svg
+<svg width="10" height="10"></svg>
+```
+"""
+        assert processor.prefetch_page("test.md", markdown, tmp_path) == 1
+        processor.start_prefetch()
+
+        result_content, result_paths = processor.process_page(
+            "test.md", markdown, tmp_path
+        )
+
+        processor.svg_converter.convert_svg_content.assert_called_once()
+        assert len(result_paths) == 1
+        assert result_content != markdown
+
+    def test_prefetch_after_unfinished_build(self, basic_config, tmp_path):
+        """end_build()されなかったビルドの後も事前変換が実行されるかテスト"""
+        processor = SvgProcessor(basic_config)
+        processor.svg_converter.run_concurrently = Mock(
+            side_effect=lambda calls: [call() for call in calls]
+        )
+        processor.svg_converter.convert_svg_content = Mock(return_value=True)
+
+        first = "```svg\n<svg width='10' height='10'></svg>\n```\n"
+        second = "```svg\n<svg width='20' height='20'></svg>\n```\n"
+        for markdown in (first, second):
+            # 失敗したビルドではon_post_buildが呼ばれず、次のビルドが始まる
+            processor.begin_build()
+            assert processor.prefetch_page("test.md", markdown, tmp_path) == 1
+            processor.start_prefetch()
+            processor.process_page("test.md", markdown, tmp_path)
+
+        converted = [
+            call.args[0]
+            for call in processor.svg_converter.convert_svg_content.call_args_list
+        ]
+        assert converted == [
+            "<svg width='10' height='10'></svg>",
+            "<svg width='20' height='20'></svg>",
+        ]
+
+    def test_prefetch_skips_missing_svg_files(self, basic_config, tmp_path):
+        """まだ存在しないSVGファイル参照は事前変換に登録されないかテスト"""
+        processor = SvgProcessor(basic_config)
+
+        markdown = "![diagram](assets/images/generated_later.svg)\n"
+        submitted = processor.prefetch_page(
+            "test.md", markdown, tmp_path / "out", docs_dir=tmp_path
+        )
+
+        assert submitted == 0
+
+    def test_pages_without_svg_markers_skip_extraction(self, basic_config):
+        """ ".svg"などを含まないページは抽出処理を実行しないかテスト"""
+        processor = SvgProcessor(basic_config)
+        processor.markdown_processor.extract_svg_blocks = Mock(return_value=[])
+
+        markdown = "# Title\n\nNo diagrams here.\n"
+        assert processor.process_page("test.md", markdown, "/output") == (
+            markdown,
+            [],
+        )
+        assert processor.prefetch_page("test.md", markdown, "/output") == 0
+
+        processor.markdown_processor.extract_svg_blocks.assert_not_called()
+
+    def test_svg_free_verdict_is_persisted(self, basic_config, tmp_path):
+        """SVGブロックのなかったページは次のビルドで抽出を省くかテスト"""
+        basic_config["cache_dir"] = str(tmp_path / "cache")
+        markdown = "![remote](https://example.com/logo.svg)\n"
+
+        first = SvgProcessor(basic_config)
+        first.process_page("test.md", markdown, tmp_path / "out")
+        first.end_build()
+
+        second = SvgProcessor(basic_config)
+        second.markdown_processor.extract_svg_blocks = Mock(return_value=[])
+        second.process_page("test.md", markdown, tmp_path / "out")
+        second.process_page("other.md", markdown + "changed", tmp_path / "out")
+
+        second.markdown_processor.extract_svg_blocks.assert_called_once_with(
+            markdown + "changed"
+        )
+
+    def test_render_cache_skips_unchanged_diagrams(self, basic_config, tmp_path):
+        """2回目以降の変換はキャッシュから複製されるかテスト"""
+        basic_config["cache_dir"] = str(tmp_path / "cache")
+        markdown = "```svg\n<svg width='10' height='10'></svg>\n```\n"
+
+        def fake_convert(svg_content, output_path):
+            Path(output_path).write_bytes(b"png")
+            return True
+
+        first = SvgProcessor(basic_config)
+        first.svg_converter.convert_svg_content = Mock(side_effect=fake_convert)
+        first.process_page("test.md", markdown, tmp_path / "build1")
+
+        second = SvgProcessor(basic_config)
+        second.svg_converter.convert_svg_content = Mock(side_effect=fake_convert)
+        _, paths = second.process_page("test.md", markdown, tmp_path / "build2")
+
+        first.svg_converter.convert_svg_content.assert_called_once()
+        second.svg_converter.convert_svg_content.assert_not_called()
+        assert Path(paths[0]).read_bytes() == b"png"
+        assert (second.render_cache.hits, second.render_cache.misses) == (1, 0)
+
+    def test_cache_stats_are_per_build(self, basic_config, tmp_path):
+        """serveの再ビルドごとにキャッシュの統計が数え直されるかテスト"""
+        basic_config["cache_dir"] = str(tmp_path / "cache")
+        markdown = "```svg\n<svg width='10' height='10'></svg>\n```\n"
+
+        def fake_convert(svg_content, output_path):
+            Path(output_path).write_bytes(b"png")
+            return True
+
+        processor = SvgProcessor(basic_config)
+        processor.svg_converter.convert_svg_content = Mock(side_effect=fake_convert)
+        processor.process_page("test.md", markdown, tmp_path / "out")
+        assert (processor.render_cache.hits, processor.render_cache.misses) == (0, 1)
+        processor.end_build()
+
+        processor.process_page("test.md", markdown, tmp_path / "out")
+
+        assert (processor.render_cache.hits, processor.render_cache.misses) == (1, 0)
+        assert processor.render_cache.unchanged == 1
+
+    def test_incremental_rerenders_only_changed_blocks(self, basic_config, tmp_path):
+        """serveの再ビルドでは内容が変わったブロックだけ再変換されるかテスト"""
+
+        converted = []
+
+        def fake_convert(svg_source, output_path):
+            converted.append(output_path)
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            Path(output_path).write_bytes(b"png")
+            return True
+
+        processor = SvgProcessor(basic_config)
+        processor.incremental = True
+        processor.svg_converter.convert_svg_content = Mock(side_effect=fake_convert)
+        processor.svg_converter.convert_svg_file = Mock(side_effect=fake_convert)
+
+        svg_file = tmp_path / "diagram.svg"
+        svg_file.write_text("<svg width='10' height='10'></svg>")
+        markdown = (
+            "```svg\n<svg width='20' height='20'></svg>\n```\n\n![d](diagram.svg)\n"
+        )
+        output_dir = tmp_path / "out"
+
+        processor.process_page("index.md", markdown, output_dir, docs_dir=tmp_path)
+        processor.end_build()
+        assert len(converted) == 2
+
+        # 参照先のSVGファイルだけを編集して再ビルド
+        svg_file.write_text("<svg width='30' height='30'></svg>")
+        _, paths = processor.process_page(
+            "index.md", markdown, output_dir, docs_dir=tmp_path
+        )
+
+        assert converted[2].endswith("diagram.png")
+        assert len(converted) == 3
+        assert processor.unchanged_count == 1
+        assert len(paths) == 2
+
+    def test_detect_changed_svgs_reports_dependent_pages(self, basic_config, tmp_path):
+        """変更されたSVGファイルと参照元ページが逆引きできるかテスト"""
+
+        def fake_convert(svg_path, output_path):
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            Path(output_path).write_bytes(b"png")
+            return True
+
+        processor = SvgProcessor(basic_config)
+        processor.incremental = True
+        processor.svg_converter.convert_svg_file = Mock(side_effect=fake_convert)
+
+        (tmp_path / "shared.svg").write_text("<svg width='10' height='10'/>")
+        (tmp_path / "other.svg").write_text("<svg width='20' height='20'/>")
+        output_dir = tmp_path / "out"
+        processor.process_page(
+            "a.md", "![a](shared.svg)\n", output_dir, docs_dir=tmp_path
+        )
+        processor.process_page(
+            "b.md", "![b](shared.svg)\n![c](other.svg)\n", output_dir, docs_dir=tmp_path
+        )
+
+        shared = str(tmp_path / "shared.svg")
+        assert processor.svg_dependents[shared] == {"a.md", "b.md"}
+        assert processor.detect_changed_svgs() == {}
+
+        (tmp_path / "shared.svg").write_text("<svg width='30' height='30'/>")
+
+        assert processor.detect_changed_svgs() == {shared: {"a.md", "b.md"}}
+
+    def test_identical_svgs_are_rendered_once_per_build(self, basic_config, tmp_path):
+        """同じSVGを参照する複数ページでも変換は1回だけかテスト"""
+        basic_config["deduplicate"] = True
+
+        def fake_convert(svg_source, output_path):
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            Path(output_path).write_bytes(b"png")
+            return True
+
+        processor = SvgProcessor(basic_config)
+        processor.svg_converter.convert_svg_content = Mock(side_effect=fake_convert)
+        processor.svg_converter.convert_svg_file = Mock(side_effect=fake_convert)
+
+        (tmp_path / "logo.svg").write_text("<svg width='10' height='10'/>")
+        markdown = "```svg\n<svg width='5' height='5'></svg>\n```\n\n![l](logo.svg)\n"
+        output_dir = tmp_path / "out"
+
+        _, first_paths = processor.process_page(
+            "a.md", markdown, output_dir, docs_dir=tmp_path
+        )
+        _, second_paths = processor.process_page(
+            "b.md", markdown, output_dir, docs_dir=tmp_path
+        )
+
+        processor.svg_converter.convert_svg_content.assert_called_once()
+        processor.svg_converter.convert_svg_file.assert_called_once()
+        assert second_paths == first_paths
+        assert processor.renders_saved == 2
+
+    def test_prefetch_submits_duplicates_once(self, basic_config, tmp_path):
+        """事前変換でも同じSVGは1回だけ登録され、結果が共有されるかテスト"""
+        basic_config["deduplicate"] = True
+        processor = SvgProcessor(basic_config)
+        processor.svg_converter.run_concurrently = Mock(
+            side_effect=lambda calls: [call() for call in calls]
+        )
+        processor.svg_converter.convert_svg_content = Mock(return_value=True)
+        markdown = "```svg\n<svg width='5' height='5'></svg>\n```\n"
+
+        assert processor.prefetch_page("a.md", markdown, tmp_path) == 1
+        assert processor.prefetch_page("b.md", markdown, tmp_path) == 0
+        processor.start_prefetch()
+
+        _, first_paths = processor.process_page("a.md", markdown, tmp_path)
+        _, second_paths = processor.process_page("b.md", markdown, tmp_path)
+
+        processor.svg_converter.convert_svg_content.assert_called_once()
+        assert second_paths == first_paths
+        assert processor.renders_saved == 1
+
+    def test_svg_files_are_hashed_once_per_build(self, basic_config, tmp_path):
+        """既定の設定（事前変換・重複排除・キャッシュ）でもSVGファイルは
+        ビルドごとに1回だけ読み込んでハッシュされるかテスト"""
+        basic_config.update(
+            deduplicate=True, prefetch=True, cache_dir=str(tmp_path / "cache")
+        )
+
+        def fake_convert(svg_path, output_path, **kwargs):
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            Path(output_path).write_bytes(b"png")
+            return True
+
+        processor = SvgProcessor(basic_config)
+        processor.svg_converter.run_concurrently = Mock(
+            side_effect=lambda calls: [call() for call in calls]
+        )
+        processor.svg_converter.convert_svg_file = Mock(side_effect=fake_convert)
+        (tmp_path / "large.drawio.svg").write_text("<svg width='10' height='10'/>")
+        markdown = "![d](large.drawio.svg)\n"
+        output_dir = tmp_path / "out"
+
+        with patch.object(
+            SvgBlock,
+            "iter_source_chunks",
+            autospec=True,
+            side_effect=SvgBlock.iter_source_chunks,
+        ) as iter_source_chunks:
+            for page in ("a.md", "b.md"):
+                processor.prefetch_page(page, markdown, output_dir, docs_dir=tmp_path)
+            processor.start_prefetch()
+            for page in ("a.md", "b.md"):
+                processor.process_page(page, markdown, output_dir, docs_dir=tmp_path)
+
+        assert iter_source_chunks.call_count == 1
+        processor.svg_converter.convert_svg_file.assert_called_once()
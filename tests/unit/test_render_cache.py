@@ -0,0 +1,220 @@
+"""
+RenderCacheクラスのテスト
+このファイルでは、変換結果の永続キャッシュの動作を検証します。
+"""
+
+import json
+import os
+import threading
+import time
+
+from mkdocs_svg_to_png import render_cache
+from mkdocs_svg_to_png.render_cache import RenderCache, compute_render_key
+
+
+class TestComputeRenderKey:
+    """compute_render_key関数のテストクラス"""
+
+    def test_same_input_gives_same_key(self):
+        """同じSVGと設定からは同じキーが得られるかテスト"""
+        settings = {"scale": 1.0, "backend": "playwright"}
+        assert compute_render_key(b"<svg/>", settings) == compute_render_key(
+            b"<svg/>", dict(reversed(list(settings.items())))
+        )
+
+    def test_content_changes_key(self):
+        """SVGの内容が変わるとキーが変わるかテスト"""
+        settings = {"scale": 1.0}
+        assert compute_render_key(b"<svg/>", settings) != compute_render_key(
+            b"<svg></svg>", settings
+        )
+
+    def test_settings_change_key(self):
+        """描画設定が変わるとキーが変わるかテスト"""
+        assert compute_render_key(b"<svg/>", {"scale": 1.0}) != compute_render_key(
+            b"<svg/>", {"scale": 2.0}
+        )
+
+    def test_chunks_give_same_key_as_bytes(self):
+        """分割して渡したSVGでも一括で渡した場合と同じキーになるかテスト"""
+        settings = {"scale": 1.0}
+        assert compute_render_key(
+            iter([b"<svg>", b"<rect/>", b"</svg>"]), settings
+        ) == compute_render_key(b"<svg><rect/></svg>", settings)
+
+
+class TestRenderCache:
+    """RenderCacheクラスのテストクラス"""
+
+    def test_miss_then_hit(self, tmp_path):
+        """保存前はミス、保存後はヒットして内容がコピーされるかテスト"""
+        cache = RenderCache(tmp_path / "cache")
+        key = compute_render_key(b"<svg/>", {})
+        output = tmp_path / "out" / "image.png"
+
+        assert cache.fetch(key, output) is False
+
+        rendered = tmp_path / "rendered.png"
+        rendered.write_bytes(b"png-bytes")
+        cache.store(key, rendered)
+
+        assert cache.fetch(key, output) is True
+        assert output.read_bytes() == b"png-bytes"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_hit_leaves_identical_output_untouched(self, tmp_path):
+        """出力が既に同じ内容ならヒットしても書き込まないかテスト"""
+        cache = RenderCache(tmp_path / "cache")
+        key = compute_render_key(b"<svg/>", {})
+        output = tmp_path / "image.png"
+        output.write_bytes(b"png-bytes")
+        cache.store(key, output)
+        mtime = output.stat().st_mtime_ns - 10**9
+        os.utime(output, ns=(mtime, mtime))
+
+        assert cache.fetch(key, output) is True
+        assert output.stat().st_mtime_ns == mtime
+        assert cache.unchanged == 1
+
+    def test_store_leaves_no_temporary_files(self, tmp_path):
+        """保存後に一時ファイルが残らないかテスト"""
+        cache = RenderCache(tmp_path / "cache")
+        rendered = tmp_path / "rendered.png"
+        rendered.write_bytes(b"png-bytes")
+
+        cache.store("ab" + "0" * 62, rendered)
+
+        entries = [p.name for p in (tmp_path / "cache").rglob("*") if p.is_file()]
+        assert entries == ["ab" + "0" * 62 + ".png"]
+
+    def test_store_failure_is_not_fatal(self, tmp_path):
+        """変換結果が存在しない場合も例外にならないかテスト"""
+        cache = RenderCache(tmp_path / "cache")
+
+        cache.store("cd" + "0" * 62, tmp_path / "missing.png")
+
+        assert cache.fetch("cd" + "0" * 62, tmp_path / "out.png") is False
+
+
+def _store(cache, tmp_path, key, size):
+    rendered = tmp_path / f"{key}.src"
+    rendered.write_bytes(b"x" * size)
+    cache.store(key, rendered)
+
+
+def _keys_on_disk(cache_dir):
+    return sorted(p.stem for p in cache_dir.glob("??/*.png"))
+
+
+class TestRenderCacheSweep:
+    """RenderCache.sweepのテストクラス"""
+
+    def test_sweep_writes_index(self, tmp_path):
+        """sweepで利用記録がインデックスに反映されるかテスト"""
+        cache = RenderCache(tmp_path / "cache")
+        _store(cache, tmp_path, "aa" + "0" * 62, 10)
+
+        cache.sweep()
+
+        index = json.loads((tmp_path / "cache" / "index.json").read_text())
+        assert index["build"] == 1
+        assert index["entries"]["aa" + "0" * 62][0] == 10
+        assert not (tmp_path / "cache" / "index.lock").exists()
+
+    def test_lru_eviction_by_entries(self, tmp_path, monkeypatch):
+        """エントリ数の上限を超えると最も古く使われたものから削除されるかテスト"""
+        clock = iter(range(100))
+        monkeypatch.setattr(render_cache.time, "time", lambda: float(next(clock)))
+        cache = RenderCache(tmp_path / "cache", max_entries=2)
+        old, middle, new = ("aa" + "0" * 62, "bb" + "0" * 62, "cc" + "0" * 62)
+        for key in (old, middle, new):
+            _store(cache, tmp_path, key, 10)
+        # 最初のエントリを使い直すと、削除対象は2番目になる
+        cache.fetch(old, tmp_path / "out.png")
+
+        cache.sweep()
+
+        assert _keys_on_disk(tmp_path / "cache") == [old, new]
+        assert cache.evictions == 1
+
+    def test_lru_eviction_by_bytes(self, tmp_path, monkeypatch):
+        """合計サイズの上限に収まるまで削除されるかテスト"""
+        clock = iter(range(100))
+        monkeypatch.setattr(render_cache.time, "time", lambda: float(next(clock)))
+        cache = RenderCache(tmp_path / "cache", max_bytes=25)
+        keys = ["aa" + "0" * 62, "bb" + "0" * 62, "cc" + "0" * 62]
+        for key in keys:
+            _store(cache, tmp_path, key, 10)
+
+        cache.sweep()
+
+        assert _keys_on_disk(tmp_path / "cache") == keys[1:]
+
+    def test_entries_unused_for_k_builds_are_removed(self, tmp_path):
+        """指定回数のビルドで使われなかったエントリが削除されるかテスト"""
+        cache_dir = tmp_path / "cache"
+        stale, fresh = "aa" + "0" * 62, "bb" + "0" * 62
+        first = RenderCache(cache_dir, max_age_builds=2)
+        _store(first, tmp_path, stale, 10)
+        _store(first, tmp_path, fresh, 10)
+        first.sweep()
+
+        for _ in range(2):
+            build = RenderCache(cache_dir, max_age_builds=2)
+            assert build.fetch(fresh, tmp_path / "out.png") is True
+            build.sweep()
+
+        assert _keys_on_disk(cache_dir) == [fresh]
+
+    def test_sweep_adopts_entries_from_other_builds(self, tmp_path):
+        """他のビルドが書き込んだエントリを削除せずインデックスに取り込むかテスト"""
+        cache_dir = tmp_path / "cache"
+        other = RenderCache(cache_dir)
+        _store(other, tmp_path, "aa" + "0" * 62, 10)
+
+        RenderCache(cache_dir, max_age_builds=1).sweep()
+
+        index = json.loads((cache_dir / "index.json").read_text())
+        assert list(index["entries"]) == ["aa" + "0" * 62]
+
+    def test_corrupt_index_is_rebuilt(self, tmp_path):
+        """壊れたインデックスがあっても再構築されるかテスト"""
+        cache = RenderCache(tmp_path / "cache")
+        _store(cache, tmp_path, "aa" + "0" * 62, 10)
+        (tmp_path / "cache" / "index.json").write_text("{not json")
+
+        cache.sweep()
+
+        index = json.loads((tmp_path / "cache" / "index.json").read_text())
+        assert "aa" + "0" * 62 in index["entries"]
+
+    def test_stale_lock_is_taken_over(self, tmp_path):
+        """クラッシュしたビルドが残したロックファイルを引き継げるかテスト"""
+        cache = RenderCache(tmp_path / "cache")
+        _store(cache, tmp_path, "aa" + "0" * 62, 10)
+        lock = tmp_path / "cache" / "index.lock"
+        lock.write_text("12345")
+        old = time.time() - render_cache.STALE_LOCK_SECONDS - 1
+        os.utime(lock, (old, old))
+
+        cache.sweep()
+
+        assert (tmp_path / "cache" / "index.json").exists()
+        assert not lock.exists()
+
+    def test_concurrent_sweeps_keep_index_consistent(self, tmp_path):
+        """同じキャッシュを並行してsweepしてもインデックスが壊れないかテスト"""
+        cache_dir = tmp_path / "cache"
+        caches = [RenderCache(cache_dir) for _ in range(4)]
+        for i, cache in enumerate(caches):
+            _store(cache, tmp_path, f"{i:02d}" + "0" * 62, 10)
+
+        threads = [threading.Thread(target=cache.sweep) for cache in caches]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        index = json.loads((cache_dir / "index.json").read_text())
+        assert index["build"] == 4
+        assert len(index["entries"]) == 4
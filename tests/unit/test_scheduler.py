@@ -0,0 +1,155 @@
+"""
+RenderSchedulerクラスのテスト
+このファイルでは、ビルド全体の事前変換スケジューラの動作を検証します。
+"""
+
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from mkdocs_svg_to_png.scheduler import RenderScheduler
+
+
+class TestRenderScheduler:
+    """RenderSchedulerクラスのテストクラス"""
+
+    @pytest.fixture
+    def converter(self):
+        """run_concurrentlyを逐次実行で置き換えた変換器のモック"""
+        converter = Mock()
+        converter.run_concurrently.side_effect = lambda calls: [
+            call() for call in calls
+        ]
+        return converter
+
+    def test_submit_deduplicates_by_key(self, converter):
+        """同じキーの変換は一度だけ登録されるかテスト"""
+        scheduler = RenderScheduler(converter)
+
+        assert scheduler.submit("a.png", lambda: True) is True
+        assert scheduler.submit("a.png", lambda: True) is False
+
+        scheduler.start()
+        scheduler.wait()
+
+        assert len(converter.run_concurrently.call_args.args[0]) == 1
+
+    def test_results_available_after_start(self, converter):
+        """開始後に結果と例外をキーごとに取得できるかテスト"""
+        scheduler = RenderScheduler(converter)
+        error = OSError("disk full")
+
+        def fail():
+            raise error
+
+        scheduler.submit("ok.png", lambda: True)
+        scheduler.submit("ng.png", fail)
+        scheduler.start()
+
+        assert scheduler.has("ok.png")
+        assert scheduler.result("ok.png") is True
+        assert scheduler.result("ng.png") is error
+        assert not scheduler.has("other.png")
+
+    def test_rendering_runs_in_background(self, converter):
+        """変換がバックグラウンドスレッドで実行されるかテスト"""
+        release = threading.Event()
+        threads = []
+
+        def call():
+            threads.append(threading.current_thread())
+            release.wait(timeout=5)
+            return True
+
+        scheduler = RenderScheduler(converter)
+        scheduler.submit("a.png", call)
+        scheduler.start()
+
+        # start()は変換完了を待たずに戻る
+        release.set()
+        assert scheduler.result("a.png") is True
+        assert threads[0] is not threading.main_thread()
+
+    def test_aborted_run_fails_pending_futures(self, converter):
+        """変換処理自体が中断した場合も待機側が解放されるかテスト"""
+        converter.run_concurrently.side_effect = RuntimeError("browser crashed")
+        scheduler = RenderScheduler(converter)
+        scheduler.submit("a.png", lambda: True)
+        scheduler.start()
+
+        outcome = scheduler.result("a.png")
+
+        assert isinstance(outcome, RuntimeError)
+
+    def test_close_clears_scheduled_conversions(self, converter):
+        """close()で登録済みの変換が破棄されるかテスト"""
+        scheduler = RenderScheduler(converter)
+        scheduler.submit("a.png", lambda: True)
+        scheduler.start()
+
+        scheduler.close()
+
+        assert not scheduler.has("a.png")
+
+    def test_start_without_close_runs_new_conversions(self, converter):
+        """close()されなかったビルドの後でも新しい変換が実行されるかテスト"""
+        release = threading.Event()
+        order = []
+
+        def first():
+            release.wait(timeout=5)
+            order.append("a.png")
+            return True
+
+        def second():
+            order.append("b.png")
+            return True
+
+        scheduler = RenderScheduler(converter)
+        scheduler.submit("a.png", first)
+        scheduler.start()
+        scheduler.submit("b.png", second)
+        scheduler.start()
+
+        # 先に開始した変換が終わってから次の変換が始まる
+        release.set()
+        assert scheduler.result("b.png") is True
+        assert order == ["a.png", "b.png"]
+
+    def test_close_with_cancel_skips_conversions_not_started(
+        self, converter, monkeypatch
+    ):
+        """close(cancel=True)でまだ始まっていない変換が実行されないかテスト"""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def first():
+            started.set()
+            release.wait(timeout=5)
+            calls.append("a.png")
+            return True
+
+        def second():
+            calls.append("b.png")
+            return True
+
+        scheduler = RenderScheduler(converter)
+        scheduler.submit("a.png", first)
+        scheduler.submit("b.png", second)
+        scheduler.start()
+        started.wait(timeout=5)
+
+        # 取り消しが済んでから実行中の変換を終わらせる
+        wait = scheduler.wait
+
+        def release_and_wait():
+            release.set()
+            wait()
+
+        monkeypatch.setattr(scheduler, "wait", release_and_wait)
+        scheduler.close(cancel=True)
+
+        assert calls == ["a.png"]
+        assert not scheduler.has("b.png")
@@ -5,12 +5,23 @@ This module tests the SvgToPngConverter class using Playwright.
 
 from __future__ import annotations
 
-from unittest.mock import Mock, patch
+import asyncio
+import functools
+import os
+import sys
+import threading
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
+from mkdocs_svg_to_png import svg_converter
 from mkdocs_svg_to_png.exceptions import SvgConversionError, SvgFileError
-from mkdocs_svg_to_png.svg_converter import SvgToPngConverter
+from mkdocs_svg_to_png.svg_converter import (
+    SvgToPngConverter,
+    references_external_resources,
+)
 
 
 class TestSvgToPngConverter:
@@ -337,3 +348,683 @@ class TestSvgToPngConverter:
         # TODO: Add pixel-level verification for red background
         # This would require image analysis library like Pillow
         # For now, we rely on manual verification that the PNG has red background
+
+
+@pytest.fixture
+def fake_playwright():
+    """Patch async_playwright with AsyncMock-based fakes."""
+    pages = []
+    active = {"current": 0, "peak": 0}
+
+    async def render(*args, **kwargs):
+        active["current"] += 1
+        active["peak"] = max(active["peak"], active["current"])
+        await asyncio.sleep(0.01)
+        active["current"] -= 1
+        return b"\x89PNG fake"
+
+    def new_page():
+        page = Mock()
+        for name in (
+            "set_viewport_size",
+            "set_content",
+            "goto",
+            "wait_for_load_state",
+            "evaluate",
+        ):
+            setattr(page, name, AsyncMock())
+        page.screenshot = AsyncMock(side_effect=render)
+        page.close = AsyncMock()
+        pages.append(page)
+        return page
+
+    context = Mock()
+    context.new_page = AsyncMock(side_effect=new_page)
+    context.close = AsyncMock()
+
+    browser = Mock()
+    browser.is_connected.return_value = True
+    browser.new_context = AsyncMock(return_value=context)
+    browser.close = AsyncMock()
+
+    playwright = Mock()
+    playwright.chromium.launch = AsyncMock(return_value=browser)
+    playwright.stop = AsyncMock()
+
+    manager = Mock()
+    manager.start = AsyncMock(return_value=playwright)
+
+    with patch(
+        "mkdocs_svg_to_png.svg_converter.async_playwright", return_value=manager
+    ):
+        yield {
+            "manager": manager,
+            "playwright": playwright,
+            "browser": browser,
+            "context": context,
+            "pages": pages,
+            "active": active,
+        }
+
+
+def run_within(converter, calls, timeout=10.0):
+    """Call run_concurrently, failing the test instead of hanging forever."""
+    outcome = {}
+
+    def run():
+        outcome["results"] = converter.run_concurrently(calls)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "conversions did not finish"
+    return outcome["results"]
+
+
+class TestSharedBrowser:
+    """Test reuse of the long-lived Chromium instance."""
+
+    @pytest.fixture
+    def converter(self):
+        converter = SvgToPngConverter({"error_on_fail": True})
+        yield converter
+        converter.close()
+
+    def test_browser_launched_once_for_multiple_conversions(
+        self, converter, fake_playwright, tmp_path
+    ):
+        """Chromium is launched once and only a page is opened per diagram."""
+        svg = "<svg width='10' height='10'><rect/></svg>"
+
+        for i in range(3):
+            assert converter.convert_svg_content(svg, str(tmp_path / f"{i}.png"))
+
+        fake_playwright["playwright"].chromium.launch.assert_awaited_once()
+        # The page is returned to the pool and reused
+        fake_playwright["context"].new_page.assert_awaited_once()
+        fake_playwright["pages"][0].close.assert_not_awaited()
+
+    def test_close_shuts_down_browser(self, converter, fake_playwright, tmp_path):
+        """close() stops Playwright and a later conversion relaunches."""
+        svg = "<svg width='10' height='10'><rect/></svg>"
+        converter.convert_svg_content(svg, str(tmp_path / "a.png"))
+
+        converter.close()
+
+        fake_playwright["browser"].close.assert_awaited_once()
+        fake_playwright["playwright"].stop.assert_awaited_once()
+
+        converter.convert_svg_content(svg, str(tmp_path / "b.png"))
+        assert fake_playwright["playwright"].chromium.launch.await_count == 2
+
+    def test_close_without_conversion_is_noop(self, converter):
+        """close() before any conversion does nothing."""
+        converter.close()
+        converter.close()
+
+    def test_relaunch_when_browser_disconnected(
+        self, converter, fake_playwright, tmp_path
+    ):
+        """A crashed browser is replaced on the next conversion."""
+        svg = "<svg width='10' height='10'><rect/></svg>"
+        converter.convert_svg_content(svg, str(tmp_path / "a.png"))
+
+        fake_playwright["browser"].is_connected.return_value = False
+        converter.convert_svg_content(svg, str(tmp_path / "b.png"))
+
+        assert fake_playwright["playwright"].chromium.launch.await_count == 2
+
+    def test_conversion_inside_running_event_loop(
+        self, converter, fake_playwright, tmp_path
+    ):
+        """Conversions still share the browser when called from a running loop."""
+        svg = "<svg width='10' height='10'><rect/></svg>"
+
+        async def convert_twice() -> list[bool]:
+            return [
+                converter.convert_svg_content(svg, str(tmp_path / f"{i}.png"))
+                for i in range(2)
+            ]
+
+        assert asyncio.run(convert_twice()) == [True, True]
+        fake_playwright["playwright"].chromium.launch.assert_awaited_once()
+
+    def test_identical_screenshot_is_not_rewritten(
+        self, converter, fake_playwright, tmp_path
+    ):
+        """Screenshots are compared with the existing PNG before writing."""
+        svg = "<svg width='10' height='10'><rect/></svg>"
+        output = tmp_path / "a.png"
+
+        assert converter.convert_svg_content(svg, str(output))
+        assert output.read_bytes() == b"\x89PNG fake"
+        mtime = output.stat().st_mtime_ns - 10**9
+        os.utime(output, ns=(mtime, mtime))
+
+        assert converter.convert_svg_content(svg, str(output))
+
+        assert output.stat().st_mtime_ns == mtime
+        assert converter.unchanged_outputs == 1
+        converter.reset_backend_stats()
+        assert converter.unchanged_outputs == 0
+
+
+class TestFileStreaming:
+    """Test memory use when converting large SVG files."""
+
+    @pytest.fixture
+    def large_svg(self, tmp_path):
+        svg_file = tmp_path / "large.svg"
+        svg_file.write_text(
+            "<svg xmlns='http://www.w3.org/2000/svg' width='50' height='40'>"
+            + "<rect x='1' y='2' width='3' height='4' fill='#123456'/>" * 20000
+            + "</svg>",
+            encoding="utf-8",
+        )
+        return svg_file
+
+    @staticmethod
+    def measure_peak(convert):
+        tracemalloc.start()
+        try:
+            result = convert()
+            return result, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def test_backend_reads_file_itself(self, large_svg, tmp_path, monkeypatch):
+        """Non-browser engines get the path; the markup is only streamed."""
+        cairosvg = SimpleNamespace(
+            __version__="2.7.1", svg2png=Mock(return_value=b"\x89PNG fake")
+        )
+        monkeypatch.setitem(sys.modules, "cairosvg", cairosvg)
+        converter = SvgToPngConverter(
+            {"backend": "cairo", "render_processes": 1, "error_on_fail": True}
+        )
+        output = str(tmp_path / "large.png")
+
+        result, peak = self.measure_peak(
+            lambda: converter.convert_svg_file(str(large_svg), output)
+        )
+
+        assert result is True
+        assert cairosvg.svg2png.call_args.kwargs["url"] == str(large_svg)
+        assert cairosvg.svg2png.call_args.kwargs["output_width"] == 50
+        assert peak < large_svg.stat().st_size / 4
+
+    def test_browser_keeps_few_copies(self, large_svg, tmp_path, fake_playwright):
+        """The file is read once and only embedded into the page document."""
+        converter = SvgToPngConverter({"error_on_fail": True})
+        try:
+            result, peak = self.measure_peak(
+                lambda: converter.convert_svg_file(
+                    str(large_svg), str(tmp_path / "large.png")
+                )
+            )
+        finally:
+            converter.close()
+
+        assert result is True
+        assert peak < 3 * large_svg.stat().st_size
+
+    def test_browser_loads_file_by_url(self, large_svg, tmp_path, fake_playwright):
+        """With load_files_by_url, Chromium reads the file from disk itself."""
+        converter = SvgToPngConverter(
+            {"error_on_fail": True, "load_files_by_url": True}
+        )
+        try:
+            with patch.object(
+                svg_converter.Path, "read_text", autospec=True
+            ) as read_text:
+                result, peak = self.measure_peak(
+                    lambda: converter.convert_svg_file(
+                        str(large_svg), str(tmp_path / "large.png")
+                    )
+                )
+        finally:
+            converter.close()
+
+        assert result is True
+        read_text.assert_not_called()
+        assert peak < large_svg.stat().st_size / 2
+
+        page = fake_playwright["pages"][0]
+        page.goto.assert_awaited_once_with(large_svg.resolve().as_uri())
+        page.set_content.assert_not_awaited()
+        page.set_viewport_size.assert_awaited_once_with({"width": 50, "height": 40})
+        assert page.evaluate.await_args_list[0].args[1] == [50, 40]
+        page.wait_for_load_state.assert_not_awaited()
+
+    def test_content_is_inlined_even_with_url_loading(self, tmp_path, fake_playwright):
+        """Markup without a file behind it is still embedded into the page."""
+        converter = SvgToPngConverter(
+            {"error_on_fail": True, "load_files_by_url": True}
+        )
+        try:
+            assert converter.convert_svg_content(
+                "<svg width='10' height='10'><rect/></svg>", str(tmp_path / "a.png")
+            )
+        finally:
+            converter.close()
+
+        page = fake_playwright["pages"][0]
+        page.set_content.assert_awaited_once()
+        page.goto.assert_not_awaited()
+
+    @pytest.mark.parametrize("option", ["load_files_by_url", "wait_for_network_idle"])
+    def test_loading_options_are_render_settings(self, option):
+        """Cached renderings are not reused across page loading modes."""
+        default = SvgToPngConverter({}).get_render_settings()
+        enabled = SvgToPngConverter({option: True}).get_render_settings()
+
+        assert default[option] is False
+        assert enabled[option] is True
+
+    def test_failure_does_not_reread_file(self, tmp_path, fake_playwright):
+        svg_file = tmp_path / "bad.svg"
+        svg_file.write_text("<svg><rect></svg>", encoding="utf-8")
+        converter = SvgToPngConverter({"error_on_fail": True})
+
+        with (
+            patch.object(
+                svg_converter.Path, "read_text", autospec=True, return_value="<svg><g>"
+            ) as read_text,
+            pytest.raises(SvgConversionError),
+        ):
+            converter.convert_svg_file(str(svg_file), str(tmp_path / "bad.png"))
+
+        read_text.assert_called_once()
+
+
+class TestEventLoopThread:
+    """Test the converter's dedicated event loop thread."""
+
+    SVG = "<svg width='10' height='10'><rect/></svg>"
+
+    def test_one_loop_thread_for_all_conversions(self, fake_playwright, tmp_path):
+        """Every conversion runs on the same long-lived loop and thread."""
+
+        def loop_threads() -> int:
+            return sum(t.name == "svg-to-png-loop" for t in threading.enumerate())
+
+        before = loop_threads()
+        converter = SvgToPngConverter({"error_on_fail": True})
+        try:
+            converter.convert_svg_content(self.SVG, str(tmp_path / "a.png"))
+            loop, thread = converter._loop, converter._loop_thread
+
+            for i in range(3):
+                converter.convert_svg_content(self.SVG, str(tmp_path / f"{i}.png"))
+            converter.run_concurrently(
+                [
+                    functools.partial(
+                        converter.convert_svg_content,
+                        self.SVG,
+                        str(tmp_path / f"c{i}.png"),
+                    )
+                    for i in range(3)
+                ]
+            )
+
+            assert converter._loop is loop
+            assert converter._loop_thread is thread
+            assert thread.is_alive()
+            assert loop_threads() == before + 1
+        finally:
+            converter.close()
+
+    def test_close_stops_loop_thread(self, fake_playwright, tmp_path):
+        """close() shuts the browser down on the loop and joins its thread."""
+        converter = SvgToPngConverter({"error_on_fail": True})
+        converter.convert_svg_content(self.SVG, str(tmp_path / "a.png"))
+        loop, thread = converter._loop, converter._loop_thread
+
+        converter.close()
+
+        assert not thread.is_alive()
+        assert loop.is_closed()
+        assert converter._loop is None
+        fake_playwright["browser"].close.assert_awaited_once()
+
+
+class TestConcurrentConversion:
+    """Test concurrent rendering through the page pool."""
+
+    @pytest.fixture
+    def converter(self):
+        converter = SvgToPngConverter({"error_on_fail": True, "max_concurrency": 3})
+        yield converter
+        converter.close()
+
+    def test_run_concurrently_preserves_order(self, converter):
+        """Results come back in submission order, exceptions in their slot."""
+        error = ValueError("boom")
+
+        def fail():
+            raise error
+
+        results = converter.run_concurrently([lambda: 1, fail, lambda: 3])
+
+        assert results == [1, error, 3]
+
+    def test_concurrent_first_use_launches_browser_once(
+        self, converter, fake_playwright, tmp_path
+    ):
+        """Pages opened at once wait for a single browser launch."""
+        svg = "<svg width='10' height='10'><rect/></svg>"
+        browser = fake_playwright["browser"]
+
+        async def slow_launch(**kwargs):
+            await asyncio.sleep(0.05)
+            return browser
+
+        fake_playwright["playwright"].chromium.launch.side_effect = slow_launch
+        converter.max_workers = 8
+        calls = [
+            functools.partial(
+                converter.convert_svg_content, svg, str(tmp_path / f"{i}.png")
+            )
+            for i in range(8)
+        ]
+
+        assert run_within(converter, calls) == [True] * 8
+        fake_playwright["manager"].start.assert_awaited_once()
+        fake_playwright["playwright"].chromium.launch.assert_awaited_once()
+
+    def test_pages_bounded_by_max_concurrency(
+        self, converter, fake_playwright, tmp_path
+    ):
+        """No more than max_concurrency pages are opened and rendering overlaps."""
+        svg = "<svg width='10' height='10'><rect/></svg>"
+        calls = [
+            functools.partial(
+                converter.convert_svg_content, svg, str(tmp_path / f"{i}.png")
+            )
+            for i in range(8)
+        ]
+
+        results = converter.run_concurrently(calls)
+
+        assert results == [True] * 8
+        assert len(fake_playwright["pages"]) == 3
+        assert fake_playwright["active"]["peak"] > 1
+        assert fake_playwright["active"]["peak"] <= 3
+        fake_playwright["playwright"].chromium.launch.assert_awaited_once()
+
+    def test_failed_page_is_not_reused(self, converter, fake_playwright, tmp_path):
+        """A page whose conversion failed is closed instead of pooled."""
+        svg = "<svg width='10' height='10'><rect/></svg>"
+        converter.convert_svg_content(svg, str(tmp_path / "a.png"))
+        page = fake_playwright["pages"][0]
+        page.set_content.side_effect = RuntimeError("crashed")
+
+        assert converter.convert_svg_content(svg, str(tmp_path / "b.png")) is False
+
+        page.close.assert_awaited_once()
+        page.set_content.side_effect = None
+        assert converter.convert_svg_content(svg, str(tmp_path / "c.png"))
+        assert len(fake_playwright["pages"]) == 2
+
+    def test_waiters_proceed_when_every_page_fails(
+        self, converter, fake_playwright, tmp_path
+    ):
+        """Closing failed pages frees their slots for callers already waiting."""
+        svg = "<svg width='10' height='10'><rect/></svg>"
+        original_new_page = fake_playwright["context"].new_page.side_effect
+
+        async def crash(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("crashed")
+
+        def new_page():
+            page = original_new_page()
+            page.set_viewport_size.side_effect = crash
+            return page
+
+        fake_playwright["context"].new_page.side_effect = new_page
+        # More workers than pages, as when out-of-process engines are enabled
+        converter.max_workers = 8
+        calls = [
+            functools.partial(
+                converter.convert_svg_content, svg, str(tmp_path / f"{i}.png")
+            )
+            for i in range(8)
+        ]
+
+        assert run_within(converter, calls) == [False] * 8
+        assert len(fake_playwright["pages"]) == 8
+        for page in fake_playwright["pages"]:
+            page.close.assert_awaited_once()
+
+    def test_waiters_proceed_after_browser_relaunch(
+        self, converter, fake_playwright, tmp_path
+    ):
+        """Pages of a relaunched browser are closed and their slots reused."""
+        svg = "<svg width='10' height='10'><rect/></svg>"
+        states = iter([True, True, True, False])
+        fake_playwright["browser"].is_connected.side_effect = lambda: next(states, True)
+        converter.max_workers = 8
+        calls = [
+            functools.partial(
+                converter.convert_svg_content, svg, str(tmp_path / f"{i}.png")
+            )
+            for i in range(8)
+        ]
+
+        assert run_within(converter, calls) == [True] * 8
+        assert fake_playwright["playwright"].chromium.launch.await_count == 2
+        assert fake_playwright["active"]["peak"] <= 3
+
+
+class TestBatchedConversion:
+    """Test rendering several diagrams in one page."""
+
+    @pytest.fixture
+    def converter(self, monkeypatch):
+        # Give worker threads ample time to join the same batch
+        monkeypatch.setattr(svg_converter, "BATCH_WINDOW_SECONDS", 0.5)
+        converter = SvgToPngConverter(
+            {"error_on_fail": True, "max_concurrency": 1, "batch_size": 4}
+        )
+        yield converter
+        converter.close()
+
+    def test_concurrent_diagrams_share_one_page_load(
+        self, converter, fake_playwright, tmp_path
+    ):
+        """A batch loads content once and takes one clipped screenshot each."""
+        svgs = [
+            f"<svg width='{10 * (i + 1)}' height='20'><rect/></svg>" for i in range(4)
+        ]
+        calls = [
+            functools.partial(
+                converter.convert_svg_content, svg, str(tmp_path / f"{i}.png")
+            )
+            for i, svg in enumerate(svgs)
+        ]
+
+        with patch.object(converter, "_write_png") as write_png:
+            assert converter.run_concurrently(calls) == [True] * 4
+
+        page = fake_playwright["pages"][0]
+        page.set_content.assert_awaited_once()
+        assert page.set_content.await_args.args[0].count("<iframe") == 4
+        # Diagrams join the batch in arrival order, which depends on threads;
+        # each screenshot is written before the next one is taken
+        clips = {
+            write.args[0]: screenshot.kwargs["clip"]
+            for write, screenshot in zip(
+                write_png.call_args_list, page.screenshot.await_args_list
+            )
+        }
+        assert sorted(clip["y"] for clip in clips.values()) == [0, 20, 40, 60]
+        for i in range(4):
+            clip = clips[str(tmp_path / f"{i}.png")]
+            assert (clip["x"], clip["width"], clip["height"]) == (0, 10 * (i + 1), 20)
+        page.set_viewport_size.assert_awaited_once_with({"width": 40, "height": 80})
+
+    def test_failed_batch_is_retried_one_by_one(
+        self, converter, fake_playwright, tmp_path
+    ):
+        """If the combined page fails, diagrams are rendered individually."""
+        svg = "<svg width='10' height='10'><rect/></svg>"
+        original_new_page = fake_playwright["context"].new_page.side_effect
+
+        def new_page():
+            page = original_new_page()
+            if len(fake_playwright["pages"]) == 1:
+                page.set_content.side_effect = RuntimeError("crashed")
+            return page
+
+        fake_playwright["context"].new_page.side_effect = new_page
+        calls = [
+            functools.partial(
+                converter.convert_svg_content, svg, str(tmp_path / f"{i}.png")
+            )
+            for i in range(2)
+        ]
+
+        assert converter.run_concurrently(calls) == [True, True]
+        assert fake_playwright["pages"][1].set_content.await_count == 2
+
+    def test_failed_batch_with_failing_pages_finishes(
+        self, converter, fake_playwright, tmp_path
+    ):
+        """Retries of a failed batch do not wait forever for its only page."""
+        svg = "<svg width='10' height='10'><rect/></svg>"
+        original_new_page = fake_playwright["context"].new_page.side_effect
+
+        async def crash(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("crashed")
+
+        def new_page():
+            page = original_new_page()
+            page.set_viewport_size.side_effect = crash
+            return page
+
+        fake_playwright["context"].new_page.side_effect = new_page
+        calls = [
+            functools.partial(
+                converter.convert_svg_content, svg, str(tmp_path / f"{i}.png")
+            )
+            for i in range(4)
+        ]
+
+        assert run_within(converter, calls) == [False] * 4
+        # One combined page, then one page per diagram retried on its own
+        assert len(fake_playwright["pages"]) == 5
+        for page in fake_playwright["pages"]:
+            page.close.assert_awaited_once()
+
+    def test_queued_diagrams_render_after_browser_relaunch(
+        self, converter, fake_playwright, tmp_path
+    ):
+        """Diagrams waiting for the batch window survive a browser relaunch."""
+        svg = "<svg width='10' height='10'><rect/></svg>"
+        states = iter([False])
+        fake_playwright["browser"].is_connected.side_effect = lambda: next(states, True)
+
+        async def relaunch_while_queued():
+            await converter._ensure_browser_context()
+            queued = asyncio.ensure_future(
+                converter._convert_svg_batched(svg, str(tmp_path / "a.png"))
+            )
+            await asyncio.sleep(0)
+            await converter._ensure_browser_context()
+            return await asyncio.wait_for(queued, timeout=5)
+
+        future = asyncio.run_coroutine_threadsafe(
+            relaunch_while_queued(), converter._get_loop()
+        )
+
+        assert future.result(timeout=10) is True
+        assert fake_playwright["playwright"].chromium.launch.await_count == 2
+
+    def test_close_fails_queued_diagrams(self, converter, fake_playwright, tmp_path):
+        """Closing the browser releases callers still waiting for their batch."""
+        svg = "<svg width='10' height='10'><rect/></svg>"
+
+        async def close_while_queued():
+            await converter._ensure_browser_context()
+            queued = asyncio.ensure_future(
+                converter._convert_svg_batched(svg, str(tmp_path / "a.png"))
+            )
+            await asyncio.sleep(0)
+            await converter._shutdown_browser()
+            return await asyncio.wait_for(queued, timeout=5)
+
+        future = asyncio.run_coroutine_threadsafe(
+            close_while_queued(), converter._get_loop()
+        )
+
+        with pytest.raises(SvgConversionError, match="closed before"):
+            future.result(timeout=10)
+
+    def test_sequential_calls_are_not_batched(
+        self, converter, fake_playwright, tmp_path
+    ):
+        """Calls outside run_concurrently render immediately on their own."""
+        svg = "<svg width='10' height='10'><rect/></svg>"
+
+        assert converter.convert_svg_content(svg, str(tmp_path / "a.png"))
+
+        page = fake_playwright["pages"][0]
+        assert "<iframe" not in page.set_content.await_args.args[0]
+
+
+class TestRenderWait:
+    """Test how long conversions wait before taking the screenshot."""
+
+    @pytest.mark.parametrize(
+        ("svg", "expected"),
+        [
+            ("<svg><use href='#shape'/></svg>", False),
+            ("<svg><rect fill='url(#gradient)'/></svg>", False),
+            ("<svg><image href='data:image/png;base64,AAAA'/></svg>", False),
+            ("<svg><image xlink:href='logo.png'/></svg>", True),
+            ("<svg><use href='https://example.com/s.svg#a'/></svg>", True),
+            ("<svg><style>@import 'theme.css';</style></svg>", True),
+            ("<svg><style>@font-face { src: url(font.woff2) }</style></svg>", True),
+        ],
+    )
+    def test_references_external_resources(self, svg, expected):
+        """External references are detected, same-document ones are not."""
+        assert references_external_resources(svg) is expected
+
+    def test_self_contained_svg_waits_for_paint(self, fake_playwright, tmp_path):
+        """Inline-only SVGs skip the networkidle wait."""
+        converter = SvgToPngConverter({"error_on_fail": True})
+        try:
+            svg = "<svg width='10' height='10'><rect/></svg>"
+            assert converter.convert_svg_content(svg, str(tmp_path / "a.png"))
+        finally:
+            converter.close()
+
+        page = fake_playwright["pages"][0]
+        page.evaluate.assert_awaited_once()
+        page.wait_for_load_state.assert_not_awaited()
+
+    @pytest.mark.parametrize(
+        ("config", "svg"),
+        [
+            ({}, "<svg width='10' height='10'><image href='a.png'/></svg>"),
+            (
+                {"wait_for_network_idle": True},
+                "<svg width='10' height='10'><rect/></svg>",
+            ),
+        ],
+    )
+    def test_network_idle_when_needed_or_requested(
+        self, fake_playwright, tmp_path, config, svg
+    ):
+        """External resources or the opt-in setting keep waiting for networkidle."""
+        converter = SvgToPngConverter({"error_on_fail": True, **config})
+        try:
+            assert converter.convert_svg_content(svg, str(tmp_path / "a.png"))
+        finally:
+            converter.close()
+
+        page = fake_playwright["pages"][0]
+        page.wait_for_load_state.assert_awaited_once_with("networkidle")
+        page.evaluate.assert_not_awaited()
@@ -0,0 +1,117 @@
+"""Tests for the parsed SVG shared by a conversion."""
+
+from __future__ import annotations
+
+import tracemalloc
+import xml.etree.ElementTree as StdET
+
+import pytest
+
+from mkdocs_svg_to_png.backends import select_engines
+from mkdocs_svg_to_png.svg_document import (
+    CSS,
+    FOREIGN_OBJECT,
+    UNSCANNED,
+    WEB_FONT,
+    ParsedSvg,
+    parse_dimension,
+)
+
+LARGE_SVG = (
+    "<svg width='5' height='6'>"
+    + "<rect x='1' y='2' width='3' height='4'/>" * 20000
+    + "</svg>"
+)
+
+
+class TestParsedSvg:
+    """Test ParsedSvg."""
+
+    def test_root_attributes_and_features(self):
+        parsed = ParsedSvg.parse(
+            '<svg xmlns="http://www.w3.org/2000/svg" width="120px" height="80">'
+            "<style>rect { fill: red }</style><foreignObject/></svg>"
+        )
+
+        assert parsed.root_tag == "svg"
+        assert parsed.attributes["width"] == "120px"
+        assert parsed.features == {CSS, FOREIGN_OBJECT}
+
+    @pytest.mark.parametrize(
+        ("svg", "size"),
+        [
+            ("<svg width='120px' height='80'/>", (120, 80)),
+            ("<svg viewBox='0 0 300 150'/>", (300, 150)),
+            ("<svg viewBox='0,0,30.5,15'/>", (30, 15)),
+            ("<svg width='120'/>", (800, 600)),
+            ("<svg viewBox='0 0 wide tall'/>", (800, 600)),
+        ],
+    )
+    def test_get_size(self, svg, size):
+        assert ParsedSvg.parse(svg).get_size(800, 600) == size
+
+    def test_view_box(self):
+        parsed = ParsedSvg.parse("<svg viewBox='-5 -5 10 20'/>")
+        assert parsed.view_box == (-5.0, -5.0, 10.0, 20.0)
+        assert ParsedSvg.parse("<svg/>").view_box is None
+
+    def test_parse_dimension(self):
+        assert parse_dimension("10.7em", 1) == 10
+        assert parse_dimension("auto", 1) == 1
+
+
+class TestStreamingInspection:
+    """Test the incremental parsing paths."""
+
+    def test_inspect_stops_after_root(self):
+        """The markup after the root start tag is never read."""
+        svg = "<svg width='5' height='6'><rect/>" + "<<< not xml" * 10000
+
+        parsed = ParsedSvg.inspect(svg)
+
+        assert parsed.get_size(800, 600) == (5, 6)
+        assert parsed.features == {UNSCANNED}
+        with pytest.raises(StdET.ParseError):
+            ParsedSvg.parse(svg)
+
+    def test_bounded_feature_scan(self):
+        svg = "<svg><rect/><foreignObject/><rect/><rect/></svg>"
+
+        assert ParsedSvg.inspect(svg, element_limit=2).features == {
+            FOREIGN_OBJECT,
+            UNSCANNED,
+        }
+        assert ParsedSvg.inspect(svg, element_limit=10).features == {FOREIGN_OBJECT}
+
+    def test_unscanned_svg_goes_to_browser(self):
+        assert select_engines(ParsedSvg.inspect(LARGE_SVG).features) == ["playwright"]
+
+    def test_style_text_split_across_chunks(self):
+        padding = "/*" + "x" * (70 * 1024) + "*/"
+        svg = f"<svg><style>{padding}@font-face {{ src: url(a.woff) }}</style></svg>"
+
+        assert ParsedSvg.parse(svg).features == {CSS, WEB_FONT}
+
+    def test_entities_are_rejected(self):
+        """defusedxml's protection against entity expansion still applies."""
+        pytest.importorskip("defusedxml")
+        from defusedxml import EntitiesForbidden
+
+        svg = '<!DOCTYPE svg [<!ENTITY a "aaaa">]><svg>&a;</svg>'
+        with pytest.raises(EntitiesForbidden):
+            ParsedSvg.parse(svg)
+
+    @pytest.mark.parametrize("parse", [ParsedSvg.parse, ParsedSvg.inspect])
+    def test_no_element_tree_is_kept(self, parse):
+        """Peak memory stays far below that of building the element tree."""
+        tracemalloc.start()
+        try:
+            StdET.fromstring(LARGE_SVG)
+            tree_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+            parse(LARGE_SVG)
+            streaming_peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        assert streaming_peak < tree_peak / 4
@@ -9,6 +9,7 @@ Python未経験者へのヒント：
 """
 
 import contextlib
+import os
 import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -19,6 +20,7 @@ from mkdocs_svg_to_png.utils import (
     generate_image_filename,
     get_relative_path,
     get_temp_file_path,
+    write_file_if_changed,
 )
 
 
@@ -91,6 +93,29 @@ class TestUtilityFunctions:
             ensure_directory(temp_dir)
             assert Path(temp_dir).exists()
 
+    def test_write_file_if_changed_skips_identical_content(self, tmp_path):
+        """同じ内容なら書き込まず、更新時刻も変わらないかテスト"""
+        target = tmp_path / "image.png"
+
+        assert write_file_if_changed(target, b"png-bytes") is True
+        mtime = target.stat().st_mtime_ns - 10**9
+        os.utime(target, ns=(mtime, mtime))
+
+        assert write_file_if_changed(target, b"png-bytes") is False
+        assert target.stat().st_mtime_ns == mtime
+
+    def test_write_file_if_changed_replaces_atomically(self, tmp_path):
+        """内容が異なれば置き換え、一時ファイルや権限の変化が残らないかテスト"""
+        target = tmp_path / "image.png"
+        target.write_bytes(b"old")
+        target.chmod(0o640)
+
+        assert write_file_if_changed(target, b"new-bytes") is True
+
+        assert target.read_bytes() == b"new-bytes"
+        assert target.stat().st_mode & 0o777 == 0o640
+        assert list(tmp_path.iterdir()) == [target]
+
     def test_get_temp_file_path(self):
         """一時ファイルのパスが正しく取得できるかテスト"""
         temp_path = get_temp_file_path(".svg")